@@ -0,0 +1,100 @@
+"""Normalize contact phone numbers to E.164
+
+Revision ID: 0a7d5c2e9b14
+Revises: f3c8d1e7a920
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import logging
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+
+from src.conf.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7d5c2e9b14'
+down_revision: Union[str, None] = 'f3c8d1e7a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Frozen copy of src.schemas.contacts.normalize_phone as of this revision,
+# so later changes to the schema do not change what this migration does.
+PHONE_SEPARATORS = re.compile(r'[\s().\-]')
+E164 = re.compile(r'^\+[1-9]\d{1,14}$')
+
+
+def normalize_phone(value: str) -> str:
+    phone = PHONE_SEPARATORS.sub('', value)
+    if phone.startswith('00'):
+        phone = phone[2:]
+    if not phone.startswith('+'):
+        phone = '+' + phone
+    if not E164.match(phone):
+        raise ValueError(value)
+    return phone
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        batch_size = settings.DB_PARTITION_BATCH_SIZE
+        max_id = bind.execute(sa.text('SELECT coalesce(max(id), 0) FROM contacts')).scalar()
+        skipped = 0
+        for low in range(0, max_id, batch_size):
+            rows = bind.execute(
+                sa.text(
+                    'SELECT id, user_id, phone FROM contacts '
+                    'WHERE id > :low AND id <= :high'
+                ),
+                {'low': low, 'high': low + batch_size},
+            ).all()
+            for contact_id, user_id, phone in rows:
+                try:
+                    normalized = normalize_phone(phone)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if normalized == phone:
+                    continue
+                # Each changed contact gets a new version from its owner's
+                # change sequence, so delta-sync clients fetch the new number.
+                # Each UPDATE commits on its own, so a number that collides
+                # with another contact of the same user is left as it is
+                # (the skipped version is just a gap in the sequence).
+                version = bind.execute(
+                    sa.text(
+                        'UPDATE users SET contacts_version = contacts_version + 1 '
+                        'WHERE id = :user_id RETURNING contacts_version'
+                    ),
+                    {'user_id': user_id},
+                ).scalar()
+                try:
+                    bind.execute(
+                        sa.text(
+                            'UPDATE contacts SET phone = :phone, '
+                            'version = coalesce(:version, version) '
+                            'WHERE user_id = :user_id AND id = :id'
+                        ),
+                        {
+                            'phone': normalized,
+                            'version': version,
+                            'user_id': user_id,
+                            'id': contact_id,
+                        },
+                    )
+                except IntegrityError:
+                    skipped += 1
+        if skipped:
+            logger.warning('Left %s contact phones unnormalized', skipped)
+
+
+def downgrade() -> None:
+    # Normalization is not reversible; the E.164 values remain valid.
+    pass
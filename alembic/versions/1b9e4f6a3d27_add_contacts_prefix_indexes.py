@@ -0,0 +1,41 @@
+"""Add lower() prefix indexes for contact suggestions
+
+Revision ID: 1b9e4f6a3d27
+Revises: 0a7d5c2e9b14
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b9e4f6a3d27'
+down_revision: Union[str, None] = '0a7d5c2e9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('name', 'surname', 'email')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # text_pattern_ops lets LIKE 'prefix%' use the index under any collation.
+        ops = ' text_pattern_ops' if bind.dialect.name == 'postgresql' else ''
+        for column in COLUMNS:
+            create_index_online(
+                bind,
+                f'ix_contacts_user_id_lower_{column}',
+                'contacts',
+                ['user_id', f'lower({column}){ops}'],
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            drop_index_online(op.get_bind(), f'ix_contacts_user_id_lower_{column}')
@@ -0,0 +1,112 @@
+"""Add blocking key columns for duplicate detection
+
+Revision ID: 2c5a8e1f7b36
+Revises: 1b9e4f6a3d27
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.conf.config import settings
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c5a8e1f7b36'
+down_revision: Union[str, None] = '1b9e4f6a3d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEYS = ('email_key', 'phone_key', 'name_key')
+
+# Frozen copy of src.services.duplicates.blocking_keys as of this revision,
+# so later changes to the service do not change what this migration does.
+PHONE_KEY_DIGITS = 9
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+
+def soundex(value: str) -> str:
+    letters = re.sub(r'[^a-z]', '', value.lower())
+    if not letters:
+        return value.strip().lower()
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0])
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter)
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def blocking_keys(name: str, surname: str, email: str, phone: str) -> dict:
+    digits = re.sub(r'\D', '', phone)
+    return {
+        'email_key': email.strip().lower(),
+        'phone_key': digits[-PHONE_KEY_DIGITS:],
+        'name_key': soundex(surname)[:4] + soundex(name)[:4],
+    }
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('email_key', sa.String(length=100), nullable=True))
+    op.add_column('contacts', sa.Column('phone_key', sa.String(length=20), nullable=True))
+    op.add_column('contacts', sa.Column('name_key', sa.String(length=16), nullable=True))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # The keys are computed in Python, the same way the application
+        # computes them on write, in batches of ids.
+        batch_size = settings.DB_PARTITION_BATCH_SIZE
+        max_id = bind.execute(sa.text('SELECT coalesce(max(id), 0) FROM contacts')).scalar()
+        for low in range(0, max_id, batch_size):
+            rows = bind.execute(
+                sa.text(
+                    'SELECT id, user_id, name, surname, email, phone FROM contacts '
+                    'WHERE id > :low AND id <= :high'
+                ),
+                {'low': low, 'high': low + batch_size},
+            ).all()
+            if not rows:
+                continue
+            bind.execute(
+                sa.text(
+                    'UPDATE contacts SET email_key = :email_key, '
+                    'phone_key = :phone_key, name_key = :name_key '
+                    'WHERE user_id = :user_id AND id = :id'
+                ),
+                [
+                    {
+                        'id': row.id,
+                        'user_id': row.user_id,
+                        **blocking_keys(row.name, row.surname, row.email, row.phone),
+                    }
+                    for row in rows
+                ],
+            )
+        for key in KEYS:
+            create_index_online(
+                bind, f'ix_contacts_user_id_{key}', 'contacts', ['user_id', key]
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for key in KEYS:
+            drop_index_online(op.get_bind(), f'ix_contacts_user_id_{key}')
+    for key in reversed(KEYS):
+        op.drop_column('contacts', key)
@@ -0,0 +1,47 @@
+"""Add contact tags
+
+Revision ID: 3d7b1e9c4a58
+Revises: 2c5a8e1f7b36
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7b1e9c4a58'
+down_revision: Union[str, None] = '2c5a8e1f7b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_tags_user_id_name', 'tags', ['user_id', 'name'], unique=True)
+    # No foreign key to contacts: the table may be hash-partitioned.
+    op.create_table('contact_tags',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'tag_id', 'contact_id')
+    )
+    op.create_index('ix_contact_tags_user_id_contact_id', 'contact_tags', ['user_id', 'contact_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_tags_user_id_contact_id', table_name='contact_tags')
+    op.drop_table('contact_tags')
+    op.drop_index('ux_tags_user_id_name', table_name='tags')
+    op.drop_table('tags')
@@ -0,0 +1,49 @@
+"""Add indexes for sorting the contact list
+
+Revision ID: 4e8c2a6d9b71
+Revises: 3d7b1e9c4a58
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8c2a6d9b71'
+down_revision: Union[str, None] = '3d7b1e9c4a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sorting by id and email uses ix_contacts_user_id_id and
+# ux_contacts_user_id_email.
+INDEXES = {
+    'ix_contacts_user_id_name_id': ['user_id', 'name', 'id'],
+    'ix_contacts_user_id_surname_name_id': ['user_id', 'surname', 'name', 'id'],
+    'ix_contacts_user_id_birthday_id': ['user_id', 'birthday', 'id'],
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, columns in INDEXES.items():
+            create_index_online(bind, name, 'contacts', columns)
+        # Superseded by ix_contacts_user_id_surname_name_id.
+        drop_index_online(bind, 'ix_contacts_user_id_surname_name')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        create_index_online(
+            bind,
+            'ix_contacts_user_id_surname_name',
+            'contacts',
+            ['user_id', 'surname', 'name'],
+        )
+        for name in INDEXES:
+            drop_index_online(bind, name)
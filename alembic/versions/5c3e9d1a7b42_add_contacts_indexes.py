@@ -0,0 +1,57 @@
+"""Add contacts indexes for per-user access patterns
+
+Revision ID: 5c3e9d1a7b42
+Revises: aaeab1c5bffb
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e9d1a7b42'
+down_revision: Union[str, None] = 'aaeab1c5bffb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so that existing deployments keep accepting writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_id_id', 'contacts', ['user_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_contacts_user_id_surname_name', 'contacts',
+            ['user_id', 'surname', 'name'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_contacts_user_id_birthday_month_day', 'contacts',
+            [
+                sa.text('user_id'),
+                sa.text('EXTRACT(month FROM birthday)'),
+                sa.text('EXTRACT(day FROM birthday)'),
+            ],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_user_id_birthday_month_day', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_contacts_user_id_surname_name', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_contacts_user_id_id', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True,
+        )
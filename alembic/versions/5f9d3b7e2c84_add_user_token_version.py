@@ -0,0 +1,30 @@
+"""Add user token version for self-contained access tokens
+
+Revision ID: 5f9d3b7e2c84
+Revises: 4e8c2a6d9b71
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f9d3b7e2c84'
+down_revision: Union[str, None] = '4e8c2a6d9b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant server default is a metadata-only change on Postgres 11+.
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
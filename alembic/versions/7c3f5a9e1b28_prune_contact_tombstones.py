@@ -0,0 +1,42 @@
+"""Track pruned contact tombstones
+
+Revision ID: 7c3f5a9e1b28
+Revises: 6a1e4c8f3d95
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f5a9e1b28'
+down_revision: Union[str, None] = '6a1e4c8f3d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column(
+            'contacts_pruned_version', sa.BigInteger(), server_default='0', nullable=False
+        ),
+    )
+    with op.get_context().autocommit_block():
+        create_index_online(
+            op.get_bind(),
+            'ix_contact_tombstones_deleted_at',
+            'contact_tombstones',
+            ['deleted_at'],
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_index_online(op.get_bind(), 'ix_contact_tombstones_deleted_at')
+    op.drop_column('users', 'contacts_pruned_version')
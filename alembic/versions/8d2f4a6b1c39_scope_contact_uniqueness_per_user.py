@@ -0,0 +1,48 @@
+"""Scope contact email and phone uniqueness to the owning user
+
+Revision ID: 8d2f4a6b1c39
+Revises: 5c3e9d1a7b42
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6b1c39'
+down_revision: Union[str, None] = '5c3e9d1a7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The per-user indexes are built concurrently before the global
+    # constraints go away, so uniqueness is enforced throughout.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_contacts_user_id_email', 'contacts', ['user_id', 'email'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ux_contacts_user_id_phone', 'contacts', ['user_id', 'phone'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+    op.drop_constraint('contacts_email_key', 'contacts', type_='unique')
+    op.drop_constraint('contacts_phone_key', 'contacts', type_='unique')
+
+
+def downgrade() -> None:
+    # Fails if two users now share a contact email or phone.
+    op.create_unique_constraint('contacts_email_key', 'contacts', ['email'])
+    op.create_unique_constraint('contacts_phone_key', 'contacts', ['phone'])
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ux_contacts_user_id_phone', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ux_contacts_user_id_email', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True,
+        )
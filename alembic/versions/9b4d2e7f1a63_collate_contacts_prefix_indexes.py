@@ -0,0 +1,54 @@
+"""Serve suggestion ordering from the prefix indexes
+
+Revision ID: 9b4d2e7f1a63
+Revises: 7c3f5a9e1b28
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d2e7f1a63'
+down_revision: Union[str, None] = '7c3f5a9e1b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('name', 'surname', 'email')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # A text_pattern_ops index cannot return rows in lower(column) order
+        # under a non-C collation; a "C" collation index serves both the
+        # prefix LIKE and the ORDER BY.
+        collate = ' COLLATE "C"' if bind.dialect.name == 'postgresql' else ''
+        for column in COLUMNS:
+            create_index_online(
+                bind,
+                f'ix_contacts_user_id_prefix_{column}',
+                'contacts',
+                ['user_id', f'lower({column}){collate}'],
+            )
+        for column in COLUMNS:
+            drop_index_online(bind, f'ix_contacts_user_id_lower_{column}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        ops = ' text_pattern_ops' if bind.dialect.name == 'postgresql' else ''
+        for column in COLUMNS:
+            create_index_online(
+                bind,
+                f'ix_contacts_user_id_lower_{column}',
+                'contacts',
+                ['user_id', f'lower({column}){ops}'],
+            )
+        for column in COLUMNS:
+            drop_index_online(bind, f'ix_contacts_user_id_prefix_{column}')
@@ -0,0 +1,34 @@
+"""Index refresh token expiry for pruning
+
+Revision ID: a3e7c9f2d158
+Revises: 9b4d2e7f1a63
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7c9f2d158'
+down_revision: Union[str, None] = '9b4d2e7f1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        create_index_online(
+            op.get_bind(),
+            'ix_refresh_tokens_expires_at',
+            'refresh_tokens',
+            ['expires_at'],
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_index_online(op.get_bind(), 'ix_refresh_tokens_expires_at')
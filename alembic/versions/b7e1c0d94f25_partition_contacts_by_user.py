@@ -0,0 +1,45 @@
+"""Optionally hash-partition contacts by user_id
+
+Opt-in: the migration is a no-op unless a partition count is given with
+``alembic -x contacts_partitions=16 upgrade head`` or ``DB_CONTACTS_PARTITIONS``.
+Databases already past this revision can be converted later with
+``python -m src.database.partitioning --partitions 16``.
+
+Revision ID: b7e1c0d94f25
+Revises: 8d2f4a6b1c39
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+from src.conf.config import settings
+from src.database.partitioning import convert_contacts, partition_count
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c0d94f25'
+down_revision: Union[str, None] = '8d2f4a6b1c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    partitions = int(
+        context.get_x_argument(as_dictionary=True).get(
+            'contacts_partitions', settings.DB_CONTACTS_PARTITIONS
+        )
+    )
+    if not partitions or op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        convert_contacts(op.get_bind(), partitions, settings.DB_PARTITION_BATCH_SIZE)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not partition_count(bind):
+        return
+    with op.get_context().autocommit_block():
+        convert_contacts(bind, 0, settings.DB_PARTITION_BATCH_SIZE)
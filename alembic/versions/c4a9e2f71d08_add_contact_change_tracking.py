@@ -0,0 +1,72 @@
+"""Add per-user change sequence and contact tombstones for delta sync
+
+Revision ID: c4a9e2f71d08
+Revises: b7e1c0d94f25
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.conf.config import settings
+from src.database.partitioning import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9e2f71d08'
+down_revision: Union[str, None] = 'b7e1c0d94f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('contacts_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'contacts',
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.create_table('contact_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_contact_tombstones_user_id_version', 'contact_tombstones',
+        ['user_id', 'version'],
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # Contact ids are unique and increasing, so they make valid initial
+        # versions; every user's sequence then continues above the largest id.
+        batch_size = settings.DB_PARTITION_BATCH_SIZE
+        max_id = bind.execute(sa.text('SELECT coalesce(max(id), 0) FROM contacts')).scalar()
+        for low in range(0, max_id, batch_size):
+            bind.execute(
+                sa.text('UPDATE contacts SET version = id WHERE id > :low AND id <= :high'),
+                {'low': low, 'high': low + batch_size},
+            )
+        bind.execute(
+            sa.text('UPDATE users SET contacts_version = :max_id'), {'max_id': max_id}
+        )
+        create_index_online(
+            bind, 'ix_contacts_user_id_version', 'contacts', ['user_id', 'version']
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_index_online(op.get_bind(), 'ix_contacts_user_id_version')
+    op.drop_index('ix_contact_tombstones_user_id_version', table_name='contact_tombstones')
+    op.drop_table('contact_tombstones')
+    op.drop_column('contacts', 'version')
+    op.drop_column('users', 'contacts_version')
@@ -0,0 +1,40 @@
+"""Add user time zone for the birthday calendar job
+
+Revision ID: e2b6f8a3c517
+Revises: c4a9e2f71d08
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6f8a3c517'
+down_revision: Union[str, None] = 'c4a9e2f71d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant server default is a metadata-only change on Postgres 11+.
+    op.add_column(
+        'users',
+        sa.Column('timezone', sa.String(length=64), server_default='UTC', nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_timezone_id', 'users', ['timezone', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_timezone_id', table_name='users',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('users', 'timezone')
@@ -0,0 +1,90 @@
+"""Add per-user contact counters by birthday month
+
+Writes must be stopped while migrating, or the counters recounted with
+``python -m src.database.contact_stats`` after the rollout.
+
+Revision ID: f3c8d1e7a920
+Revises: e2b6f8a3c517
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.conf.config import settings
+from src.database.database import autocommit_transaction
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8d1e7a920'
+down_revision: Union[str, None] = 'e2b6f8a3c517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def recount(bind, batch_size: int) -> None:
+    """
+    Replace the counters of every user with fresh counts, a range of user
+    ids per transaction.
+
+    A copy of ``src.database.contact_stats.recount_contact_stats`` as of
+    this revision, so later changes to the models or the command do not
+    change what this migration does.
+    """
+    postgresql = bind.dialect.name == 'postgresql'
+    month = (
+        'extract(month FROM birthday)'
+        if postgresql
+        else "CAST(strftime('%m', birthday) AS INTEGER)"
+    )
+    lock = ' FOR UPDATE' if postgresql else ''
+    max_id = bind.execute(sa.text('SELECT coalesce(max(id), 0) FROM users')).scalar()
+    for low in range(0, max_id, batch_size):
+        bounds = {'low': low, 'high': low + batch_size}
+        with autocommit_transaction(bind):
+            # The repository takes the user row lock before every counter
+            # update, so writes during the recount are neither lost nor
+            # counted twice.
+            bind.execute(
+                sa.text(f'SELECT id FROM users WHERE id > :low AND id <= :high{lock}'),
+                bounds,
+            )
+            bind.execute(
+                sa.text(
+                    'DELETE FROM contact_stats WHERE user_id > :low AND user_id <= :high'
+                ),
+                bounds,
+            )
+            bind.execute(
+                sa.text(
+                    'INSERT INTO contact_stats (user_id, month, count) '
+                    f'SELECT user_id, {month}, count(*) FROM contacts '
+                    'WHERE user_id > :low AND user_id <= :high '
+                    f'GROUP BY user_id, {month} '
+                    'ON CONFLICT (user_id, month) DO UPDATE SET count = EXCLUDED.count'
+                ),
+                bounds,
+            )
+
+
+def upgrade() -> None:
+    op.create_table('contact_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.SmallInteger(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'month')
+    )
+
+    # Counters written by the application after create_table are replaced by
+    # the fresh counts. Writes from workers still running the previous
+    # version never update the counters, so stop them before migrating, or
+    # run ``python -m src.database.contact_stats`` once they are gone.
+    with op.get_context().autocommit_block():
+        recount(op.get_bind(), settings.DB_PARTITION_BATCH_SIZE)
+
+
+def downgrade() -> None:
+    op.drop_table('contact_stats')
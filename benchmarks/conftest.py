@@ -0,0 +1,71 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.dataset import load_dataset
+from src.database.models import Base, User
+
+SEEDED_CONTACTS = 1000
+SEEDED_TAGS = 50
+
+
+@pytest.fixture(scope="session")
+def event_loop_runner():
+    """Runs coroutines to completion on one loop shared by all benchmarks.
+
+    pytest-benchmark times synchronous callables, so async primitives are
+    wrapped with ``run(coro_factory)``.
+    """
+    loop = asyncio.new_event_loop()
+
+    def run(coro_factory):
+        return loop.run_until_complete(coro_factory())
+
+    yield run
+    loop.close()
+
+
+def make_contact_payload(index: int) -> dict:
+    """Builds a valid contact payload with unique email and phone."""
+    return {
+        "name": f"Name{index % 97}",
+        "surname": f"Surname{index % 89}",
+        "email": f"contact{index}@example.com",
+        "phone": f"+1555{index:07d}",
+        "birthday": date(1960 + index % 40, 1 + index % 12, 1 + index % 28),
+        "info": "Benchmark contact",
+    }
+
+
+@pytest.fixture(scope="session")
+def seeded_session_factory(event_loop_runner):
+    """In-memory SQLite database with one user owning ``SEEDED_CONTACTS``
+    contacts labelled with ``SEEDED_TAGS`` tags."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await load_dataset(
+            engine,
+            users=1,
+            contacts_per_user=SEEDED_CONTACTS,
+            tags_per_user=SEEDED_TAGS,
+        )
+
+    event_loop_runner(seed)
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    event_loop_runner(engine.dispose)
+
+
+@pytest.fixture(scope="session")
+def bench_user():
+    """The seeded benchmark user."""
+    return User(id=1, username="user1", email="user1@example.com")
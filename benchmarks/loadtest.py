@@ -0,0 +1,536 @@
+"""
+End-to-end load test of the Contacts API with per-route latency reports.
+
+The harness seeds users and contacts into a fresh database, starts the app
+in a separate process (``get_db`` pointed at that database, Redis replaced by
+fakeredis unless ``--redis-url`` is given), mints JWTs with
+``create_access_token`` and drives a mixed workload with a fixed number of
+requests per virtual user. Every virtual user draws its operations from its
+own seeded RNG, so two runs with the same options send the same requests and
+their JSON reports can be compared across commits.
+
+Usage::
+
+    poetry run python -m benchmarks.loadtest --users 20 --contacts-per-user 200 \\
+        --requests 5000 --concurrency 32 --output reports/$(git rev-parse --short HEAD).json
+    poetry run python -m benchmarks.loadtest ... --compare reports/<baseline>.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./loadtest.db"
+PASSWORD = "loadtest-password"
+
+# Operation name -> weight in the mix.
+DEFAULT_MIX = {
+    "list_contacts": 30,
+    "search_contacts": 10,
+    "get_contact": 25,
+    "birthdays": 5,
+    "create_contact": 8,
+    "update_contact": 8,
+    "delete_contact": 4,
+    "me": 8,
+    "login": 2,
+    # Opt-in through --mix so that reports stay comparable with baselines.
+    "suggest": 0,
+    "refresh": 0,
+}
+
+
+def percentile(samples: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples.
+
+    Args:
+        samples (list): Latencies in seconds.
+        pct (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile in milliseconds.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def git_commit() -> str | None:
+    """
+    Return the current commit hash, if the harness runs inside a checkout.
+
+    Returns:
+        str | None: Commit hash.
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_contact(rng: random.Random, worker: int, step: int) -> dict:
+    """
+    Build a contact payload accepted by ``ContactModel``.
+
+    Phones use the +2 country range, which the dataset generator never
+    produces, so created contacts cannot clash with seeded ones.
+
+    Args:
+        rng (random.Random): Source of randomness.
+        worker (int): Virtual user number.
+        step (int): Request number of that virtual user.
+
+    Returns:
+        dict: Contact JSON body.
+    """
+    birthday = date(rng.randint(1950, 2005), rng.randint(1, 12), rng.randint(1, 28))
+    return {
+        "name": rng.choice(["Olena", "Taras", "Anna", "Ivan", "Maria", "Petro"]),
+        "surname": rng.choice(["Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko"]),
+        "email": f"load.{worker}.{step}@example.com",
+        "phone": f"+2{worker:05d}{step:07d}",
+        "birthday": birthday.isoformat(),
+        "info": "Created by the load test",
+    }
+
+
+async def seed(database_url: str, users: int, contacts_per_user: int, seed_value: int):
+    """
+    Recreate the schema and seed users and contacts.
+
+    Args:
+        database_url (str): Async SQLAlchemy URL of the load-test database.
+        users (int): Number of users to create.
+        contacts_per_user (int): Contacts created for every user.
+        seed_value (int): RNG seed.
+
+    Returns:
+        list[dict]: Seeded users with their ids, names, emails and contact ids.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from benchmarks.dataset import load_dataset
+    from src.database.models import Base
+    from src.services.auth import Hash
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    seeded = await load_dataset(
+        engine,
+        users=users,
+        contacts_per_user=contacts_per_user,
+        seed=seed_value,
+        hashed_password=Hash().get_password_hash(PASSWORD),
+    )
+    await engine.dispose()
+    return seeded
+
+
+def serve(database_url: str, redis_url: str | None, port: int):
+    """
+    Run the app against the load-test database (used in the server process).
+
+    Args:
+        database_url (str): Async SQLAlchemy URL of the load-test database.
+        redis_url (str | None): Real Redis URL, or None for fakeredis.
+        port (int): Port to listen on.
+    """
+    import logging
+
+    import uvicorn
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from main import app
+    from src.database.database import get_db, lazy_session
+    from src.services.redis_cache import redis_cache
+
+    logging.disable(logging.WARNING)
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with lazy_session(session_factory) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    if redis_url:
+        import redis.asyncio as redis
+
+        redis_cache.redis = redis.from_url(redis_url)
+    else:
+        from fakeredis import FakeAsyncRedis
+
+        redis_cache.redis = FakeAsyncRedis()
+
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="error")
+
+
+class Recorder:
+    """
+    Collects latencies and status codes per route.
+    """
+
+    def __init__(self):
+        self.latencies: dict[str, list] = {}
+        self.statuses: dict[str, dict] = {}
+
+    def add(self, route: str, elapsed: float, status: int | None):
+        """
+        Record one request.
+
+        Args:
+            route (str): Route template the request targeted.
+            elapsed (float): Latency in seconds.
+            status (int | None): Response status, None on transport errors.
+        """
+        self.latencies.setdefault(route, []).append(elapsed)
+        statuses = self.statuses.setdefault(route, {})
+        key = str(status or "transport_error")
+        statuses[key] = statuses.get(key, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Summarize recorded requests.
+
+        Args:
+            elapsed (float): Wall-clock duration of the run in seconds.
+
+        Returns:
+            dict: Per-route throughput, status codes and p50/p95/p99 in ms.
+        """
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "statuses": dict(sorted(self.statuses[route].items())),
+                "rps": round(len(samples) / elapsed, 1),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "requests": total,
+            "duration_s": round(elapsed, 2),
+            "rps": round(total / elapsed, 1),
+            "routes": routes,
+        }
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    user: dict,
+    token: str,
+    rng: random.Random,
+    requests: int,
+    mix: dict,
+    recorder: Recorder,
+    worker: int,
+):
+    """
+    Send a fixed sequence of requests on behalf of one seeded user.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        user (dict): Seeded user.
+        token (str): JWT of that user.
+        rng (random.Random): Per-worker RNG deciding the operations.
+        requests (int): Number of requests to send.
+        mix (dict): Operation weights.
+        recorder (Recorder): Latency recorder.
+        worker (int): Worker number, used for unique contact data.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    operations, weights = zip(*mix.items())
+    contact_ids = list(user["contact_ids"])
+    created = []
+    refresh_token = None
+
+    for step in range(requests):
+        operation = rng.choices(operations, weights)[0]
+        if operation in ("update_contact", "delete_contact") and not created:
+            operation = "create_contact"
+        if operation == "get_contact" and not contact_ids:
+            operation = "list_contacts"
+        if operation == "refresh" and refresh_token is None:
+            operation = "login"
+
+        if operation == "list_contacts":
+            route, expected = "GET /api/contacts/", 200
+            call = client.get(
+                "/api/contacts/",
+                params={"skip": rng.randint(0, 50), "limit": 20},
+                headers=headers,
+            )
+        elif operation == "search_contacts":
+            route, expected = "GET /api/contacts/?name=", 200
+            call = client.get(
+                "/api/contacts/",
+                params={"name": rng.choice(["an", "ar", "et", "ol"])},
+                headers=headers,
+            )
+        elif operation == "suggest":
+            route, expected = "GET /api/contacts/suggest", 200
+            call = client.get(
+                "/api/contacts/suggest",
+                params={"q": rng.choice(["a", "ol", "sh", "mar"])},
+                headers=headers,
+            )
+        elif operation == "get_contact":
+            route, expected = "GET /api/contacts/{contact_id}", 200
+            contact_id = rng.choice(contact_ids)
+            call = client.get(f"/api/contacts/{contact_id}", headers=headers)
+        elif operation == "birthdays":
+            route, expected = "GET /api/contacts/birthdays/", 200
+            call = client.get(
+                "/api/contacts/birthdays/",
+                params={"days": rng.choice([7, 30])},
+                headers=headers,
+            )
+        elif operation == "create_contact":
+            route, expected = "POST /api/contacts/", 201
+            body = make_contact(rng, worker, step)
+            call = client.post("/api/contacts/", json=body, headers=headers)
+        elif operation == "update_contact":
+            route, expected = "PUT /api/contacts/{contact_id}", 200
+            contact_id, body = rng.choice(created)
+            body = {**body, "info": f"Updated at step {step}"}
+            call = client.put(f"/api/contacts/{contact_id}", json=body, headers=headers)
+        elif operation == "delete_contact":
+            route, expected = "DELETE /api/contacts/{contact_id}", 200
+            contact_id, _ = created.pop(rng.randrange(len(created)))
+            call = client.delete(f"/api/contacts/{contact_id}", headers=headers)
+        elif operation == "me":
+            route, expected = "GET /api/users/me", 200
+            call = client.get("/api/users/me", headers=headers)
+        elif operation == "refresh":
+            route, expected = "POST /api/auth/refresh", 200
+            call = client.post(
+                "/api/auth/refresh", json={"refresh_token": refresh_token}
+            )
+        else:
+            route, expected = "POST /api/auth/login", 200
+            call = client.post(
+                "/api/auth/login", json={"email": user["email"], "password": PASSWORD}
+            )
+
+        started = time.perf_counter()
+        try:
+            response = await call
+            status = response.status_code
+        except httpx.TransportError:
+            status = None
+        recorder.add(route, time.perf_counter() - started, status)
+
+        if status == expected and operation == "create_contact":
+            created.append((response.json()["id"], body))
+        if status == expected and operation in ("login", "refresh"):
+            refresh_token = response.json()["refresh_token"]
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """
+    Poll the server until it accepts connections.
+
+    Args:
+        base_url (str): Server base URL.
+        timeout (float): Seconds to wait before giving up.
+    """
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s")
+
+
+def parse_mix(value: str | None) -> dict:
+    """
+    Parse ``op=weight,op=weight`` into a mix, defaulting to ``DEFAULT_MIX``.
+
+    Args:
+        value (str | None): Mix specification.
+
+    Returns:
+        dict: Operation weights.
+    """
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown operation {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    """
+    Describe per-route changes against a baseline report.
+
+    Args:
+        report (dict): Current report.
+        baseline (dict): Report of the baseline run.
+
+    Returns:
+        list[str]: One line per route.
+    """
+    lines = []
+    for route, current in report["routes"].items():
+        before = baseline["routes"].get(route)
+        if not before:
+            lines.append(f"{route}: new")
+            continue
+        lines.append(
+            f"{route}: p95 {before['p95_ms']} -> {current['p95_ms']} ms, "
+            f"rps {before['rps']} -> {current['rps']}"
+        )
+    return lines
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """
+    Seed the database, start the server and drive the workload.
+
+    Args:
+        args (argparse.Namespace): Harness options.
+
+    Returns:
+        dict: The JSON report.
+    """
+    from src.database.models import User, UserRole
+    from src.services.auth import access_token_claims, create_access_token
+
+    users = await seed(
+        args.database_url, args.users, args.contacts_per_user, args.seed
+    )
+    tokens = [
+        await create_access_token(
+            data=access_token_claims(
+                User(
+                    id=user["id"],
+                    username=user["username"],
+                    role=UserRole.USER,
+                    timezone="UTC",
+                    token_version=0,
+                )
+            )
+        )
+        for user in users
+    ]
+    mix = parse_mix(args.mix)
+
+    server_cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.loadtest",
+        "--serve",
+        "--database-url",
+        args.database_url,
+        "--port",
+        str(args.port),
+    ]
+    if args.redis_url:
+        server_cmd += ["--redis-url", args.redis_url]
+    server = subprocess.Popen(server_cmd)
+    base_url = f"http://127.0.0.1:{args.port}"
+    recorder = Recorder()
+    try:
+        await wait_until_ready(base_url)
+        per_worker = args.requests // args.concurrency
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=30
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        client,
+                        users[worker % len(users)],
+                        tokens[worker % len(users)],
+                        random.Random(f"{args.seed}:{worker}"),
+                        per_worker,
+                        mix,
+                        recorder,
+                        worker,
+                    )
+                    for worker in range(args.concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "options": {
+            "database": args.database_url.split("://")[0],
+            "redis": "redis" if args.redis_url else "fakeredis",
+            "users": args.users,
+            "contacts_per_user": args.contacts_per_user,
+            "requests": per_worker * args.concurrency,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "mix": mix,
+        },
+        **recorder.report(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--redis-url", help="Use a real Redis instead of fakeredis.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--contacts-per-user", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", help="Operation weights, e.g. list_contacts=5,me=1")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare with.")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.database_url, args.redis_url, args.port)
+        return
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+    if args.compare:
+        with open(args.compare) as file:
+            print("\n".join(compare(report, json.load(file))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Compare requests per second of ``GET /api/contacts/`` across server
+configurations started through the ``serve`` entry point.
+
+Each configuration is ``workers:loop:http``, for example ``4:uvloop:httptools``.
+The server is started against the database configured in ``.env``, so the
+user passed with ``--username`` must exist there.
+
+Usage::
+
+    poetry run python -m benchmarks.serve_rps --username treadstone \\
+        --config 1:asyncio:h11 --config 1:uvloop:httptools --config 4:uvloop:httptools
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import httpx
+
+from src.services.auth import create_access_token
+from src.serve import default_workers
+
+DEFAULT_CONFIGS = ["1:asyncio:h11", "1:uvloop:httptools", "0:uvloop:httptools"]
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """
+    Poll the health check until the server answers.
+
+    Args:
+        base_url (str): Server base URL.
+        timeout (float): Seconds to wait before giving up.
+    """
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s")
+
+
+async def drive(base_url: str, token: str, duration: float, concurrency: int) -> dict:
+    """
+    Hammer the contacts list endpoint for a fixed duration.
+
+    Args:
+        base_url (str): Server base URL.
+        token (str): Bearer token of the benchmark user.
+        duration (float): Seconds to run.
+        concurrency (int): Number of concurrent clients.
+
+    Returns:
+        dict: Request count, error count and requests per second.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency)
+    counts = {"ok": 0, "errors": 0}
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            while time.monotonic() < deadline:
+                try:
+                    response = await client.get("/api/contacts/", headers=headers)
+                    counts["ok" if response.status_code == 200 else "errors"] += 1
+                except httpx.TransportError:
+                    counts["errors"] += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "requests": counts["ok"],
+        "errors": counts["errors"],
+        "rps": round(counts["ok"] / elapsed, 1),
+    }
+
+
+async def run_config(config: str, args: argparse.Namespace, token: str) -> dict:
+    """
+    Start the server with one configuration and measure it.
+
+    Args:
+        config (str): ``workers:loop:http`` triple; ``0`` workers means CPU count.
+        args (argparse.Namespace): Benchmark options.
+        token (str): Bearer token of the benchmark user.
+
+    Returns:
+        dict: The configuration and its measurements.
+    """
+    workers, loop, http = config.split(":")
+    workers = int(workers) or default_workers()
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.serve",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(workers),
+            "--loop",
+            loop,
+            "--http",
+            http,
+            "--max-requests",
+            "0",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_until_ready(base_url)
+        await drive(base_url, token, args.warmup, args.concurrency)
+        result = await drive(base_url, token, args.duration, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+    return {"workers": workers, "loop": loop, "http": http, **result}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--config", action="append", dest="configs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    token = await create_access_token(data={"sub": args.username})
+    results = [
+        await run_config(config, args, token)
+        for config in args.configs or DEFAULT_CONFIGS
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from jose import jwt
+
+from src.conf.config import settings
+from src.services.auth import Hash, create_access_token
+from src.services.passwords import password_context
+from src.services.redis_cache import RedisCache
+from src.services.revocation import RevocationList, user_entry
+
+BCRYPT_ROUNDS = [4, 10, 12]
+
+
+def hasher(rounds: int) -> Hash:
+    """Returns a ``Hash`` whose context uses the given bcrypt cost."""
+    hash_ = Hash()
+    hash_.pwd_context = password_context(bcrypt_rounds=rounds)
+    return hash_
+
+
+@pytest.mark.parametrize("rounds", BCRYPT_ROUNDS)
+def test_get_password_hash(benchmark, rounds):
+    hash_ = hasher(rounds)
+
+    result = benchmark(hash_.get_password_hash, "correct horse battery staple")
+
+    assert result.startswith("$2b$")
+
+
+@pytest.mark.parametrize("rounds", BCRYPT_ROUNDS)
+def test_verify_password(benchmark, rounds):
+    hash_ = hasher(rounds)
+    hashed = hash_.get_password_hash("correct horse battery staple")
+
+    assert benchmark(hash_.verify_password, "correct horse battery staple", hashed)
+
+
+@pytest.mark.parametrize("time_cost, memory_cost", [(2, 19456), (3, 65536)])
+def test_verify_password_argon2(benchmark, time_cost, memory_cost):
+    pytest.importorskip("argon2")
+    hash_ = Hash()
+    hash_.pwd_context = password_context(
+        ["argon2"], argon2_time_cost=time_cost, argon2_memory_cost=memory_cost
+    )
+    hashed = hash_.get_password_hash("correct horse battery staple")
+
+    assert benchmark(hash_.verify_password, "correct horse battery staple", hashed)
+
+
+def test_create_access_token(benchmark, event_loop_runner):
+    token = benchmark(
+        event_loop_runner, lambda: create_access_token(data={"sub": "bench"})
+    )
+
+    assert token.count(".") == 2
+
+
+def test_jwt_decode(benchmark, event_loop_runner):
+    token = event_loop_runner(lambda: create_access_token(data={"sub": "bench"}))
+
+    payload = benchmark(
+        jwt.decode, token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+    )
+
+    assert payload["sub"] == "bench"
+
+
+@pytest.mark.parametrize("revoked", [False, True], ids=["not_revoked", "revoked"])
+def test_revocation_check(benchmark, event_loop_runner, revoked):
+    cache = RedisCache()
+    cache.redis = FakeAsyncRedis()
+    revocations = RevocationList(cache)
+
+    async def seed():
+        for index in range(10000):
+            await revocations.revoke(f"jti-{index}", time.time() + 3600)
+
+    event_loop_runner(seed)
+    jti = "jti-1" if revoked else "jti-live"
+
+    # Not revoked is the common path: answered by the local Bloom filter.
+    result = benchmark(
+        event_loop_runner, lambda: revocations.is_revoked(jti, user_entry(1, 0))
+    )
+
+    assert result is revoked
+    event_loop_runner(revocations.close)
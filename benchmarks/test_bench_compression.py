@@ -0,0 +1,53 @@
+import random
+from datetime import datetime
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from benchmarks.dataset import contact_rows
+from src.schemas.contacts import ContactResponse
+from src.services.compression import available_encoders
+
+ENCODERS = available_encoders()
+EXPORT_CHUNK = 100
+
+contact_responses = TypeAdapter(List[ContactResponse])
+
+
+def contacts_json(count: int, start: int = 1) -> bytes:
+    """Serializes ``count`` realistic contacts as the list endpoint does."""
+    rows = list(
+        contact_rows(1, start, count, random.Random(start), datetime(2025, 1, 1))
+    )
+    return contact_responses.dump_json(contact_responses.validate_python(rows))
+
+
+# A default page, a full page and an export streamed in chunks of rows.
+PAYLOADS = {
+    "list_10": [contacts_json(10)],
+    "list_100": [contacts_json(100)],
+    "export_10000": [
+        contacts_json(EXPORT_CHUNK, start) for start in range(1, 10_001, EXPORT_CHUNK)
+    ],
+}
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize("coding", ENCODERS)
+def test_compression(benchmark, coding, payload):
+    chunks = PAYLOADS[payload]
+
+    def compress():
+        encoder = ENCODERS[coding]()
+        parts = [encoder.compress(chunk) for chunk in chunks[:-1]]
+        parts.append(encoder.finish(chunks[-1]))
+        return sum(len(part) for part in parts)
+
+    compressed = benchmark(compress)
+
+    original = sum(len(chunk) for chunk in chunks)
+    benchmark.extra_info["original_bytes"] = original
+    benchmark.extra_info["compressed_bytes"] = compressed
+    benchmark.extra_info["ratio"] = round(original / compressed, 2)
+    assert compressed < original
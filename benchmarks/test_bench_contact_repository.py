@@ -0,0 +1,145 @@
+import itertools
+
+import pytest
+
+from benchmarks.conftest import SEEDED_CONTACTS, make_contact_payload
+from src.repository.contacts import ContactRepository
+from src.schemas.contacts import ContactModel
+
+
+@pytest.fixture
+def run_repository(event_loop_runner, seeded_session_factory):
+    """Runs ``method(repository)`` in a fresh session, like one request."""
+
+    def run(method):
+        async def call():
+            async with seeded_session_factory() as session:
+                return await method(ContactRepository(session))
+
+        return event_loop_runner(call)
+
+    return run
+
+
+def test_get_contacts(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contacts(None, None, None, 0, 10, bench_user),
+    )
+
+    assert len(result) == 10
+
+
+def test_get_contacts_filtered(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contacts("an", None, None, 0, 10, bench_user),
+    )
+
+    assert result
+
+
+def test_get_contacts_sorted(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contacts(
+            None, None, None, 0, 50, bench_user, sort="-birthday"
+        ),
+    )
+
+    assert result[0].birthday >= result[-1].birthday
+
+
+def test_get_contact_fields(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contact_fields(
+            ("name", "email", "id"), None, None, None, 0, 50, bench_user, sort="name"
+        ),
+    )
+
+    assert sorted(result[0]) == ["email", "id", "name"]
+
+
+def test_get_contacts_any_tag(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contacts(
+            None, None, None, 0, 10, bench_user, ["tag0003", "tag0010"]
+        ),
+    )
+
+    assert result
+
+
+def test_get_contacts_all_tags(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contacts(
+            None, None, None, 0, 10, bench_user, ["tag0000", "tag0001"], "all"
+        ),
+    )
+
+    assert all({"tag0000", "tag0001"} <= {t.name for t in c.tags} for c in result)
+
+
+def test_suggest_contacts(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository, lambda repo: repo.suggest_contacts("a", 10, bench_user)
+    )
+
+    assert result
+
+
+def test_get_contact_by_id(benchmark, run_repository, bench_user):
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contact_by_id(SEEDED_CONTACTS // 2, bench_user),
+    )
+
+    assert result is not None
+
+
+def test_is_contact_exists(benchmark, run_repository, bench_user):
+    contact = run_repository(lambda repo: repo.get_contact_by_id(7, bench_user))
+
+    assert benchmark(
+        run_repository,
+        lambda repo: repo.is_contact_exists(contact.email, contact.phone, bench_user),
+    )
+
+
+def test_get_contact_by_phone(benchmark, run_repository, bench_user):
+    contact = run_repository(lambda repo: repo.get_contact_by_id(9, bench_user))
+
+    result = benchmark(
+        run_repository,
+        lambda repo: repo.get_contact_by_phone(contact.phone, bench_user),
+    )
+
+    assert result.id == contact.id
+
+
+def test_get_upcoming_birthdays(benchmark, run_repository, bench_user):
+    benchmark(run_repository, lambda repo: repo.get_upcoming_birthdays(30, bench_user))
+
+
+def test_update_contact(benchmark, run_repository, bench_user):
+    body = ContactModel(**make_contact_payload(3))
+
+    result = benchmark(
+        run_repository, lambda repo: repo.update_contact(4, body, bench_user)
+    )
+
+    assert result.email == body.email
+
+
+def test_create_and_remove_contact(benchmark, run_repository, bench_user):
+    counter = itertools.count(SEEDED_CONTACTS)
+
+    async def create_and_remove(repo):
+        body = ContactModel(**make_contact_payload(next(counter)))
+        contact = await repo.create_contact(body, bench_user)
+        return await repo.remove_contact(contact.id, bench_user)
+
+    assert benchmark(run_repository, create_and_remove) is not None
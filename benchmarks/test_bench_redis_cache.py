@@ -0,0 +1,40 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.services.redis_cache import RedisCache
+
+CACHED_USER = {
+    "id": 1,
+    "username": "bench",
+    "email": "bench@example.com",
+    "is_verified": True,
+    "role": "user",
+}
+
+
+@pytest.fixture
+def cache():
+    """RedisCache backed by fakeredis."""
+    cache = RedisCache()
+    cache.redis = FakeAsyncRedis()
+    return cache
+
+
+def test_redis_cache_set(benchmark, event_loop_runner, cache):
+    benchmark(event_loop_runner, lambda: cache.set("user:bench", CACHED_USER))
+
+
+def test_redis_cache_get(benchmark, event_loop_runner, cache):
+    event_loop_runner(lambda: cache.set("user:bench", CACHED_USER))
+
+    result = benchmark(event_loop_runner, lambda: cache.get("user:bench"))
+
+    assert result == CACHED_USER
+
+
+def test_redis_cache_round_trip(benchmark, event_loop_runner, cache):
+    async def round_trip():
+        await cache.set("user:bench", CACHED_USER)
+        return await cache.get("user:bench")
+
+    assert benchmark(event_loop_runner, round_trip) == CACHED_USER
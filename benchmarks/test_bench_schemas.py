@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from benchmarks.conftest import make_contact_payload
+from src.database.models import Contact
+from src.schemas.contacts import ContactModel, ContactResponse
+
+SIZES = [1, 100, 1000]
+
+contact_models = TypeAdapter(List[ContactModel])
+contact_responses = TypeAdapter(List[ContactResponse])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_contact_model_validation(benchmark, size):
+    payloads = []
+    for i in range(size):
+        payload = make_contact_payload(i)
+        payloads.append({**payload, "birthday": payload["birthday"].isoformat()})
+
+    result = benchmark(contact_models.validate_python, payloads)
+
+    assert len(result) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_contact_response_serialization(benchmark, size):
+    now = datetime(2025, 1, 1)
+    contacts = [
+        Contact(id=i, created_at=now, updated_at=now, **make_contact_payload(i))
+        for i in range(size)
+    ]
+
+    def serialize():
+        validated = contact_responses.validate_python(contacts, from_attributes=True)
+        return contact_responses.dump_json(validated)
+
+    result = benchmark(serialize)
+
+    assert result.startswith(b"[")
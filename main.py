@@ -9,9 +9,18 @@ from starlette.responses import JSONResponse
 
 from alembic import command
 from alembic.config import Config
-from src.api import auth, contacts, users, utils
+from src.api import auth, contacts, metrics, users, utils
+from src.conf.config import settings
+from src.services.birthdays import birthday_job
+from src.services.compression import CompressionMiddleware
+from src.services.contact_events import contact_events
 from src.services.limiter import limiter
+from src.services.metrics import MetricsMiddleware, instrument_database
+from src.services.query_stats import QueryStatsMiddleware, instrument_query_stats
 from src.services.redis_cache import redis_cache
+from src.services.refresh_tokens import refresh_token_pruner
+from src.services.revocation import revocation_list
+from src.services.tombstones import tombstone_pruner
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -34,8 +43,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+        encodings=settings.COMPRESSION_ENCODINGS,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+instrument_database()
+instrument_query_stats()
+
 app.state.limiter = limiter
 
 
@@ -58,6 +83,7 @@ app.include_router(contacts.router, prefix="/api")
 app.include_router(utils.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(metrics.router)
 
 
 def run_migrations():
@@ -72,10 +98,22 @@ def run_migrations():
 async def startup_event():
     """
     Run database migrations when the application starts.
+
+    Migrations are skipped when the ``serve`` entry point has already
+    applied them in the master process before forking workers. The birthday
+    calendar, tombstone and refresh token pruning jobs are started once Redis
+    is connected.
     """
     try:
-        await asyncio.to_thread(run_migrations)
+        if not getattr(app.state, "migrations_applied", False):
+            await asyncio.to_thread(run_migrations)
         await redis_cache.connect()
+        if settings.BIRTHDAY_JOB_ENABLED:
+            birthday_job.start()
+        if settings.CONTACT_TOMBSTONE_RETENTION_DAYS:
+            tombstone_pruner.start()
+        if settings.REFRESH_TOKEN_RETENTION_DAYS:
+            refresh_token_pruner.start()
     except Exception as e:
         import traceback
 
@@ -83,6 +121,19 @@ async def startup_event():
         traceback.print_exc()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Stop the contact event and token revocation listeners and the birthday,
+    tombstone and refresh token pruning jobs when the application shuts down.
+    """
+    await birthday_job.stop()
+    await tombstone_pruner.stop()
+    await refresh_token_pruner.stop()
+    await contact_events.close()
+    await revocation_list.close()
+
+
 if __name__ == "__main__":
     import uvicorn
 
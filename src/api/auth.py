@@ -2,20 +2,34 @@ import logging
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
+from src.conf.config import settings
 from src.database.database import get_db
 from src.schemas.users import (
+    Principal,
+    RefreshRequest,
     RequestEmail,
     Token,
     User,
     UserCreate,
     UserLogin,
     ResetPassword,
-    UserCacheModel,
 )
-from src.services.auth import create_access_token, get_email_from_token, Hash
+from src.services.auth import (
+    access_token_claims,
+    cache_user_profile,
+    create_access_token,
+    get_current_user,
+    get_email_from_token,
+    Hash,
+    hash_in_threadpool,
+    rehash_password,
+    revoke_user_tokens,
+)
 from src.services.email import send_email, send_reset_password_email
+from src.services.metrics import track_background_job
+from src.services.refresh_tokens import RefreshTokenService
+from src.services.revocation import revocation_list
 from src.services.users import UserService
-from src.services.redis_cache import redis_cache
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -59,28 +73,40 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="A user with this username already exists.",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await hash_in_threadpool(
+        Hash().get_password_hash, user_data.password
+    )
     new_user = await user_service.create_user(user_data)
     background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+        track_background_job(send_email),
+        new_user.email,
+        new_user.username,
+        request.base_url,
     )
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login_user(body: UserLogin, db: Session = Depends(get_db)):
+async def login_user(
+    body: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
-    Authenticate user and return access token.
+    Authenticate user and return an access and a refresh token.
 
     This endpoint verifies the user's email and password, and if
-    valid, returns a JWT token.
+    valid, returns a short-lived JWT access token and a refresh token
+    starting a new token family. A password hashed with an outdated scheme
+    or cost is rehashed in the background.
 
     Args:
         body (UserLogin): User login credentials.
+        background_tasks (BackgroundTasks): Background task manager.
         db (Session): Database session dependency.
 
     Returns:
-        Token: A JWT access token.
+        Token: A JWT access token and a refresh token.
     """
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
@@ -89,27 +115,91 @@ async def login_user(body: UserLogin, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email is not verified.",
         )
-    if not user or not Hash().verify_password(body.password, user.hashed_password):
+    if not user or not await hash_in_threadpool(
+        Hash().verify_password, body.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = await create_access_token(data={"sub": user.username})
+    if Hash().needs_update(user.hashed_password):
+        background_tasks.add_task(
+            track_background_job(rehash_password),
+            user.id,
+            user.hashed_password,
+            body.password,
+        )
+
+    access_token = await create_access_token(data=access_token_claims(user))
+    refresh_token = await RefreshTokenService(db).issue(user.id)
+    await cache_user_profile(user)
 
-    cached_user = UserCacheModel(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        is_verified=user.is_verified,
-        role=user.role,
-    ).dict()
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.JWT_EXPIRATION_SECONDS,
+    }
 
-    if redis_cache.redis:
-        await redis_cache.set(f"user:{user.username}", cached_user, expire=3600)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/refresh", response_model=Token)
+async def refresh_token(body: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access and refresh token.
+
+    The presented refresh token is used up. Presenting it again revokes
+    every token rotated from the same login. No password is checked, so
+    keeping a session alive costs no bcrypt work.
+
+    Args:
+        body (RefreshRequest): The refresh token.
+        db (Session): Database session dependency.
+
+    Returns:
+        Token: A new JWT access token and refresh token.
+    """
+    user, refresh_token = await RefreshTokenService(db).rotate(body.refresh_token)
+    access_token = await create_access_token(data=access_token_claims(user))
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.JWT_EXPIRATION_SECONDS,
+    }
+
+
+@router.post("/logout")
+async def logout(
+    body: RefreshRequest | None = None,
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Revoke the presented access token and, if given, its refresh token.
+
+    The access token's ``jti`` stays on the revocation list until the token
+    expires. Tokens without a ``jti`` cannot be revoked one by one, so every
+    token of the user is revoked instead. The refresh token's whole family
+    is revoked.
+
+    Args:
+        body (RefreshRequest | None): Optional refresh token to revoke.
+        principal (Principal): Identity from the access token.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: A message confirming the logout.
+    """
+    if principal.jti and principal.expires_at:
+        await revocation_list.revoke(principal.jti, principal.expires_at)
+    else:
+        await revoke_user_tokens(db, principal.id)
+    if body is not None:
+        await RefreshTokenService(db).revoke(body.refresh_token, principal.id)
+    return {"message": "Logged out"}
 
 
 @router.get("/confirmed_email/{token}")
@@ -168,7 +258,10 @@ async def request_email(
         return {"message": "Your email is already verified."}
     if user:
         background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
+            track_background_job(send_email),
+            user.email,
+            user.username,
+            request.base_url,
         )
     return {"message": "Check your email for verification instructions."}
 
@@ -204,7 +297,7 @@ async def forgot_password_request(
         reset_token = await create_access_token(data={"sub": user.email})
         logging.info(f"Password reset token generated: {reset_token}")
         background_tasks.add_task(
-            send_reset_password_email,
+            track_background_job(send_reset_password_email),
             user.email,
             user.username,
             str(request.base_url).rstrip("/"),
@@ -240,7 +333,10 @@ async def reset_password(
             detail="User not found",
         )
 
-    hashed_password = Hash().get_password_hash(body.new_password)
+    hashed_password = await hash_in_threadpool(
+        Hash().get_password_hash, body.new_password
+    )
     await user_service.reset_password(user.id, hashed_password)
+    await revoke_user_tokens(db, user.id)
 
     return {"message": "Password successfully changed"}
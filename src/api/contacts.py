@@ -1,13 +1,25 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.database import get_db
-from src.database.models import User
-from src.schemas.contacts import ContactModel, ContactResponse
+from src.schemas.contacts import (
+    ContactChanges,
+    ContactModel,
+    DuplicateReport,
+    ContactResponse,
+    ContactStats,
+    ContactSuggestion,
+    SORT_FIELDS,
+    TagResponse,
+)
+from src.schemas.users import Principal
 from src.services.auth import get_current_user
+from src.services.contact_events import contact_events
 from src.services.contacts import ContactService
+from src.services.replica import get_read_db
 
 router = APIRouter()
 
@@ -16,7 +28,7 @@ router = APIRouter()
 async def create_contact(
     body: ContactModel,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Create a new contact for an authenticated user.
@@ -24,7 +36,7 @@ async def create_contact(
     Args:
         body (ContactModel): The contact data to create.
         db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        user (Principal): The authenticated user.
 
     Returns:
         ContactResponse: The created contact details.
@@ -35,48 +47,257 @@ async def create_contact(
 
 @router.get("/contacts/", response_model=List[ContactResponse])
 async def read_contacts(
+    response: Response,
     name: str = Query(None),
     surname: str = Query(None),
     email: str = Query(None),
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    include_total: bool = Query(False),
+    tags: List[str] = Query(None),
+    tag_mode: str = Query("any", pattern="^(any|all)$"),
+    sort: str = Query("id", pattern=f"^-?({'|'.join(SORT_FIELDS)})$"),
+    fields: str = Query(None, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Retrieve a list of contacts for the authenticated user.
 
-    Supports filtering by name, surname, and email.
+    Supports filtering by name, surname, email, and tags. Tags may be given
+    as repeated ``tags`` parameters or comma-separated. With ``fields``,
+    only the listed columns are loaded and returned.
 
     Args:
+        response (Response): Response whose headers are set.
         name (str, optional): Filter by contact's name.
         surname (str, optional): Filter by contact's surname.
         email (str, optional): Filter by contact's email.
         skip (int, optional): Number of contacts to skip (pagination).
         limit (int, optional): Maximum number of contacts to return.
-        db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        include_total (bool, optional): Return the number of contacts
+            matching the filters in the ``X-Total-Count`` header.
+        tags (List[str], optional): Filter by tags.
+        tag_mode (str, optional): ``any`` returns contacts with at least one
+            of the tags, ``all`` contacts with every tag.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
 
     Returns:
         List[ContactResponse]: A list of contact details.
     """
+    if tags:
+        tags = sorted(
+            {tag.strip().lower() for value in tags for tag in value.split(",")} - {""}
+        )
+    service = ContactService(db)
+    if include_total:
+        total = await service.count_contacts(
+            name, surname, email, user, tags, tag_mode
+        )
+        response.headers["X-Total-Count"] = str(total)
+    if fields:
+        page = await service.get_contact_fields(
+            fields, name, surname, email, skip, limit, user, tags, tag_mode, sort
+        )
+        # Serialized here: the full response model would reject partial rows.
+        return Response(
+            page.model_dump_json(),
+            media_type="application/json",
+            headers=response.headers,
+        )
+    return await service.get_contacts(
+        name, surname, email, skip, limit, user, tags, tag_mode, sort
+    )
+
+
+@router.get("/contacts/suggest", response_model=List[ContactSuggestion])
+async def suggest_contacts(
+    q: str = Query(min_length=1, max_length=100, pattern=r"\S"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Suggest contacts as the user types, for contact pickers.
+
+    Matches case-insensitive prefixes of name, surname and email, and returns
+    only the ID and a display string. Blank text is rejected.
+
+    Args:
+        q (str): Text typed so far.
+        limit (int, optional): Maximum number of suggestions.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        List[ContactSuggestion]: Matching contacts ordered by name.
+    """
+    service = ContactService(db)
+    return await service.suggest_contacts(q, limit, user)
+
+
+@router.get("/contacts/duplicates", response_model=DuplicateReport)
+async def find_duplicate_contacts(
+    min_score: float = Query(0.55, gt=0, le=1),
+    merge_plan: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Find groups of the authenticated user's contacts that are likely
+    duplicates, such as the same person imported twice with a differently
+    cased email or formatted phone.
+
+    Args:
+        min_score (float, optional): Lowest pair score (0 to 1) that links
+            two contacts. A shared email or phone scores 0.7, a
+            similar-sounding name with the same birthday 0.58.
+        merge_plan (bool, optional): Suggest which contact of each group to
+            keep and which details to copy into it.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        DuplicateReport: Duplicate groups, largest first.
+    """
+    service = ContactService(db)
+    return await service.find_duplicates(min_score, merge_plan, user)
+
+
+@router.get("/contacts/lookup", response_model=ContactResponse)
+async def lookup_contact(
+    phone: str = Query(min_length=3, max_length=32),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Find the contact with an exact phone number, for caller-ID lookups.
+
+    The number may be given in any international format; it is normalized
+    to E.164 like stored phones.
+
+    Args:
+        phone (str): Phone number to look up.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        ContactResponse: The contact with that phone number.
+    """
     service = ContactService(db)
-    return await service.get_contacts(name, surname, email, skip, limit, user)
+    return await service.lookup_contact(phone, user)
+
+
+@router.get("/contacts/tags", response_model=List[TagResponse])
+async def read_contact_tags(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Retrieve the user's tags with the number of contacts carrying each.
+
+    Args:
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        List[TagResponse]: Tags in use, most used first.
+    """
+    service = ContactService(db)
+    return await service.get_tags(user)
+
+
+@router.get("/contacts/stats", response_model=ContactStats)
+async def read_contact_stats(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Retrieve the number of contacts in total and by birthday month.
+
+    Args:
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        ContactStats: Contact counts.
+    """
+    service = ContactService(db)
+    return await service.get_stats(user)
+
+
+@router.get("/contacts/changes", response_model=ContactChanges)
+async def read_contact_changes(
+    since: int = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    full: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Retrieve the IDs of contacts created, updated or deleted since a token.
+
+    Clients start without ``since`` (every existing contact is returned),
+    then pass the returned token to receive only later changes. When
+    ``has_more`` is set, sync again immediately with the new token, adding
+    ``full=true`` while paging through a full sync. A token older than the
+    tombstone retention window gets a full sync flagged with ``reset``.
+
+    Args:
+        since (int, optional): Token returned by the previous sync.
+        limit (int, optional): Maximum number of changes to return.
+        full (bool, optional): Whether ``since`` continues a full sync.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
+
+    Returns:
+        ContactChanges: Upserted and deleted contact IDs and the next token.
+    """
+    service = ContactService(db)
+    return await service.get_changes(since, limit, user, full)
+
+
+@router.get("/contacts/events", response_class=StreamingResponse)
+async def contact_events_stream(
+    last_event_id: str = Header(None),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Stream the authenticated user's contact changes as server-sent events.
+
+    Each ``created``, ``updated`` or ``deleted`` event carries the contact ID
+    and its change ``version``. Reconnecting clients send ``Last-Event-ID``
+    to replay what they missed; a ``resync`` event means the gap is too old
+    and the client should catch up through ``GET /api/contacts/changes``.
+
+    Args:
+        last_event_id (str, optional): ID of the last event received.
+        user (Principal): The authenticated user.
+
+    Returns:
+        StreamingResponse: The ``text/event-stream`` response.
+    """
+    return StreamingResponse(
+        contact_events.stream(user.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/contacts/{contact_id}", response_model=ContactResponse)
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Retrieve details of a specific contact by its ID.
 
     Args:
         contact_id (int): The ID of the contact to retrieve.
-        db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
 
     Returns:
         ContactResponse: The contact details.
@@ -90,7 +311,7 @@ async def update_contact(
     contact_id: int,
     body: ContactModel,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Update an existing contact's details.
@@ -99,7 +320,7 @@ async def update_contact(
         contact_id (int): The ID of the contact to update.
         body (ContactModel): The updated contact data.
         db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        user (Principal): The authenticated user.
 
     Returns:
         ContactResponse: The updated contact details.
@@ -112,7 +333,7 @@ async def update_contact(
 async def delete_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Delete a contact by its ID.
@@ -120,7 +341,7 @@ async def delete_contact(
     Args:
         contact_id (int): The ID of the contact to delete.
         db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        user (Principal): The authenticated user.
 
     Returns:
         ContactResponse: The deleted contact details.
@@ -132,8 +353,8 @@ async def delete_contact(
 @router.get("/contacts/birthdays/", response_model=List[ContactResponse])
 async def upcoming_birthdays(
     days: int = 7,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Retrieve contacts with upcoming birthdays within a specified number
@@ -142,8 +363,8 @@ async def upcoming_birthdays(
     Args:
         days (int, optional): Number of days to look ahead for upcoming
         birthdays. Defaults to 7.
-        db (AsyncSession): Database session dependency.
-        user (User): The authenticated user.
+        db (AsyncSession): Read-only database session dependency.
+        user (Principal): The authenticated user.
 
     Returns:
         List[ContactResponse]: A list of contacts with upcoming birthdays.
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+
+from src.services.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Expose application metrics for Prometheus scraping.
+
+    Returns:
+        Response: Metrics in the Prometheus text exposition format.
+    """
+    data, content_type = render_metrics()
+    return Response(content=data, media_type=content_type)
@@ -5,8 +5,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.conf.config import settings
 from src.database.database import get_db
-from src.schemas.users import User
-from src.services.auth import get_current_user, get_current_admin_user
+from src.schemas.users import User, UserCacheModel
+from src.services.auth import (
+    cache_user_profile,
+    get_current_admin_user,
+    get_verified_user,
+    revoke_user_tokens,
+)
 from src.services.upload_file import UploadFileService
 from src.services.users import UserService
 
@@ -14,12 +19,12 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=User)
-async def me(user: User = Depends(get_current_user)):
+async def me(user: UserCacheModel = Depends(get_verified_user)):
     """
     Retrieve the authenticated user's profile information.
 
     Args:
-        user (User): The currently authenticated user.
+        user (UserCacheModel): The verified user profile.
 
     Returns:
     """
@@ -34,7 +39,7 @@ async def me(user: User = Depends(get_current_user)):
 @router.patch("/avatar", response_model=User)
 async def update_avatar_user(
     file: UploadFile = File(),
-    user: User = Depends(get_current_admin_user),
+    user: UserCacheModel = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -42,7 +47,7 @@ async def update_avatar_user(
 
     Args:
         file (UploadFile): The image file to upload.
-        user (User): The currently authenticated user.
+        user (UserCacheModel): The verified administrator.
         db (AsyncSession): Database session dependency.
 
     Returns:
@@ -54,5 +59,32 @@ async def update_avatar_user(
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
+    await cache_user_profile(user)
 
     return user
+
+
+@router.post("/{user_id}/revoke-tokens")
+async def revoke_tokens(
+    user_id: int,
+    user: UserCacheModel = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Revoke every access and refresh token of a user.
+
+    Args:
+        user_id (int): ID of the user whose tokens are revoked.
+        user (UserCacheModel): The verified administrator.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        dict: A message confirming the revocation.
+
+    Raises:
+        HTTPException: 404 if the user does not exist.
+    """
+    if not await revoke_user_tokens(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    logging.info(f"Admin {user.username} revoked the tokens of user {user_id}")
+    return {"message": "Tokens revoked"}
@@ -19,10 +19,28 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_HOST: str
     DB_PORT: str
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: str | None = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 1.0
+    DB_REPLICA_RETRY_SECONDS: int = 30
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
+    DB_CONTACTS_PARTITIONS: int = 0
+    DB_PARTITION_BATCH_SIZE: int = 10000
 
     JWT_SECRET: str
     JWT_ALGORITHM: str
     JWT_EXPIRATION_SECONDS: int
+    JWT_REFRESH_EXPIRATION_SECONDS: int = 2592000
+    TOKEN_REVOCATION_CAPACITY: int = 100000
+    TOKEN_REVOCATION_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_REBUILD_SECONDS: int = 300
+
+    PASSWORD_SCHEMES: list[str] = ["bcrypt"]
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
 
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -44,6 +62,54 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_DB: int
 
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_QUEUE_SIZE: int = 100
+    CONTACT_EVENTS_STREAM_MAXLEN: int = 1000
+
+    BIRTHDAY_JOB_ENABLED: bool = True
+    BIRTHDAY_JOB_INTERVAL_SECONDS: int = 300
+    BIRTHDAY_JOB_CHUNK_SIZE: int = 500
+    BIRTHDAY_DIGEST_ENABLED: bool = False
+    BIRTHDAY_CALENDAR_TTL_SECONDS: int = 2 * 24 * 3600
+
+    CONTACT_COUNT_CACHE_TTL_SECONDS: int = 600
+
+    # 0 keeps tombstones forever.
+    CONTACT_TOMBSTONE_RETENTION_DAYS: int = 30
+    TOMBSTONE_PRUNE_INTERVAL_SECONDS: int = 3600
+    # Days expired refresh tokens are kept; 0 keeps them forever.
+    REFRESH_TOKEN_RETENTION_DAYS: int = 7
+    REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS: int = 3600
+
+    DUPLICATES_BATCH_SIZE: int = 500
+    DUPLICATES_MAX_BLOCK_SIZE: int = 100
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_ENCODINGS: list[str] = ["zstd", "br", "gzip"]
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/html",
+        "text/plain",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    DEBUG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+
     @property
     def database_url(self) -> str:
         """
@@ -57,5 +123,24 @@ class Settings(BaseSettings):
             f"{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def replica_database_url(self) -> str | None:
+        """
+        Constructs the read-replica connection URL.
+
+        The replica shares credentials and database name with the primary.
+
+        Returns:
+            str | None: A PostgreSQL connection string, or None if no
+            replica is configured.
+        """
+        if not self.DB_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@"
+            f"{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT or self.DB_PORT}/"
+            f"{self.DB_NAME}"
+        )
+
 
 settings = Settings()
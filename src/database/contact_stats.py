@@ -0,0 +1,90 @@
+"""
+Recount the ``contact_stats`` counters from the contacts themselves.
+
+The repository keeps the counters in step with every write, but writes made
+by a version of the application that predates the counters are not counted.
+Run the recount once no such version is serving writes any more::
+
+    poetry run python -m src.database.contact_stats
+
+Users are recounted in id ranges. Each range is replaced in one short
+transaction holding the row locks of its users, which every counter update
+of the repository takes first, so writes made while the recount runs are
+neither lost nor counted twice.
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import create_engine, delete, extract, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from src.conf.config import settings
+from src.database.database import autocommit_transaction
+from src.database.models import Contact, ContactStats, User
+
+logger = logging.getLogger(__name__)
+
+
+def recount_contact_stats(conn: Connection, batch_size: int = 10000) -> int:
+    """
+    Replace every user's counters with fresh counts of their contacts.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        batch_size (int): Width of each user id range.
+
+    Returns:
+        int: Number of counter rows written.
+    """
+    insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    max_id = conn.execute(select(func.coalesce(func.max(User.id), 0))).scalar()
+    written = 0
+    for low in range(0, max_id, batch_size):
+        high = low + batch_size
+        month = extract("month", Contact.birthday)
+        counts = (
+            select(Contact.user_id, month, func.count())
+            .where(Contact.user_id > low, Contact.user_id <= high)
+            .group_by(Contact.user_id, month)
+        )
+        statement = insert(ContactStats).from_select(
+            ["user_id", "month", "count"], counts
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[ContactStats.user_id, ContactStats.month],
+            set_={"count": statement.excluded.count},
+        )
+        with autocommit_transaction(conn):
+            conn.execute(
+                select(User.id)
+                .where(User.id > low, User.id <= high)
+                .with_for_update()
+            )
+            conn.execute(
+                delete(ContactStats).where(
+                    ContactStats.user_id > low, ContactStats.user_id <= high
+                )
+            )
+            written += conn.execute(statement).rowcount
+        logger.info("Recounted contacts of users %s to %s", low + 1, high)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.DB_PARTITION_BATCH_SIZE
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(settings.database_url, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        recount_contact_stats(conn, args.batch_size)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
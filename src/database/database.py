@@ -1,7 +1,11 @@
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from src.conf.config import settings
+from src.services.metrics import record_session
 
 import logging
 
@@ -19,18 +23,136 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+REPLICA_DATABASE_URL = (
+    settings.replica_database_url.replace("postgresql://", "postgresql+asyncpg://")
+    if settings.replica_database_url
+    else None
+)
+
+replica_engine = (
+    create_async_engine(REPLICA_DATABASE_URL, echo=True)
+    if REPLICA_DATABASE_URL
+    else None
+)
+
+ReplicaSessionLocal = (
+    sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    if replica_engine
+    else None
+)
+
 Base = declarative_base()
 
 
+class LazySession:
+    """
+    Stand-in for an ``AsyncSession`` that creates the session on first use.
+
+    Attribute access is forwarded to the real session, so repositories use
+    it like an ``AsyncSession``. Requests answered entirely from cache never
+    create a session and never check a connection out of the pool.
+    """
+
+    def __init__(self, session_factory):
+        """
+        Initialize the lazy session.
+
+        Args:
+            session_factory: Factory creating the real session.
+        """
+        self._session_factory = session_factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        """
+        Whether the real session was created.
+
+        Returns:
+            bool: True once the session was used.
+        """
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        """
+        The real session, created on first access.
+
+        Returns:
+            AsyncSession: SQLAlchemy asynchronous session instance.
+        """
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def close(self):
+        """
+        Close the real session if it was created.
+        """
+        if self._session is not None:
+            await self._session.close()
+
+
+@asynccontextmanager
+async def lazy_session(session_factory):
+    """
+    Provide a :class:`LazySession` and close it afterwards.
+
+    Whether the session was used is counted in the ``db_sessions_total``
+    metric.
+
+    Args:
+        session_factory: Factory creating the real session.
+
+    Yields:
+        LazySession: Session created on first use.
+    """
+    session = LazySession(session_factory)
+    try:
+        yield session
+    finally:
+        record_session(session.started)
+        await session.close()
+
+
 async def get_db() -> AsyncSession:
     """
     Dependency to provide an asynchronous database session.
 
-    This function yields an async session that ensures proper resource
-    management using a context manager.
+    The session is only created when the request first uses it, so
+    dependencies that may be satisfied without the database (such as
+    ``get_current_user``) cost nothing when they are.
 
     Yields:
-        AsyncSession: SQLAlchemy asynchronous session instance.
+        AsyncSession: Lazily created SQLAlchemy asynchronous session.
     """
-    async with AsyncSessionLocal() as session:
+    async with lazy_session(AsyncSessionLocal) as session:
         yield session
+
+
+@contextmanager
+def autocommit_transaction(conn: Connection):
+    """
+    Run a block in an explicit transaction on an autocommit connection.
+
+    Online maintenance (migrations in ``autocommit_block()`` and the
+    commands in :mod:`src.database`) commits each statement on its own and
+    groups the steps that must be atomic with this.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+    """
+    conn.exec_driver_sql("BEGIN")
+    try:
+        yield
+    except Exception:
+        conn.exec_driver_sql("ROLLBACK")
+        raise
+    conn.exec_driver_sql("COMMIT")
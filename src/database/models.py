@@ -1,21 +1,51 @@
 from enum import Enum
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
+    extract,
     func,
     Enum as SqlEnum,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 Base = declarative_base()
 
 
+class prefix_key(FunctionElement):
+    """
+    ``lower(column)`` under the byte-order ``"C"`` collation on Postgres.
+
+    A plain btree index on this expression serves both ``LIKE 'prefix%'``
+    and ``ORDER BY`` whatever the database collation is. Other databases
+    get ``lower(column)``.
+    """
+
+    type = String()
+    name = "prefix_key"
+    inherit_cache = True
+
+
+@compiles(prefix_key)
+def _compile_prefix_key(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(prefix_key, "postgresql")
+def _compile_prefix_key_postgresql(element, compiler, **kw):
+    return f'lower({compiler.process(element.clauses, **kw)}) COLLATE "C"'
+
+
 class UserRole(str, Enum):
     """
     Перерахунок ролей користувачів.
@@ -37,15 +67,23 @@ class Contact(Base):
         id (int): Primary key for the contact.
         name (str): First name of the contact.
         surname (str): Last name of the contact.
-        email (str): Unique email address of the contact.
-        phone (str): Unique phone number of the contact.
+        email (str): Email address of the contact, unique per user.
+        phone (str): Phone number of the contact, unique per user.
         birthday (date): Birthday of the contact.
         created_at (datetime): Timestamp of when the contact was created.
         updated_at (datetime): Timestamp of the last update.
         info (str, optional): Additional information about the contact.
         user_id (int, optional): Foreign key referencing the user who
         owns the contact.
+        version (int): Owner's change sequence number of the last write.
+        email_key (str): Lowercased email, for duplicate detection.
+        phone_key (str): National digits of the phone, for duplicate
+        detection.
+        name_key (str): Phonetic key of surname and name, for duplicate
+        detection.
         user (User): Relationship to the User model.
+        tag_links (list[ContactTag]): Links to the contact's tags, loaded
+        with the contact.
     """
 
     __tablename__ = "contacts"
@@ -53,8 +91,8 @@ class Contact(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
     surname = Column(String(50), nullable=False)
-    email = Column(String(100), nullable=False, unique=True)
-    phone = Column(String(20), nullable=False, unique=True)
+    email = Column(String(100), nullable=False)
+    phone = Column(String(20), nullable=False)
     birthday = Column(Date, nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -62,7 +100,161 @@ class Contact(Base):
     user_id = Column(
         "user_id", ForeignKey("users.id", ondelete="CASCADE"), default=None
     )
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    email_key = Column(String(100), nullable=True)
+    phone_key = Column(String(20), nullable=True)
+    name_key = Column(String(16), nullable=True)
     user = relationship("User", backref="contacts")
+    # Loaded straight from the contact_tags index, without joining contacts
+    # again as a many-to-many relationship would.
+    tag_links = relationship(
+        "ContactTag",
+        primaryjoin="and_(Contact.user_id == foreign(ContactTag.user_id), "
+        "Contact.id == foreign(ContactTag.contact_id))",
+        lazy="selectin",
+        viewonly=True,
+    )
+
+    @property
+    def tags(self):
+        """
+        Tags of the contact, ordered by name.
+
+        Returns:
+            list[Tag]: Tags loaded with the contact.
+        """
+        return sorted((link.tag for link in self.tag_links), key=lambda t: t.name)
+
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_version", "user_id", "version"),
+        Index("ux_contacts_user_id_email", "user_id", "email", unique=True),
+        Index("ux_contacts_user_id_phone", "user_id", "phone", unique=True),
+        # Sort orders of the contact list (see SORT_COLUMNS).
+        Index("ix_contacts_user_id_name_id", "user_id", "name", "id"),
+        Index(
+            "ix_contacts_user_id_surname_name_id", "user_id", "surname", "name", "id"
+        ),
+        Index("ix_contacts_user_id_birthday_id", "user_id", "birthday", "id"),
+        Index(
+            "ix_contacts_user_id_birthday_month_day",
+            user_id,
+            extract("month", birthday),
+            extract("day", birthday),
+        ),
+        # Blocking keys for duplicate detection.
+        Index("ix_contacts_user_id_email_key", "user_id", "email_key"),
+        Index("ix_contacts_user_id_phone_key", "user_id", "phone_key"),
+        Index("ix_contacts_user_id_name_key", "user_id", "name_key"),
+        # Case-insensitive prefix search for typeahead suggestions.
+        Index("ix_contacts_user_id_prefix_name", user_id, prefix_key(name)),
+        Index("ix_contacts_user_id_prefix_surname", user_id, prefix_key(surname)),
+        Index("ix_contacts_user_id_prefix_email", user_id, prefix_key(email)),
+    )
+    # The database may hash-partition contacts by user_id (see
+    # src.database.partitioning); including it in the identity makes ORM
+    # UPDATE and DELETE statements prune to a single partition.
+    __mapper_args__ = {"primary_key": [user_id, id]}
+
+
+class Tag(Base):
+    """
+    ORM model representing a user's tag.
+
+    Attributes:
+        id (int): Primary key for the tag.
+        user_id (int): Owner of the tag.
+        name (str): Lowercase tag name, unique per user.
+        count (int): Number of the user's contacts with the tag.
+    """
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (Index("ux_tags_user_id_name", "user_id", "name", unique=True),)
+
+
+class ContactTag(Base):
+    """
+    ORM model linking a contact to a tag.
+
+    The primary key starts with the owner and the tag, so filtering contacts
+    by tags reads only this index. There is no foreign key to ``contacts``,
+    which may be hash-partitioned (see :mod:`src.database.partitioning`);
+    the contact repository removes the links of deleted contacts.
+
+    Attributes:
+        user_id (int): Owner of the contact and the tag.
+        tag_id (int): Tag.
+        contact_id (int): Tagged contact.
+        tag (Tag): Relationship to the Tag model.
+    """
+
+    __tablename__ = "contact_tags"
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag_id = Column(ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    contact_id = Column(Integer, primary_key=True)
+    tag = relationship("Tag", lazy="joined", innerjoin=True)
+
+    __table_args__ = (
+        Index("ix_contact_tags_user_id_contact_id", "user_id", "contact_id"),
+    )
+
+
+class ContactTombstone(Base):
+    """
+    ORM model recording a deleted contact for delta sync.
+
+    Attributes:
+        id (int): Primary key for the tombstone.
+        user_id (int): Owner of the deleted contact.
+        contact_id (int): ID of the deleted contact.
+        version (int): Owner's change sequence number of the delete.
+        deleted_at (datetime): Timestamp of the delete.
+    """
+
+    __tablename__ = "contact_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    contact_id = Column(Integer, nullable=False)
+    version = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_contact_tombstones_user_id_version", "user_id", "version"),
+        Index("ix_contact_tombstones_deleted_at", "deleted_at"),
+    )
+
+
+class ContactStats(Base):
+    """
+    ORM model counting a user's contacts by birthday month.
+
+    Kept up to date by the contact repository in the same transaction as
+    each write, so totals and month counts are read without scanning
+    contacts.
+
+    Attributes:
+        user_id (int): Owner of the contacts.
+        month (int): Birthday month, 1 to 12.
+        count (int): Number of the user's contacts born in that month.
+    """
+
+    __tablename__ = "contact_stats"
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    month = Column(SmallInteger, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
 
 
 class User(Base):
@@ -77,6 +269,13 @@ class User(Base):
         created_at (datetime): Timestamp of when the user was created.
         avatar (str, optional): URL of the user's avatar.
         is_verified (bool): Indicates whether the user's email is verified.
+        contacts_version (int): Change sequence number, incremented by every
+            write to the user's contacts.
+        contacts_pruned_version (int): Highest change sequence number of the
+            user's pruned contact tombstones.
+        timezone (str): IANA time zone used for the user's calendar day.
+        token_version (int): Incremented to revoke every access token issued
+            to the user so far.
     """
 
     __tablename__ = "users"
@@ -89,3 +288,49 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     is_verified = Column(Boolean, default=False)
     role = Column(SqlEnum(UserRole), default=UserRole.USER, nullable=False)
+    contacts_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    contacts_pruned_version = Column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    timezone = Column(String(64), nullable=False, default="UTC", server_default="UTC")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (Index("ix_users_timezone_id", "timezone", "id"),)
+
+
+class RefreshToken(Base):
+    """
+    ORM model storing an issued refresh token.
+
+    Only the SHA-256 hash of the token is stored. Tokens rotated from one
+    login share a family, so presenting an already used token revokes the
+    whole family.
+
+    Attributes:
+        id (int): Primary key for the refresh token.
+        user_id (int): Owner of the token.
+        family (str): ID shared by every token rotated from one login.
+        token_hash (str): Hex SHA-256 hash of the token.
+        created_at (datetime): Timestamp of issue.
+        expires_at (datetime): Timestamp after which the token is rejected.
+        used_at (datetime, optional): Timestamp the token was exchanged.
+        revoked_at (datetime, optional): Timestamp the family was revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family = Column(String(32), nullable=False)
+    token_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ux_refresh_tokens_token_hash", "token_hash", unique=True),
+        Index("ix_refresh_tokens_family", "family"),
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
@@ -0,0 +1,437 @@
+"""
+Online conversion of the ``contacts`` table to and from Postgres hash
+partitioning on ``user_id``.
+
+The conversion keeps the table writable:
+
+1. An empty ``contacts_new`` table is created with the same columns,
+   foreign keys and indexes, partitioned (or not) as requested.
+2. A trigger mirrors every insert, update and delete on ``contacts`` into
+   ``contacts_new``.
+3. Existing rows are copied in primary-key batches. Each batch briefly holds
+   a ``SHARE`` lock, so writers pause for one batch at most and no row can
+   change between being read and being copied.
+4. In one short transaction the trigger and the old table are dropped and
+   ``contacts_new`` takes over the name, indexes and id sequence.
+
+Used by the ``partition_contacts`` Alembic migration and, for databases that
+are already at head, from the command line::
+
+    poetry run python -m src.database.partitioning --partitions 16
+"""
+
+import argparse
+import logging
+import re
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from src.conf.config import settings
+from src.database.database import autocommit_transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = "contacts"
+NEW_TABLE = "contacts_new"
+PARTITION_KEY = "user_id"
+
+
+def partition_count(conn: Connection, table: str = TABLE) -> int:
+    """
+    Return the number of partitions of a table.
+
+    Args:
+        conn (Connection): Postgres connection.
+        table (str): Table name.
+
+    Returns:
+        int: Number of partitions, 0 for a regular table.
+    """
+    return conn.execute(
+        text("SELECT count(*) FROM pg_inherits WHERE inhparent = CAST(:t AS regclass)"),
+        {"t": table},
+    ).scalar()
+
+
+def partition_names(conn: Connection, table: str = TABLE) -> list[str]:
+    """
+    Return the partitions of a table.
+
+    Args:
+        conn (Connection): Postgres connection.
+        table (str): Table name.
+
+    Returns:
+        list[str]: Partition table names, empty for a regular table.
+    """
+    return list(
+        conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:t AS regclass) ORDER BY c.relname"
+            ),
+            {"t": table},
+        ).scalars()
+    )
+
+
+def _index_state(conn: Connection, name: str) -> tuple[bool, bool] | None:
+    """
+    Look up an index in the catalog.
+
+    Args:
+        conn (Connection): Postgres connection.
+        name (str): Index name.
+
+    Returns:
+        tuple[bool, bool] | None: Whether the index is valid and whether it
+        is attached to a parent index, or None if it does not exist.
+    """
+    row = conn.execute(
+        text(
+            "SELECT x.indisvalid, EXISTS ("
+            "SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid) "
+            "FROM pg_class c JOIN pg_index x ON x.indexrelid = c.oid "
+            "WHERE c.oid = to_regclass(:name)"
+        ),
+        {"name": name},
+    ).first()
+    return None if row is None else (row[0], row[1])
+
+
+def _create_index_concurrently(conn: Connection, sql: str, name: str):
+    """
+    Run a ``CREATE INDEX CONCURRENTLY`` unless a valid index already exists.
+
+    A failed concurrent build leaves an invalid index behind, which
+    ``IF NOT EXISTS`` would keep; such an index is dropped and rebuilt.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        sql (str): The ``CREATE INDEX CONCURRENTLY`` statement.
+        name (str): Name of the index it creates.
+    """
+    state = _index_state(conn, name)
+    if state is not None and not state[0] and not state[1]:
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        state = None
+    if state is None:
+        conn.exec_driver_sql(sql)
+
+
+def create_index_online(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: list[str],
+    unique: bool = False,
+):
+    """
+    Build an index without blocking writes, on partitioned tables too.
+
+    Postgres cannot build an index ``CONCURRENTLY`` on a partitioned table,
+    so the parent index is created ``ON ONLY`` the parent and every partition
+    index is built concurrently and attached. Every step checks the catalog
+    first, so a build that failed half-way can simply be run again. Must run
+    outside a transaction (``op.get_context().autocommit_block()`` in
+    migrations). Other databases get a plain ``CREATE INDEX``.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        name (str): Index name.
+        table (str): Table name.
+        columns (list[str]): Column names or SQL expressions.
+        unique (bool): Whether to create a unique index.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    columns_sql = ", ".join(columns)
+    if conn.dialect.name != "postgresql":
+        conn.exec_driver_sql(
+            f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns_sql})"
+        )
+        return
+
+    partitions = partition_names(conn, table)
+    if not partitions:
+        _create_index_concurrently(
+            conn, f"CREATE {kind} CONCURRENTLY {name} ON {table} ({columns_sql})", name
+        )
+        return
+
+    conn.exec_driver_sql(
+        f"CREATE {kind} IF NOT EXISTS {name} ON ONLY {table} ({columns_sql})"
+    )
+    for partition in partitions:
+        partition_index = f"{name}_{partition}"[:63]
+        _create_index_concurrently(
+            conn,
+            f"CREATE {kind} CONCURRENTLY {partition_index} "
+            f"ON {partition} ({columns_sql})",
+            partition_index,
+        )
+        if not _index_state(conn, partition_index)[1]:
+            conn.exec_driver_sql(
+                f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"
+            )
+
+
+def drop_index_online(conn: Connection, name: str):
+    """
+    Drop an index without blocking writes where the database allows it.
+
+    Indexes of partitioned tables cannot be dropped concurrently; dropping
+    the parent index drops the partition indexes with it. Dropping a missing
+    index is a no-op.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        name (str): Index name.
+    """
+    if conn.dialect.name != "postgresql":
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        return
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+    if relkind is None:
+        return
+    concurrently = "" if relkind == "I" else "CONCURRENTLY "
+    conn.exec_driver_sql(f"DROP INDEX {concurrently}IF EXISTS {name}")
+
+
+def _create_new_table(conn: Connection, partitions: int):
+    """
+    Create an empty copy of ``contacts`` with its keys and indexes.
+
+    Index and constraint names get a ``_new`` suffix until the swap.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        partitions (int): Number of hash partitions, 0 for a regular table.
+    """
+    partition_by = f" PARTITION BY HASH ({PARTITION_KEY})" if partitions else ""
+    conn.exec_driver_sql(
+        f"CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE){partition_by}"
+    )
+    for remainder in range(partitions):
+        conn.exec_driver_sql(
+            f"CREATE TABLE {TABLE}_h{partitions}_{remainder} PARTITION OF {NEW_TABLE} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+
+    # Unique keys of a partitioned table must include the partition key.
+    primary_key = f"{PARTITION_KEY}, id" if partitions else "id"
+    conn.exec_driver_sql(
+        f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {TABLE}_pkey_new "
+        f"PRIMARY KEY ({primary_key})"
+    )
+
+    foreign_keys = conn.execute(
+        text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:t AS regclass) AND contype = 'f'"
+        ),
+        {"t": TABLE},
+    ).all()
+    for name, definition in foreign_keys:
+        conn.exec_driver_sql(
+            f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {name}_new {definition}"
+        )
+
+    indexes = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_indexdef(c.oid) FROM pg_index x "
+            "JOIN pg_class c ON c.oid = x.indexrelid "
+            "WHERE x.indrelid = CAST(:t AS regclass) AND NOT x.indisprimary"
+        ),
+        {"t": TABLE},
+    ).all()
+    for name, definition in indexes:
+        definition = re.sub(
+            rf"INDEX {re.escape(name)} ON (ONLY )?(\S+\.)?{TABLE} ",
+            f"INDEX {name}_new ON {NEW_TABLE} ",
+            definition,
+            count=1,
+        )
+        conn.exec_driver_sql(definition)
+
+
+def _install_mirror_trigger(conn: Connection):
+    """
+    Mirror writes on ``contacts`` into ``contacts_new`` while copying.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+    """
+    conn.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION {TABLE}_mirror() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {NEW_TABLE}
+                WHERE {PARTITION_KEY} = OLD.{PARTITION_KEY} AND id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {NEW_TABLE} SELECT NEW.*;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TABLE}_mirror ON {TABLE}")
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER {TABLE}_mirror AFTER INSERT OR UPDATE OR DELETE "
+        f"ON {TABLE} FOR EACH ROW EXECUTE FUNCTION {TABLE}_mirror()"
+    )
+
+
+def _copy_rows(conn: Connection, batch_size: int):
+    """
+    Copy existing rows into ``contacts_new`` in id ranges.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+        batch_size (int): Width of each id range.
+    """
+    max_id = conn.exec_driver_sql(f"SELECT coalesce(max(id), 0) FROM {TABLE}").scalar()
+    copied = 0
+    for low in range(0, max_id, batch_size):
+        with autocommit_transaction(conn):
+            conn.exec_driver_sql(f"LOCK TABLE {TABLE} IN SHARE MODE")
+            result = conn.execute(
+                text(
+                    f"INSERT INTO {NEW_TABLE} SELECT * FROM {TABLE} "
+                    "WHERE id > :low AND id <= :high ON CONFLICT DO NOTHING"
+                ),
+                {"low": low, "high": low + batch_size},
+            )
+        copied += result.rowcount
+        logger.info("Copied %s contacts (id <= %s of %s)", copied, low + batch_size, max_id)
+
+
+def _swap_tables(conn: Connection):
+    """
+    Replace ``contacts`` with ``contacts_new`` and restore the original names.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+    """
+    with autocommit_transaction(conn):
+        conn.exec_driver_sql(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TABLE}_mirror ON {TABLE}")
+        sequence = conn.execute(
+            text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": TABLE}
+        ).scalar()
+        if sequence:
+            # Otherwise dropping the old table would drop the id sequence.
+            conn.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY {NEW_TABLE}.id")
+        conn.exec_driver_sql(f"DROP TABLE {TABLE}")
+        conn.exec_driver_sql(f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}")
+
+        names = conn.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = CAST(:t AS regclass) AND conname LIKE '%\\_new'"
+            ),
+            {"t": TABLE},
+        ).scalars()
+        for name in list(names):
+            conn.exec_driver_sql(
+                f"ALTER TABLE {TABLE} RENAME CONSTRAINT {name} TO {name[:-4]}"
+            )
+        names = conn.execute(
+            text(
+                "SELECT c.relname FROM pg_index x "
+                "JOIN pg_class c ON c.oid = x.indexrelid "
+                "WHERE x.indrelid = CAST(:t AS regclass) AND c.relname LIKE '%\\_new'"
+            ),
+            {"t": TABLE},
+        ).scalars()
+        for name in list(names):
+            conn.exec_driver_sql(f"ALTER INDEX {name} RENAME TO {name[:-4]}")
+    conn.exec_driver_sql(f"DROP FUNCTION IF EXISTS {TABLE}_mirror()")
+    conn.exec_driver_sql(f"ANALYZE {TABLE}")
+
+
+def _clean_up(conn: Connection):
+    """
+    Drop what an interrupted conversion left behind.
+
+    The trigger goes first, so writes on ``contacts`` never reach a missing
+    ``contacts_new``. Its partitions are dropped along with it.
+
+    Args:
+        conn (Connection): Connection in ``AUTOCOMMIT`` isolation.
+    """
+    conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TABLE}_mirror ON {TABLE}")
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {NEW_TABLE}")
+    conn.exec_driver_sql(f"DROP FUNCTION IF EXISTS {TABLE}_mirror()")
+
+
+def convert_contacts(conn: Connection, partitions: int, batch_size: int = 10000):
+    """
+    Convert ``contacts`` to ``partitions`` hash partitions on ``user_id``.
+
+    A conversion that failed part-way can be run again: the leftovers of
+    the failed run are dropped first and the copy starts over, while the
+    swap itself is a single transaction.
+
+    Args:
+        conn (Connection): Postgres connection in ``AUTOCOMMIT`` isolation.
+        partitions (int): Number of partitions; 0 converts back to a regular
+            table.
+        batch_size (int): Rows per copy batch.
+
+    Raises:
+        RuntimeError: If other tables reference ``contacts``; their foreign
+            keys would have to be recreated against the new table.
+    """
+    _clean_up(conn)
+    if partition_count(conn) == partitions:
+        logger.info("contacts already has %s partitions", partitions)
+        return
+    referencing = conn.execute(
+        text(
+            "SELECT conrelid::regclass::text FROM pg_constraint "
+            "WHERE confrelid = CAST(:t AS regclass) AND contype = 'f'"
+        ),
+        {"t": TABLE},
+    ).scalars().all()
+    if referencing:
+        raise RuntimeError(
+            f"Tables {', '.join(referencing)} reference contacts; "
+            "drop their foreign keys before converting"
+        )
+
+    _create_new_table(conn, partitions)
+    _install_mirror_trigger(conn)
+    _copy_rows(conn, batch_size)
+    _swap_tables(conn)
+    logger.info("contacts converted to %s partitions", partitions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=settings.DB_CONTACTS_PARTITIONS,
+        help="Number of hash partitions; 0 converts back to a regular table.",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.DB_PARTITION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(settings.database_url, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        convert_contacts(conn, args.partitions, args.batch_size)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,47 @@
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, timedelta
 from typing import List
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import extract
 
-from src.database.models import Contact, User
+from src.database.models import (
+    Contact,
+    ContactStats,
+    ContactTag,
+    ContactTombstone,
+    Tag,
+    User,
+    prefix_key,
+)
 from src.schemas.contacts import ContactModel
+from src.services.contact_events import contact_events
+from src.services.duplicates import blocking_keys
+
+
+# Columns ordering the contact list for each sort key, ending with a unique
+# column so pages are stable. Each tuple matches a ``(user_id, ...)`` index.
+SORT_COLUMNS = {
+    "id": ("id",),
+    "name": ("name", "id"),
+    "surname": ("surname", "name", "id"),
+    "email": ("email",),
+    "birthday": ("birthday", "id"),
+}
 
 
 class ContactRepository:
@@ -23,19 +58,25 @@ class ContactRepository:
         """
         self.db = db
 
-    async def is_contact_exists(self, email: str, phone: str) -> bool:
+    async def is_contact_exists(self, email: str, phone: str, user: User) -> bool:
         """
-        Check if a contact with the given email or phone exists.
+        Check if the user already has a contact with the given email or phone.
 
         Args:
             email (str): Contact's email.
             phone (str): Contact's phone number.
+            user (User): Authenticated user.
 
         Returns:
             bool: True if contact exists, False otherwise.
         """
         result = await self.db.execute(
-            select(Contact).filter(or_(Contact.email == email, Contact.phone == phone))
+            select(Contact.id)
+            .filter(
+                Contact.user_id == user.id,
+                or_(Contact.email == email, Contact.phone == phone),
+            )
+            .limit(1)
         )
         return result.scalar_one_or_none() is not None
 
@@ -49,15 +90,176 @@ class ContactRepository:
 
         Returns:
             Contact: The created contact instance.
+
+        Raises:
+            IntegrityError: If the user already has a contact with the same
+                email or phone.
         """
-        db_contact = Contact(**body.model_dump(), user_id=user.id)
+        db_contact = Contact(
+            **body.model_dump(exclude={"tags"}),
+            **self._keys(body),
+            user_id=user.id,
+            version=await self._next_version(user),
+        )
         self.db.add(db_contact)
-        await self.db.commit()
+        await self._count_birthday(user, db_contact.birthday.month, 1)
+        if body.tags:
+            await self.db.flush()
+            await self._set_tags(db_contact.id, [], body.tags, user)
+        await self._commit()
         await self.db.refresh(db_contact)
+        await contact_events.publish(
+            user.id, "created", db_contact.id, db_contact.version
+        )
         return db_contact
 
+    @staticmethod
+    def _keys(body: ContactModel) -> dict:
+        """
+        Derive the duplicate-detection blocking keys of contact data.
+
+        Args:
+            body (ContactModel): Contact data.
+
+        Returns:
+            dict: Values of ``email_key``, ``phone_key`` and ``name_key``.
+        """
+        return blocking_keys(body.name, body.surname, body.email, body.phone)
+
+    async def _next_version(self, user: User) -> int:
+        """
+        Increment the user's change sequence and return the new value.
+
+        The increment locks the user's row until the transaction ends, so
+        versions become visible in the order they were assigned.
+
+        Args:
+            user (User): Owner of the changed contacts.
+
+        Returns:
+            int: Version for the write in progress.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(contacts_version=User.contacts_version + 1)
+            .returning(User.contacts_version)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one()
+
+    def _insert(self, model):
+        """
+        Start an INSERT supporting ``ON CONFLICT`` for the session's database.
+
+        Args:
+            model: Mapped class to insert into.
+
+        Returns:
+            Insert: Postgres or SQLite INSERT statement.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+    async def _set_tags(
+        self, contact_id: int, current: List[Tag], names: List[str], user: User
+    ):
+        """
+        Replace a contact's tags, keeping the user's tag counts in step.
+
+        Runs after :meth:`_next_version` in the same transaction, so the
+        user's row lock serializes tag count updates.
+
+        Args:
+            contact_id (int): Tagged contact.
+            current (List[Tag]): Tags the contact has now.
+            names (List[str]): Normalized names of the tags it should have.
+            user (User): Owner of the contact.
+        """
+        removed = [tag.id for tag in current if tag.name not in names]
+        added = sorted(set(names) - {tag.name for tag in current})
+        if removed:
+            await self.db.execute(
+                delete(ContactTag).where(
+                    ContactTag.user_id == user.id,
+                    ContactTag.contact_id == contact_id,
+                    ContactTag.tag_id.in_(removed),
+                )
+            )
+            await self.db.execute(
+                update(Tag)
+                .where(Tag.user_id == user.id, Tag.id.in_(removed))
+                .values(count=Tag.count - 1)
+                .execution_options(synchronize_session=False)
+            )
+        if added:
+            await self.db.execute(
+                self._insert(Tag)
+                .values([{"user_id": user.id, "name": name} for name in added])
+                .on_conflict_do_nothing(index_elements=[Tag.user_id, Tag.name])
+            )
+            result = await self.db.execute(
+                update(Tag)
+                .where(Tag.user_id == user.id, Tag.name.in_(added))
+                .values(count=Tag.count + 1)
+                .returning(Tag.id)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                insert(ContactTag),
+                [
+                    {"user_id": user.id, "tag_id": tag_id, "contact_id": contact_id}
+                    for tag_id in result.scalars().all()
+                ],
+            )
+
+    async def _count_birthday(self, user: User, month: int, delta: int):
+        """
+        Adjust the user's contact counter for a birthday month.
+
+        Runs after :meth:`_next_version` in the same transaction, so the
+        user's row lock serializes counter updates.
+
+        Args:
+            user (User): Owner of the contact.
+            month (int): Birthday month of the contact.
+            delta (int): ``1`` for an added contact, ``-1`` for a removed one.
+        """
+        statement = self._insert(ContactStats).values(
+            user_id=user.id, month=month, count=delta
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ContactStats.user_id, ContactStats.month],
+                set_={"count": ContactStats.count + statement.excluded.count},
+            )
+        )
+
+    async def _commit(self):
+        """
+        Commit the session, rolling it back if a constraint is violated.
+
+        Raises:
+            IntegrityError: If a unique constraint is violated.
+        """
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        tags: List[str] | None = None,
+        tag_mode: str = "any",
+        sort: str = "id",
     ) -> List[Contact]:
         """
         Retrieve contacts for the authenticated user with optional filters.
@@ -69,19 +271,255 @@ class ContactRepository:
             skip (int): Number of records to skip.
             limit (int): Maximum number of records to return.
             user (User): Authenticated user.
+            tags (List[str], optional): Filter by normalized tag names.
+            tag_mode (str): ``any`` to match contacts with any of the tags,
+                ``all`` for contacts with every tag.
+            sort (str): Key of ``SORT_COLUMNS``, prefixed with ``-`` for
+                descending order.
 
         Returns:
             List[Contact]: List of contacts matching the filters.
         """
-        query = select(Contact).filter_by(user=user)
+        query = self._filtered(name, surname, email, user, tags, tag_mode)
+        query = self._sorted(query, sort).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_contact_fields(
+        self,
+        fields: tuple[str, ...],
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        tags: List[str] | None = None,
+        tag_mode: str = "any",
+        sort: str = "id",
+    ) -> List[dict]:
+        """
+        Retrieve only some columns of the user's contacts.
+
+        Unlike :meth:`get_contacts`, no ORM objects are built and tags are
+        only loaded when requested.
+
+        Args:
+            fields (tuple[str, ...]): Contact fields to load, including ``id``.
+            name (str): Filter by name (optional).
+            surname (str): Filter by surname (optional).
+            email (str): Filter by email (optional).
+            skip (int): Number of records to skip.
+            limit (int): Maximum number of records to return.
+            user (User): Authenticated user.
+            tags (List[str], optional): Filter by normalized tag names.
+            tag_mode (str): ``any`` or ``all``.
+            sort (str): Key of ``SORT_COLUMNS``, optionally prefixed with ``-``.
+
+        Returns:
+            List[dict]: One mapping of field values per contact.
+        """
+        query = self._filtered(name, surname, email, user, tags, tag_mode)
+        query = query.with_only_columns(
+            *(getattr(Contact, field) for field in fields if field != "tags")
+        )
+        query = self._sorted(query, sort).offset(skip).limit(limit)
+        rows = [dict(row._mapping) for row in await self.db.execute(query)]
+        if "tags" in fields:
+            names = {row["id"]: [] for row in rows}
+            if names:
+                result = await self.db.execute(
+                    select(ContactTag.contact_id, Tag.name)
+                    .join(Tag, Tag.id == ContactTag.tag_id)
+                    .filter(
+                        ContactTag.user_id == user.id,
+                        ContactTag.contact_id.in_(names),
+                    )
+                    .order_by(Tag.name)
+                )
+                for contact_id, tag in result:
+                    names[contact_id].append(tag)
+            for row in rows:
+                row["tags"] = names[row["id"]]
+        return rows
+
+    @staticmethod
+    def _sorted(query, sort: str):
+        """
+        Order a contacts query by a sort key.
+
+        Args:
+            query (Select): Query over contacts.
+            sort (str): Key of ``SORT_COLUMNS``, optionally prefixed with ``-``
+                for descending order.
+
+        Returns:
+            Select: The ordered query.
+        """
+        columns = [
+            getattr(Contact, column) for column in SORT_COLUMNS[sort.lstrip("-")]
+        ]
+        if sort.startswith("-"):
+            columns = [column.desc() for column in columns]
+        return query.order_by(*columns)
+
+    @staticmethod
+    def _filtered(
+        name: str,
+        surname: str,
+        email: str,
+        user: User,
+        tags: List[str] | None = None,
+        tag_mode: str = "any",
+    ):
+        """
+        Build the query for the user's contacts matching optional filters.
+
+        The tag filter is a subquery reading only the ``contact_tags``
+        primary key and the ``(user_id, name)`` index of ``tags``.
+
+        Args:
+            name (str): Filter by name (optional).
+            surname (str): Filter by surname (optional).
+            email (str): Filter by email (optional).
+            user (User): Authenticated user.
+            tags (List[str], optional): Filter by normalized tag names.
+            tag_mode (str): ``any`` or ``all``.
+
+        Returns:
+            Select: Query selecting the matching contacts.
+        """
+        query = select(Contact).filter(Contact.user_id == user.id)
         if name:
             query = query.filter(Contact.name.contains(name))
         if surname:
             query = query.filter(Contact.surname.contains(surname))
         if email:
             query = query.filter(Contact.email.contains(email))
+        if tags:
+            tagged = (
+                select(ContactTag.contact_id)
+                .join(Tag, Tag.id == ContactTag.tag_id)
+                .filter(
+                    ContactTag.user_id == user.id,
+                    Tag.user_id == user.id,
+                    Tag.name.in_(tags),
+                )
+            )
+            if tag_mode == "all":
+                tagged = tagged.group_by(ContactTag.contact_id).having(
+                    func.count() == len(set(tags))
+                )
+            query = query.filter(Contact.id.in_(tagged))
+        return query
+
+    async def count_contacts(
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        user: User,
+        tags: List[str] | None = None,
+        tag_mode: str = "any",
+    ) -> int:
+        """
+        Count the user's contacts matching filters.
+
+        This scans the user's contacts; unfiltered totals come from
+        :meth:`get_stats` instead.
+
+        Args:
+            name (str): Filter by name (optional).
+            surname (str): Filter by surname (optional).
+            email (str): Filter by email (optional).
+            user (User): Authenticated user.
+            tags (List[str], optional): Filter by normalized tag names.
+            tag_mode (str): ``any`` or ``all``.
 
-        result = await self.db.execute(query.offset(skip).limit(limit))
+        Returns:
+            int: Number of matching contacts.
+        """
+        query = self._filtered(name, surname, email, user, tags, tag_mode)
+        result = await self.db.execute(query.with_only_columns(func.count(Contact.id)))
+        return result.scalar_one()
+
+    async def get_tags(self, user: User) -> List[Tag]:
+        """
+        Retrieve the user's tags in use, most used first.
+
+        Args:
+            user (User): Authenticated user.
+
+        Returns:
+            List[Tag]: Tags with their contact counts.
+        """
+        result = await self.db.execute(
+            select(Tag)
+            .filter(Tag.user_id == user.id, Tag.count > 0)
+            .order_by(Tag.count.desc(), Tag.name)
+        )
+        return result.scalars().all()
+
+    async def get_stats(self, user: User) -> dict[int, int]:
+        """
+        Read the user's contact counters by birthday month.
+
+        Args:
+            user (User): Authenticated user.
+
+        Returns:
+            dict[int, int]: Contact count per month, for months with contacts.
+        """
+        result = await self.db.execute(
+            select(ContactStats.month, ContactStats.count).filter(
+                ContactStats.user_id == user.id, ContactStats.count > 0
+            )
+        )
+        return {month: count for month, count in result.all()}
+
+    async def get_contacts_version(self, user: User) -> int:
+        """
+        Read the user's current change sequence number.
+
+        Args:
+            user (User): Authenticated user.
+
+        Returns:
+            int: Version of the user's latest contact write.
+        """
+        result = await self.db.execute(
+            select(User.contacts_version).filter(User.id == user.id)
+        )
+        return result.scalar_one()
+
+    async def get_all_contacts(self, user: User) -> List[Contact]:
+        """
+        Retrieve every contact of the authenticated user.
+
+        Args:
+            user (User): Authenticated user.
+
+        Returns:
+            List[Contact]: All of the user's contacts.
+        """
+        result = await self.db.execute(
+            select(Contact).filter(Contact.user_id == user.id)
+        )
+        return result.scalars().all()
+
+    async def get_contacts_for_users(self, user_ids: List[int]) -> List[Contact]:
+        """
+        Retrieve every contact of several users at once, for batch jobs.
+
+        Args:
+            user_ids (List[int]): IDs of the owners.
+
+        Returns:
+            List[Contact]: Contacts of all given users.
+        """
+        result = await self.db.execute(
+            select(Contact).filter(Contact.user_id.in_(user_ids))
+        )
         return result.scalars().all()
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact:
@@ -100,6 +538,118 @@ class ContactRepository:
         )
         return result.scalar_one_or_none()
 
+    async def suggest_contacts(self, prefix: str, limit: int, user: User) -> list:
+        """
+        Find contacts whose name, surname or email starts with a prefix.
+
+        Each column is matched through its own ``prefix_key(column)`` index,
+        which also returns the matches in order, and capped at its first
+        ``limit`` rows by that column before the results are merged, so the
+        cost does not grow with the number of contacts and the suggestions
+        stay stable between keystrokes.
+
+        Args:
+            prefix (str): Case-insensitive prefix.
+            limit (int): Maximum number of contacts to return.
+            user (User): Authenticated user.
+
+        Returns:
+            list: Rows with ``id``, ``name``, ``surname`` and ``email``,
+            ordered case-insensitively by name and surname.
+        """
+        pattern = re.sub(r"([\\%_])", r"\\\1", prefix.lower()) + "%"
+        branches = []
+        for column in (Contact.name, Contact.surname, Contact.email):
+            branch = (
+                select(Contact.id, Contact.name, Contact.surname, Contact.email)
+                .filter(
+                    Contact.user_id == user.id,
+                    prefix_key(column).like(pattern, escape="\\"),
+                )
+                .order_by(prefix_key(column), Contact.id)
+                .limit(limit)
+                .subquery()
+            )
+            branches.append(select(branch))
+        matches = union(*branches).subquery()
+        result = await self.db.execute(
+            select(matches)
+            .order_by(
+                func.lower(matches.c.name), func.lower(matches.c.surname), matches.c.id
+            )
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_duplicate_keys(
+        self, key: str, after: str | None, limit: int, user: User
+    ) -> list:
+        """
+        Retrieve blocking key values shared by several of the user's contacts.
+
+        Reads only the ``(user_id, key)`` index. Pages with ``after``.
+
+        Args:
+            key (str): ``email_key``, ``phone_key`` or ``name_key``.
+            after (str, optional): Last value of the previous page.
+            limit (int): Maximum number of values.
+            user (User): Authenticated user.
+
+        Returns:
+            list: Rows with ``value`` and ``count``, ordered by value.
+        """
+        column = getattr(Contact, key)
+        query = select(column.label("value"), func.count().label("count")).filter(
+            Contact.user_id == user.id, column.is_not(None)
+        )
+        if after is not None:
+            query = query.filter(column > after)
+        result = await self.db.execute(
+            query.group_by(column)
+            .having(func.count() > 1)
+            .order_by(column)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_contacts_by_keys(
+        self, key: str, values: List[str], user: User
+    ) -> List[Contact]:
+        """
+        Retrieve the user's contacts having any of the blocking key values.
+
+        Args:
+            key (str): ``email_key``, ``phone_key`` or ``name_key``.
+            values (List[str]): Key values.
+            user (User): Authenticated user.
+
+        Returns:
+            List[Contact]: Matching contacts.
+        """
+        column = getattr(Contact, key)
+        result = await self.db.execute(
+            select(Contact).filter(Contact.user_id == user.id, column.in_(values))
+        )
+        return result.scalars().all()
+
+    async def get_contact_by_phone(self, phone: str, user: User) -> Contact:
+        """
+        Retrieve the user's contact with an exact phone number.
+
+        A single probe of the ``(user_id, phone)`` unique index.
+
+        Args:
+            phone (str): Phone number in E.164 format.
+            user (User): Authenticated user.
+
+        Returns:
+            Contact: The contact instance if found, otherwise None.
+        """
+        result = await self.db.execute(
+            select(Contact).filter(Contact.user_id == user.id, Contact.phone == phone)
+        )
+        return result.scalar_one_or_none()
+
     async def update_contact(
         self, contact_id: int, body: ContactModel, user: User
     ) -> Contact:
@@ -113,19 +663,35 @@ class ContactRepository:
 
         Returns:
             Contact: The updated contact instance.
+
+        Raises:
+            IntegrityError: If the user already has another contact with the
+                same email or phone.
         """
 
         db_contact = await self.get_contact_by_id(contact_id, user)
         if db_contact:
-            for key, value in body.model_dump().items():
+            old_month = db_contact.birthday.month
+            fields = {**body.model_dump(exclude={"tags"}), **self._keys(body)}
+            for key, value in fields.items():
                 setattr(db_contact, key, value)
-            await self.db.commit()
+            db_contact.version = await self._next_version(user)
+            if db_contact.birthday.month != old_month:
+                await self._count_birthday(user, old_month, -1)
+                await self._count_birthday(user, db_contact.birthday.month, 1)
+            if body.tags is not None:
+                await self._set_tags(db_contact.id, db_contact.tags, body.tags, user)
+            await self._commit()
             await self.db.refresh(db_contact)
+            await contact_events.publish(
+                user.id, "updated", db_contact.id, db_contact.version
+            )
         return db_contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact:
         """
-        Delete a contact for the authenticated user.
+        Delete a contact for the authenticated user, leaving a tombstone
+        for delta sync.
 
         Args:
             contact_id (int): Contact ID.
@@ -136,22 +702,121 @@ class ContactRepository:
         """
         db_contact = await self.get_contact_by_id(contact_id, user)
         if db_contact:
+            version = await self._next_version(user)
+            self.db.add(
+                ContactTombstone(
+                    user_id=user.id, contact_id=db_contact.id, version=version
+                )
+            )
+            await self._count_birthday(user, db_contact.birthday.month, -1)
+            await self._set_tags(db_contact.id, db_contact.tags, [], user)
             await self.db.delete(db_contact)
             await self.db.commit()
+            await contact_events.publish(user.id, "deleted", db_contact.id, version)
         return db_contact
 
-    async def get_upcoming_birthdays(self, days: int, user: User) -> List[Contact]:
+    async def get_changes(self, since: int | None, limit: int, user: User) -> list:
+        """
+        Retrieve contacts changed and deleted after a change sequence number.
+
+        Args:
+            since (int, optional): Version from the previous sync; ``None``
+                lists every existing contact.
+            limit (int): Maximum number of changes to return.
+            user (User): Authenticated user.
+
+        Returns:
+            list: Rows with ``contact_id``, ``version`` and ``deleted``,
+            ordered by version.
+        """
+        upserted = select(
+            Contact.id.label("contact_id"),
+            Contact.version,
+            literal(False).label("deleted"),
+        ).filter(Contact.user_id == user.id)
+        if since is None:
+            query = upserted
+        else:
+            deleted = select(
+                ContactTombstone.contact_id,
+                ContactTombstone.version,
+                literal(True).label("deleted"),
+            ).filter(
+                ContactTombstone.user_id == user.id,
+                ContactTombstone.version > since,
+            )
+            query = union_all(upserted.filter(Contact.version > since), deleted)
+        query = query.order_by("version", "contact_id").limit(limit)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_pruned_version(self, user: User) -> int:
+        """
+        Read the highest change sequence number of the user's pruned
+        tombstones.
+
+        Sync tokens below it may have missed deletes.
+
+        Args:
+            user (User): Authenticated user.
+
+        Returns:
+            int: The version, 0 if nothing was pruned.
+        """
+        result = await self.db.execute(
+            select(User.contacts_pruned_version).filter(User.id == user.id)
+        )
+        return result.scalar_one()
+
+    async def prune_tombstones(self, before: datetime) -> int:
+        """
+        Delete tombstones of contacts deleted before a cutoff.
+
+        Every affected user's ``contacts_pruned_version`` is raised to the
+        highest pruned version in the same transaction, so older sync tokens
+        are answered with a full resync.
+
+        Args:
+            before (datetime): Tombstones deleted earlier are pruned.
+
+        Returns:
+            int: Number of tombstones deleted.
+        """
+        expired = ContactTombstone.deleted_at < before
+        await self.db.execute(
+            update(User)
+            .where(
+                select(ContactTombstone.id)
+                .filter(ContactTombstone.user_id == User.id, expired)
+                .exists()
+            )
+            .values(
+                contacts_pruned_version=select(func.max(ContactTombstone.version))
+                .filter(ContactTombstone.user_id == User.id, expired)
+                .scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(delete(ContactTombstone).where(expired))
+        await self.db.commit()
+        return result.rowcount
+
+    async def get_upcoming_birthdays(
+        self, days: int, user: User, today: date | None = None
+    ) -> List[Contact]:
         """
         Get a list of contacts whose birthdays are within the next `days` days.
 
         Args:
             days (int): Number of upcoming days to check.
             user (User): Authenticated user.
+            today (date | None): The user's local date; defaults to the
+                server's date.
 
         Returns:
             List[Contact]: List of contacts with upcoming birthdays.
         """
-        today = datetime.today().date()
+        today = today or datetime.today().date()
         end_date = today + timedelta(days=days)
         today_day = today.day
         today_month = today.month
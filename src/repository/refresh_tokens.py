@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import RefreshToken
+
+
+class RefreshTokenRepository:
+    """
+    Repository for handling database operations related to refresh tokens.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the RefreshTokenRepository with a database session.
+
+        Args:
+            session (AsyncSession): Asynchronous database session.
+        """
+        self.db = session
+
+    async def get_by_hash(self, token_hash: str) -> RefreshToken | None:
+        """
+        Retrieve a refresh token by its hash.
+
+        Args:
+            token_hash (str): Hex SHA-256 hash of the token.
+
+        Returns:
+            RefreshToken | None: The token if found, otherwise None.
+        """
+        result = await self.db.execute(
+            select(RefreshToken).filter_by(token_hash=token_hash)
+        )
+        return result.scalar_one_or_none()
+
+    async def add(
+        self, user_id: int, family: str, token_hash: str, expires_at: datetime
+    ) -> RefreshToken:
+        """
+        Store a newly issued refresh token.
+
+        The token is committed together with any pending change of the
+        session, such as marking its predecessor as used.
+
+        Args:
+            user_id (int): Owner of the token.
+            family (str): Family of the token.
+            token_hash (str): Hex SHA-256 hash of the token.
+            expires_at (datetime): Expiry timestamp.
+
+        Returns:
+            RefreshToken: The stored token.
+        """
+        token = RefreshToken(
+            user_id=user_id,
+            family=family,
+            token_hash=token_hash,
+            expires_at=expires_at,
+        )
+        self.db.add(token)
+        await self.db.commit()
+        return token
+
+    async def mark_used(self, token_id: int, now: datetime) -> bool:
+        """
+        Mark a token as used unless it already was, without committing.
+
+        The check and the update are one statement, so of two concurrent
+        refreshes with the same token only one succeeds.
+
+        Args:
+            token_id (int): ID of the token.
+            now (datetime): Current timestamp.
+
+        Returns:
+            bool: True if this call used the token.
+        """
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(used_at=now)
+        )
+        return result.rowcount == 1
+
+    async def revoke_family(self, family: str, now: datetime) -> None:
+        """
+        Revoke every token of a family.
+
+        Args:
+            family (str): Family to revoke.
+            now (datetime): Current timestamp.
+        """
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family == family, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        await self.db.commit()
+
+    async def revoke_user(self, user_id: int, now: datetime) -> None:
+        """
+        Revoke every refresh token of a user.
+
+        Args:
+            user_id (int): Owner of the tokens.
+            now (datetime): Current timestamp.
+        """
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        await self.db.commit()
+
+    async def prune_expired(self, before: datetime) -> int:
+        """
+        Delete tokens that expired before a cutoff.
+
+        Such tokens are rejected as expired anyway; once deleted they are
+        rejected as unknown.
+
+        Args:
+            before (datetime): Tokens expired earlier are deleted.
+
+        Returns:
+            int: Number of tokens deleted.
+        """
+        result = await self.db.execute(
+            delete(RefreshToken).where(RefreshToken.expires_at < before)
+        )
+        await self.db.commit()
+        return result.rowcount
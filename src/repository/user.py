@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
@@ -127,3 +127,78 @@ class UserRepository:
             await self.db.commit()
             await self.db.refresh(user)
         return user
+
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """
+        Replace a password hash unless the password changed meanwhile.
+
+        Args:
+            user_id (int): The ID of the user.
+            old_hash (str): Hash the new one was derived from.
+            new_hash (str): Hash of the same password with current settings.
+
+        Returns:
+            bool: True if the hash was replaced.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def increment_token_version(self, user_id: int) -> int | None:
+        """
+        Increment a user's token version.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            int | None: The new token version, or None if the user does not
+            exist.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version)
+        )
+        version = result.scalar_one_or_none()
+        await self.db.commit()
+        return version
+
+    async def get_timezones(self) -> list[str]:
+        """
+        Retrieve the distinct time zones of all users.
+
+        Returns:
+            list[str]: Time zone names.
+        """
+        result = await self.db.execute(select(User.timezone).distinct())
+        return list(result.scalars().all())
+
+    async def get_users_by_timezone(
+        self, timezone: str, after_id: int, limit: int
+    ) -> list[User]:
+        """
+        Retrieve a chunk of users in a time zone, ordered by ID.
+
+        Args:
+            timezone (str): Time zone name.
+            after_id (int): Only users with a greater ID are returned.
+            limit (int): Maximum number of users.
+
+        Returns:
+            list[User]: Users of the chunk.
+        """
+        result = await self.db.execute(
+            select(User)
+            .filter(User.timezone == timezone, User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
@@ -1,8 +1,54 @@
 import re
 from datetime import date, datetime
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    RootModel,
+    create_model,
+    validator,
+)
+
+PHONE_SEPARATORS = re.compile(r"[\s().\-]")
+E164 = re.compile(r"^\+[1-9]\d{1,14}$")
+MAX_TAGS = 20
+MAX_TAG_LENGTH = 50
+# Columns the contact list can be sorted by, each backed by an index.
+SORT_FIELDS = ("id", "name", "surname", "email", "birthday")
+
+
+def normalize_phone(value: str) -> str:
+    """
+    Convert an international phone number to canonical E.164.
+
+    Spaces, dots, dashes and parentheses are removed, and an ``00``
+    international prefix or a missing ``+`` is replaced by ``+``, so
+    ``380501234567``, ``00380 50 123 45 67`` and ``+380 (50) 123-45-67``
+    all become ``+380501234567``.
+
+    Args:
+        value (str): Phone number as entered.
+
+    Returns:
+        str: Phone number in E.164 format.
+
+    Raises:
+        ValueError: If the number is not in international format.
+    """
+    phone = PHONE_SEPARATORS.sub("", value)
+    if phone.startswith("00"):
+        phone = phone[2:]
+    if not phone.startswith("+"):
+        phone = "+" + phone
+    if not E164.match(phone):
+        raise ValueError(
+            "Phone number must be in international format (e.g., +380501234567)"
+        )
+    return phone
 
 
 class ContactModel(BaseModel):
@@ -18,28 +64,58 @@ class ContactModel(BaseModel):
     phone: str = Field(min_length=7, max_length=20, example="+380501234567")
     birthday: date = Field(example="1990-01-01")
     info: Optional[str] = Field(None, max_length=500, example="Additional info")
+    tags: Optional[List[str]] = Field(
+        None, max_length=MAX_TAGS, example=["work", "family"]
+    )
 
     @validator("phone")
     def validate_phone(cls, value):
         """
-        Validate phone number format to ensure it follows
-        international standards.
+        Validate the phone number and store it in canonical E.164 format,
+        so equal numbers compare equal in the unique index and in lookups.
 
         Args:
             value (str): The phone number input.
 
         Returns:
-            str: The validated phone number.
+            str: The phone number in E.164 format.
 
         Raises:
             ValueError: If the phone number is not in a valid format.
         """
-        phone_regex = r"^\+?[1-9]\d{1,14}$"
-        if not re.match(phone_regex, value):
-            raise ValueError(
-                "Phone number must be in international format " "(e.g., +380501234567)"
-            )
-        return value
+        return normalize_phone(value)
+
+    @validator("tags", pre=True)
+    def validate_tags(cls, value):
+        """
+        Normalize tags to unique, lowercase, trimmed names.
+
+        Tag objects (when validating a contact loaded from the database)
+        are replaced by their names.
+
+        Args:
+            value (list): Tag names or tag objects.
+
+        Returns:
+            list[str]: Sorted tag names, or None if no tags were given.
+
+        Raises:
+            ValueError: If a tag is empty or longer than 50 characters.
+        """
+        if value is None:
+            return None
+        names = set()
+        for tag in value:
+            name = getattr(tag, "name", tag)
+            if not isinstance(name, str):
+                raise ValueError("Tags must be strings")
+            name = name.strip().lower()
+            if not 0 < len(name) <= MAX_TAG_LENGTH:
+                raise ValueError(
+                    f"Tags must be between 1 and {MAX_TAG_LENGTH} characters long"
+                )
+            names.add(name)
+        return sorted(names)
 
     @validator("birthday")
     def validate_birthday(cls, value):
@@ -66,6 +142,144 @@ class ContactResponse(ContactModel):
     """
 
     id: int
+    tags: List[str] = []
     created_at: datetime
     updated_at: Optional[datetime]
     model_config = ConfigDict(from_attributes=True)
+
+
+def parse_fields(value: str) -> tuple[str, ...]:
+    """
+    Parse a comma-separated sparse fieldset of :class:`ContactResponse`.
+
+    Args:
+        value (str): Requested field names, e.g. ``"name,email"``.
+
+    Returns:
+        tuple[str, ...]: The fields in schema order; ``id`` is always
+        included.
+
+    Raises:
+        ValueError: If a field is not part of the contact response.
+    """
+    requested = {field.strip() for field in value.split(",")} - {""}
+    unknown = requested - set(ContactResponse.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(
+        field
+        for field in ContactResponse.model_fields
+        if field in requested or field == "id"
+    )
+
+
+@lru_cache(maxsize=128)
+def contact_fields_model(fields: tuple[str, ...]) -> type[RootModel]:
+    """
+    Build the schema of a contact list limited to a sparse fieldset.
+
+    The field types are those of :class:`ContactResponse`, without its
+    input validators, since the values come from the database.
+
+    Args:
+        fields (tuple[str, ...]): Output of :func:`parse_fields`.
+
+    Returns:
+        type[RootModel]: Schema of a list of partial contacts.
+    """
+    model = create_model(
+        "ContactFields",
+        **{
+            field: (ContactResponse.model_fields[field].annotation, ...)
+            for field in fields
+        },
+    )
+    return RootModel[List[model]]
+
+
+class TagResponse(BaseModel):
+    """
+    Schema for a tag with the number of contacts carrying it.
+    """
+
+    name: str
+    count: int
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ContactSuggestion(BaseModel):
+    """
+    Schema for a compact contact entry returned by typeahead suggestions.
+    """
+
+    id: int
+    display: str = Field(example="John Doe <john.doe@example.com>")
+
+
+class ContactChanges(BaseModel):
+    """
+    Schema for a page of contact changes returned by delta sync.
+    """
+
+    upserted: list[int] = Field(
+        description="IDs of contacts created or updated since the token."
+    )
+    deleted: list[int] = Field(description="IDs of contacts deleted since the token.")
+    token: int = Field(description="Pass as `since` in the next sync request.")
+    has_more: bool = Field(
+        description="More changes are pending; sync again with the new token."
+    )
+    reset: bool = Field(
+        False,
+        description=(
+            "The token is older than the tombstone retention window; this is "
+            "the first page of a full sync and local contacts missing from it "
+            "were deleted."
+        ),
+    )
+
+
+class ContactStats(BaseModel):
+    """
+    Schema for a user's contact statistics.
+    """
+
+    total: int = Field(description="Number of contacts.")
+    birthdays_by_month: dict[int, int] = Field(
+        description="Number of contacts born in each month, 1 to 12."
+    )
+
+
+class MergePlan(BaseModel):
+    """
+    Schema for a suggested merge of a duplicate group.
+    """
+
+    keep_id: int = Field(description="Contact to keep.")
+    remove_ids: list[int] = Field(description="Contacts to delete after merging.")
+    updates: dict[str, str] = Field(
+        description="Fields to set on the kept contact, taken from the others."
+    )
+
+
+class DuplicateGroup(BaseModel):
+    """
+    Schema for a group of contacts that likely describe the same person.
+    """
+
+    contact_ids: list[int]
+    score: float = Field(
+        description="Lowest score among the pairs linking the group, 0 to 1."
+    )
+    merge_plan: Optional[MergePlan] = None
+
+
+class DuplicateReport(BaseModel):
+    """
+    Schema for the duplicate groups of a user's contacts.
+    """
+
+    groups: list[DuplicateGroup]
+    skipped_blocks: int = Field(
+        description="Blocks too large to compare, such as very common names."
+    )
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional
+from zoneinfo import available_timezones
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, validator
 
 
 class User(BaseModel):
@@ -9,7 +12,7 @@ class User(BaseModel):
     id: int
     username: str
     email: str
-    avatar: str
+    avatar: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -22,6 +25,25 @@ class UserCreate(BaseModel):
     username: str
     email: str
     password: str
+    timezone: str = Field("UTC", max_length=64, example="Europe/Kyiv")
+
+    @validator("timezone")
+    def validate_timezone(cls, value):
+        """
+        Ensure the time zone is a known IANA name.
+
+        Args:
+            value (str): Time zone name.
+
+        Returns:
+            str: The validated time zone.
+
+        Raises:
+            ValueError: If the time zone is unknown.
+        """
+        if value not in available_timezones():
+            raise ValueError("Unknown time zone")
+        return value
 
 
 class UserLogin(BaseModel):
@@ -39,7 +61,17 @@ class Token(BaseModel):
     """
 
     access_token: str
+    refresh_token: str
     token_type: str
+    expires_in: int
+
+
+class RefreshRequest(BaseModel):
+    """
+    Schema for exchanging a refresh token.
+    """
+
+    refresh_token: str = Field(..., max_length=128)
 
 
 class RequestEmail(BaseModel):
@@ -58,7 +90,25 @@ class UserCacheModel(BaseModel):
     id: int
     username: str
     email: str
+    avatar: Optional[str] = None
     is_verified: bool
     role: str
+    timezone: str = "UTC"
+    token_version: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class Principal(BaseModel):
+    """
+    Identity of the caller, built from the claims of a verified access token
+    without a database or cache lookup.
+    """
+
+    id: int
+    username: str
+    role: str
+    timezone: str = "UTC"
+    token_version: int = 0
+    jti: Optional[str] = None
+    expires_at: Optional[int] = None
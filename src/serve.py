@@ -0,0 +1,252 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+from importlib.util import find_spec
+
+from src.conf.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+
+def detect_loop() -> str:
+    """
+    Pick the fastest available event loop implementation.
+
+    Returns:
+        str: ``"uvloop"`` if it is installed, otherwise ``"asyncio"``.
+    """
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def detect_http() -> str:
+    """
+    Pick the fastest available HTTP/1.1 parser.
+
+    Returns:
+        str: ``"httptools"`` if it is installed, otherwise ``"h11"``.
+    """
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+def default_workers() -> int:
+    """
+    Number of worker processes to run when none is configured.
+
+    Returns:
+        int: The CPU count of the current machine.
+    """
+    return multiprocessing.cpu_count()
+
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    BaseApplication = None
+    UvicornWorker = None
+
+
+if UvicornWorker is not None:
+
+    class TunedUvicornWorker(UvicornWorker):
+        """
+        Gunicorn worker running uvicorn with an explicitly selected event
+        loop and HTTP parser.
+
+        ``CONFIG_KWARGS`` is filled in by :func:`gunicorn_options` in the
+        master process and inherited by every forked worker. The class is
+        handed to gunicorn as an object: a dotted path would be imported
+        afresh (``src.serve`` runs as ``__main__``) with the defaults.
+        """
+
+        CONFIG_KWARGS = {"loop": detect_loop(), "http": detect_http()}
+
+    class ContactsApplication(BaseApplication):
+        """
+        Embedded gunicorn application that preloads ``main:app`` in the
+        master process before forking workers.
+        """
+
+        def __init__(self, options: dict):
+            """
+            Initialize the application with gunicorn options.
+
+            Args:
+                options (dict): Gunicorn configuration settings.
+            """
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            """
+            Copy the supported options into the gunicorn config.
+            """
+            for key, value in self.options.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key.lower(), value)
+
+        def load(self):
+            """
+            Import the ASGI application.
+
+            Returns:
+                FastAPI: The application instance shared by all workers.
+            """
+            from main import app, run_migrations
+
+            try:
+                run_migrations()
+                app.state.migrations_applied = True
+            except Exception:
+                logger.exception("Migrations failed in the master process")
+            return app
+
+
+def child_exit(server, worker):
+    """
+    Gunicorn hook dropping the metrics of a worker that exited.
+
+    Args:
+        server: Gunicorn arbiter.
+        worker: The worker that exited.
+    """
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line options, falling back to ``SERVER_*`` settings.
+
+    Args:
+        argv (list, optional): Arguments to parse, defaults to ``sys.argv``.
+
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Run the Contacts API server.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS or default_workers(),
+        help="Number of worker processes (defaults to the CPU count).",
+    )
+    parser.add_argument(
+        "--loop", choices=["auto", "asyncio", "uvloop"], default="auto"
+    )
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], default="auto")
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE)
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=settings.SERVER_MAX_REQUESTS,
+        help="Gracefully restart a worker after this many requests (0 disables).",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=settings.SERVER_MAX_REQUESTS_JITTER
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT
+    )
+    return parser.parse_args(argv)
+
+
+def gunicorn_options(args: argparse.Namespace, loop: str, http: str) -> dict:
+    """
+    Build the gunicorn settings for the preloaded uvicorn workers.
+
+    Args:
+        args (argparse.Namespace): Parsed server options.
+        loop (str): Event loop implementation.
+        http (str): HTTP parser implementation.
+
+    Returns:
+        dict: Options for :class:`ContactsApplication`.
+    """
+    TunedUvicornWorker.CONFIG_KWARGS = {"loop": loop, "http": http}
+    return {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": TunedUvicornWorker,
+        "preload_app": True,
+        "keepalive": args.keep_alive,
+        "backlog": args.backlog,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter if args.max_requests else 0,
+        "graceful_timeout": args.graceful_timeout,
+        "child_exit": child_exit,
+    }
+
+
+def run_gunicorn(args: argparse.Namespace, loop: str, http: str):
+    """
+    Run the app under gunicorn with preloaded uvicorn workers.
+
+    Args:
+        args (argparse.Namespace): Parsed server options.
+        loop (str): Event loop implementation.
+        http (str): HTTP parser implementation.
+    """
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="contacts-metrics-")
+    )
+    ContactsApplication(gunicorn_options(args, loop, http)).run()
+
+
+def run_uvicorn(args: argparse.Namespace, loop: str, http: str):
+    """
+    Run the app with uvicorn's own process manager.
+
+    Used when gunicorn is not installed (e.g. on Windows). Uvicorn cannot
+    preload the app, so every worker imports it on its own.
+
+    Args:
+        args (argparse.Namespace): Parsed server options.
+        loop (str): Event loop implementation.
+        http (str): HTTP parser implementation.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        limit_max_requests=args.max_requests or None,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+def main(argv=None):
+    """
+    Entry point of the ``serve`` command.
+
+    Args:
+        argv (list, optional): Command line arguments.
+    """
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    loop = detect_loop() if args.loop == "auto" else args.loop
+    http = detect_http() if args.http == "auto" else args.http
+    logger.info(
+        f"Starting {args.workers} worker(s) on {args.host}:{args.port} "
+        f"(loop={loop}, http={http})"
+    )
+    if BaseApplication is not None:
+        run_gunicorn(args, loop, http)
+    else:
+        run_uvicorn(args, loop, http)
+
+
+if __name__ == "__main__":
+    main()
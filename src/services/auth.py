@@ -1,27 +1,36 @@
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from src.conf.config import settings
-from src.database.database import get_db
+from src.database.database import AsyncSessionLocal, get_db
 from src.database.models import User, UserRole
-from src.schemas.users import UserCacheModel
+from src.schemas.users import Principal, UserCacheModel
+from src.services.metrics import BCRYPT_DURATION, BCRYPT_QUEUE, record_cache
+from src.services.passwords import settings_context
 from src.services.redis_cache import redis_cache
+from src.services.refresh_tokens import RefreshTokenService
+from src.services.revocation import revocation_list, user_entry
 from src.services.users import UserService
 
 
 class Hash:
     """
-    Utility class for password hashing and verification using bcrypt.
+    Utility class for password hashing and verification.
+
+    Schemes and costs are configured through ``Settings``; see
+    :mod:`src.services.passwords`.
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = settings_context()
 
     def verify_password(self, plain_password, hashed_password):
         """
@@ -48,6 +57,63 @@ class Hash:
         """
         return self.pwd_context.hash(password)
 
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Checks whether a hash was made with another scheme or cost.
+
+        Args:
+            hashed_password (str): Stored hashed password.
+
+        Returns:
+            bool: True if the password should be rehashed.
+        """
+        return self.pwd_context.needs_update(hashed_password)
+
+
+async def hash_in_threadpool(func, *args):
+    """
+    Run a password hashing call in the thread pool.
+
+    Keeps bcrypt off the event loop and records how long the job waited
+    for a free thread and how long hashing took.
+
+    Args:
+        func (Callable): ``Hash`` method to run.
+        *args: Arguments passed to ``func``.
+
+    Returns:
+        Any: The result of ``func``.
+    """
+    enqueued = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        BCRYPT_QUEUE.observe(started - enqueued)
+        try:
+            return func(*args)
+        finally:
+            BCRYPT_DURATION.observe(time.perf_counter() - started)
+
+    return await run_in_threadpool(timed)
+
+
+async def rehash_password(user_id: int, old_hash: str, password: str):
+    """
+    Rehash a password with the current settings after a successful login.
+
+    Runs as a background task with its own session, so the login response
+    does not wait for the second hash.
+
+    Args:
+        user_id (int): ID of the user.
+        old_hash (str): Stored hash the password was verified against.
+        password (str): The verified plain password.
+    """
+    new_hash = await hash_in_threadpool(Hash().get_password_hash, password)
+    async with AsyncSessionLocal() as session:
+        if await UserService(session).update_password_hash(user_id, old_hash, new_hash):
+            logging.info(f"Password hash of user {user_id} upgraded")
+
 
 oauth2_scheme = HTTPBearer()
 
@@ -56,6 +122,8 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None):
     """
     Generates a new JWT access token.
 
+    Every token gets a unique ``jti`` claim, so it can be revoked on its own.
+
     Args:
         data (dict): Dictionary containing payload data.
         expires_delta (Optional[int]): Expiration time in seconds.
@@ -69,29 +137,115 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None):
     else:
         expire = datetime.now(UTC) + timedelta(seconds=settings.JWT_EXPIRATION_SECONDS)
     to_encode.update({"exp": expire})
-    print("to_encode", to_encode)
+    to_encode.setdefault("jti", uuid4().hex)
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
     )
     return encoded_jwt
 
 
+PROFILE_CACHE_KEY = "user_profile:{user_id}"
+
+
+def access_token_claims(user: User) -> dict:
+    """
+    Build the identity claims of an access token.
+
+    The claims carry everything most routes need to know about the caller,
+    so they are served without a database or cache lookup.
+
+    Args:
+        user (User): User the token is issued to.
+
+    Returns:
+        dict: Claims to pass to ``create_access_token``.
+    """
+    role = user.role.value if isinstance(user.role, UserRole) else user.role
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "role": role,
+        "tz": user.timezone or "UTC",
+        "token_version": user.token_version or 0,
+    }
+
+
+async def cache_user_profile(user: User) -> dict:
+    """
+    Cache the profile of a user for the routes that verify the token version.
+
+    Args:
+        user (User): User to cache.
+
+    Returns:
+        dict: The cached profile.
+    """
+    profile = UserCacheModel.model_validate(user).model_dump()
+    await redis_cache.set(
+        PROFILE_CACHE_KEY.format(user_id=user.id), profile, expire=3600
+    )
+    return profile
+
+
+async def forget_user_profile(user_id: int):
+    """
+    Drop the cached profile of a user after it changed.
+
+    Args:
+        user_id (int): ID of the user.
+    """
+    await redis_cache.delete(PROFILE_CACHE_KEY.format(user_id=user_id))
+
+
+async def revoke_user_tokens(db: Session, user_id: int) -> bool:
+    """
+    Revoke every access and refresh token issued to a user so far.
+
+    The user's ``token_version`` is incremented and the previous version is
+    added to the revocation list, so the old access tokens are rejected by
+    every route on every worker. New logins get the new version.
+
+    Args:
+        db (Session): Database session.
+        user_id (int): ID of the user.
+
+    Returns:
+        bool: False if the user does not exist.
+    """
+    version = await UserService(db).increment_token_version(user_id)
+    if version is None:
+        return False
+    await RefreshTokenService(db).revoke_user(user_id)
+    await forget_user_profile(user_id)
+    await revocation_list.revoke(
+        user_entry(user_id, version - 1), time.time() + settings.JWT_EXPIRATION_SECONDS
+    )
+    return True
+
+
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-):
+) -> Principal:
     """
     Retrieves the current authenticated user from the JWT token.
 
+    The principal is built from the token claims alone. Tokens issued
+    before the claims were added only carry the username; for those the
+    user is loaded from the database and the token counts as token
+    version 0. Revoked tokens are rejected; the check runs against a local
+    Bloom filter and needs no network I/O unless the filter reports a
+    possible match.
+
     Args:
         token (HTTPAuthorizationCredentials): JWT token containing user credentials.
-        db (Session): Database session.
+        db (Session): Database session, used only for tokens without claims.
 
     Returns:
-        User: Authenticated user object.
+        Principal: Identity of the authenticated user.
 
     Raises:
-        HTTPException: If token is invalid or user not found.
+        HTTPException: If token is invalid, revoked or user not found.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,36 +257,96 @@ async def get_current_user(
         payload = jwt.decode(
             token.credentials, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-        print("payload", payload)
         username = payload["sub"]
         if username is None:
             raise credentials_exception
-    except JWTError as e:
+    except (JWTError, KeyError) as e:
         logging.error(f"JWT Error: {e}")
         raise credentials_exception
 
-    user_data = await redis_cache.get(f"user:{username}")
-    if user_data:
-        logging.info(f"✅ User {username} found in Redis cache")
-        return UserCacheModel(**user_data)
+    revoked_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    if "uid" in payload and "role" in payload:
+        principal = Principal(
+            id=payload["uid"],
+            username=username,
+            role=payload["role"],
+            timezone=payload.get("tz", "UTC"),
+            token_version=payload.get("token_version", 0),
+            jti=payload.get("jti"),
+            expires_at=payload.get("exp"),
+        )
+    else:
+        user = await UserService(db).get_user_by_username(username)
+        if not user:
+            raise credentials_exception
+        # Tokens without claims predate token versions, so they belong to
+        # version 0 and are revoked by the first password reset or
+        # revoke-all.
+        if (user.token_version or 0) != 0:
+            raise revoked_exception
+        claims = access_token_claims(user)
+        principal = Principal(
+            id=claims["uid"],
+            username=claims["sub"],
+            role=claims["role"],
+            timezone=claims["tz"],
+            token_version=0,
+            jti=payload.get("jti"),
+            expires_at=payload.get("exp"),
+        )
 
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    if not user:
-        raise credentials_exception
+    entries = [user_entry(principal.id, principal.token_version)]
+    if principal.jti:
+        entries.append(principal.jti)
+    if await revocation_list.is_revoked(*entries):
+        raise revoked_exception
+    return principal
 
-    cached_user = UserCacheModel(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        is_verified=user.is_verified,
-        role=user.role,
-    ).dict()
 
-    await redis_cache.set(f"user:{user.username}", cached_user, expire=3600)
-    logging.info(f"💾 User {username} cached in Redis")
+async def get_verified_user(
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> UserCacheModel:
+    """
+    Load the full profile of the caller and check the token is not revoked.
 
-    return user
+    Used by sensitive routes. The profile is cached in Redis, so the check
+    usually costs one cache read.
+
+    Args:
+        principal (Principal): Identity from the access token.
+        db (Session): Database session, used on a cache miss.
+
+    Returns:
+        UserCacheModel: Current profile of the user.
+
+    Raises:
+        HTTPException: 401 if the user is gone or the token was revoked.
+    """
+    profile = await redis_cache.get(PROFILE_CACHE_KEY.format(user_id=principal.id))
+    record_cache("user", profile is not None)
+    if profile is None:
+        user = await UserService(db).get_user_by_id(principal.id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        profile = await cache_user_profile(user)
+
+    if profile["token_version"] != principal.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return UserCacheModel(**profile)
 
 
 def create_email_token(data: dict):
@@ -212,20 +426,25 @@ async def get_password_from_token(token: str) -> str:
         )
 
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(
+    current_user: UserCacheModel = Depends(get_verified_user),
+) -> UserCacheModel:
     """
     Validates that the current user has administrator privileges.
 
+    The role is checked against the verified profile, so a revoked token
+    or a withdrawn role takes effect at once.
+
     Args:
-        current_user (User): The currently authenticated user, obtained via dependency injection.
+        current_user (UserCacheModel): The verified user, obtained via dependency injection.
 
     Returns:
-        User: The current user if they have admin privileges.
+        UserCacheModel: The current user if they have admin privileges.
 
     Raises:
         HTTPException: If the user is not an administrator.
             - 403 Forbidden if user does not have admin role
     """
-    if current_user.role != UserRole.ADMIN:
+    if current_user.role != UserRole.ADMIN.value:
         raise HTTPException(status_code=403, detail="Permission denied")
     return current_user
@@ -0,0 +1,377 @@
+import asyncio
+import json
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from redis.exceptions import WatchError
+
+from src.conf.config import settings
+from src.database.database import AsyncSessionLocal
+from src.repository.contacts import ContactRepository
+from src.repository.user import UserRepository
+from src.schemas.contacts import ContactResponse
+from src.services.metrics import record_cache
+from src.services.redis_cache import RedisCache, redis_cache
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_KEY = "birthdays:{user_id}"
+BUILT_KEY = "birthdays:{user_id}:built"
+GENERATION_KEY = "birthdays:{user_id}:generation"
+JOB_LOCK_KEY = "lock:birthday_job"
+JOB_DONE_KEY = "birthday_job:{timezone}:{day}"
+DIGEST_KEY = "birthday_digest:{user_id}:{week}"
+HORIZON_DAYS = 366
+
+
+def local_today(tz_name: str, now: datetime | None = None) -> date:
+    """
+    Return the current date in a time zone.
+
+    :param tz_name: IANA time zone name; unknown names fall back to UTC.
+    :param now: Current time (aware), defaults to now.
+    :return: Local calendar date.
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = timezone.utc
+    return now.astimezone(tz).date()
+
+
+def next_birthday(birthday: date, today: date) -> date:
+    """
+    Return the next occurrence of a birthday on or after ``today``.
+
+    Feb 29 birthdays fall on Feb 28 in non-leap years.
+
+    :param birthday: Date of birth.
+    :param today: Reference date.
+    :return: Date of the next birthday.
+    """
+    for year in (today.year, today.year + 1):
+        try:
+            occurrence = birthday.replace(year=year)
+        except ValueError:
+            occurrence = date(year, 2, 28)
+        if occurrence >= today:
+            return occurrence
+    raise AssertionError("unreachable")
+
+
+def build_calendar(contacts, today: date) -> list[tuple[date, ContactResponse]]:
+    """
+    Order contacts by their next birthday within the calendar horizon.
+
+    :param contacts: Contact ORM objects.
+    :param today: First day of the calendar.
+    :return: ``(birthday, contact)`` pairs sorted by date.
+    """
+    entries = [
+        (next_birthday(contact.birthday, today), ContactResponse.model_validate(contact))
+        for contact in contacts
+    ]
+    entries.sort(key=lambda entry: (entry[0], entry[1].id))
+    return entries
+
+
+class BirthdayCalendar:
+    """
+    Per-user birthday calendars precomputed into Redis sorted sets.
+
+    Each member is a serialized contact scored by the ordinal of its next
+    birthday, so the upcoming-birthdays endpoint reads a score range. A
+    calendar covers ``HORIZON_DAYS`` from the day it was built. Contact
+    writes invalidate it, and a generation counter keeps a calendar computed
+    from data read before a write from being stored after it.
+    """
+
+    def __init__(self, cache: RedisCache = redis_cache, ttl: int = 2 * 24 * 3600):
+        """
+        Initialize the calendar store.
+
+        :param cache: Holder of the shared Redis connection.
+        :param ttl: Seconds a calendar is kept.
+        """
+        self.cache = cache
+        self.ttl = ttl
+
+    async def generation(self, user_id: int) -> bytes | None:
+        """
+        Read the user's calendar generation before loading contacts.
+
+        :param user_id: Owner of the calendar.
+        :return: Opaque generation value to pass to :meth:`store`.
+        """
+        return await self.cache.redis.get(GENERATION_KEY.format(user_id=user_id))
+
+    async def store(
+        self,
+        user_id: int,
+        today: date,
+        entries: list[tuple[date, ContactResponse]],
+        generation: bytes | None,
+    ) -> bool:
+        """
+        Replace the user's calendar, unless contacts changed meanwhile.
+
+        :param user_id: Owner of the calendar.
+        :param today: Day the calendar was built for.
+        :param entries: Output of :func:`build_calendar`.
+        :param generation: Value returned by :meth:`generation` before the
+            contacts were read.
+        :return: Whether the calendar was stored.
+        """
+        key = CALENDAR_KEY.format(user_id=user_id)
+        generation_key = GENERATION_KEY.format(user_id=user_id)
+        mapping = {
+            contact.model_dump_json(): day.toordinal() for day, contact in entries
+        }
+        async with self.cache.redis.pipeline() as pipe:
+            try:
+                await pipe.watch(generation_key)
+                if await pipe.get(generation_key) != generation:
+                    return False
+                pipe.multi()
+                pipe.delete(key)
+                if mapping:
+                    pipe.zadd(key, mapping)
+                    pipe.expire(key, self.ttl)
+                pipe.set(
+                    BUILT_KEY.format(user_id=user_id), today.toordinal(), ex=self.ttl
+                )
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def read(self, user_id: int, today: date, days: int) -> list | None:
+        """
+        Read the contacts with a birthday in ``[today, today + days]``.
+
+        :param user_id: Owner of the calendar.
+        :param today: User's current date.
+        :param days: Number of days ahead.
+        :return: Contacts in date order, or None if the calendar is missing or
+            does not cover the range.
+        """
+        async with self.cache.redis.pipeline(transaction=True) as pipe:
+            pipe.get(BUILT_KEY.format(user_id=user_id))
+            pipe.zrangebyscore(
+                CALENDAR_KEY.format(user_id=user_id),
+                today.toordinal(),
+                today.toordinal() + days,
+            )
+            built, members = await pipe.execute()
+        if built is None:
+            return None
+        built = int(built)
+        if not built <= today.toordinal() <= built + HORIZON_DAYS - days:
+            return None
+        return [ContactResponse(**json.loads(member)) for member in members]
+
+    async def invalidate(self, user_id: int):
+        """
+        Drop the user's calendar after a contact write.
+
+        :param user_id: Owner of the calendar.
+        """
+        if self.cache.redis is None:
+            return
+        async with self.cache.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(GENERATION_KEY.format(user_id=user_id))
+            pipe.expire(GENERATION_KEY.format(user_id=user_id), self.ttl)
+            pipe.delete(
+                CALENDAR_KEY.format(user_id=user_id), BUILT_KEY.format(user_id=user_id)
+            )
+            await pipe.execute()
+
+    async def upcoming(self, user, days: int, repository: ContactRepository) -> list:
+        """
+        Return the user's contacts with a birthday in the next ``days`` days.
+
+        The precomputed calendar is used when present; otherwise it is
+        rebuilt from the database. Without Redis, or for a range beyond the
+        calendar horizon, the query runs in SQL.
+
+        :param user: Current authenticated user.
+        :param days: Number of days ahead.
+        :param repository: Contact repository of the request.
+        :return: Contacts in birthday order.
+        """
+        today = local_today(getattr(user, "timezone", "UTC"))
+        if self.cache.redis is None or not 0 <= days < HORIZON_DAYS:
+            return await repository.get_upcoming_birthdays(days, user, today)
+
+        cached = await self.read(user.id, today, days)
+        record_cache("birthdays", cached is not None)
+        if cached is not None:
+            return cached
+
+        generation = await self.generation(user.id)
+        entries = build_calendar(await repository.get_all_contacts(user), today)
+        await self.store(user.id, today, entries, generation)
+        last_day = today + timedelta(days=days)
+        return [contact for day, contact in entries if day <= last_day]
+
+
+class BirthdayJob:
+    """
+    Scheduled job rebuilding birthday calendars after midnight in every
+    user time zone, and optionally mailing a weekly digest.
+
+    Every worker runs the loop, but a Redis lock lets only one of them work
+    at a time, and a per-zone marker makes each local day run once. A
+    per-user marker limits the digest to one per local ISO week.
+    """
+
+    def __init__(
+        self,
+        calendar: BirthdayCalendar,
+        session_factory=AsyncSessionLocal,
+        interval: int = 300,
+        chunk_size: int = 500,
+        digest: bool = False,
+    ):
+        """
+        Initialize the job.
+
+        :param calendar: Calendar store to fill.
+        :param session_factory: Factory for database sessions.
+        :param interval: Seconds between checks for zones past midnight.
+        :param chunk_size: Users loaded and processed per batch.
+        :param digest: Whether to send the "birthdays this week" email.
+        """
+        self.calendar = calendar
+        self.session_factory = session_factory
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.digest = digest
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """
+        Process every time zone whose current local day was not processed.
+
+        :param now: Current time (aware), defaults to now.
+        :return: Number of users processed.
+        """
+        redis = self.calendar.cache.redis
+        if redis is None:
+            return 0
+        token = uuid.uuid4().hex
+        if not await redis.set(JOB_LOCK_KEY, token, nx=True, ex=self.interval):
+            return 0
+
+        processed = 0
+        try:
+            async with self.session_factory() as session:
+                users = UserRepository(session)
+                contacts = ContactRepository(session)
+                for tz_name in await users.get_timezones():
+                    today = local_today(tz_name, now)
+                    done_key = JOB_DONE_KEY.format(timezone=tz_name, day=today.isoformat())
+                    if await redis.exists(done_key):
+                        continue
+                    processed += await self._process_timezone(
+                        redis, users, contacts, tz_name, today
+                    )
+                    await redis.set(done_key, 1, ex=2 * 24 * 3600)
+        finally:
+            if await redis.get(JOB_LOCK_KEY) == token.encode():
+                await redis.delete(JOB_LOCK_KEY)
+        if processed:
+            logger.info("Rebuilt birthday calendars of %s users", processed)
+        return processed
+
+    async def _process_timezone(
+        self, redis, users, contacts, tz_name: str, today: date
+    ) -> int:
+        processed = 0
+        after_id = 0
+        while True:
+            chunk = await users.get_users_by_timezone(tz_name, after_id, self.chunk_size)
+            if not chunk:
+                return processed
+            after_id = chunk[-1].id
+            # Keep the lock while working through a large zone.
+            await redis.expire(JOB_LOCK_KEY, self.interval)
+
+            generations = await redis.mget(
+                [GENERATION_KEY.format(user_id=user.id) for user in chunk]
+            )
+            by_user = {user.id: [] for user in chunk}
+            for contact in await contacts.get_contacts_for_users(list(by_user)):
+                by_user[contact.user_id].append(contact)
+
+            digests = []
+            for user, generation in zip(chunk, generations):
+                entries = build_calendar(by_user[user.id], today)
+                await self.calendar.store(user.id, today, entries, generation)
+                week = [
+                    {"date": day.isoformat(), "name": c.name, "surname": c.surname}
+                    for day, c in entries
+                    if day < today + timedelta(days=7)
+                ]
+                if (
+                    self.digest
+                    and week
+                    and await self._claim_digest(redis, user, today)
+                ):
+                    digests.append(self._send_digest(user, week))
+            await asyncio.gather(*digests)
+            processed += len(chunk)
+
+    async def _claim_digest(self, redis, user, today: date) -> bool:
+        year, week, _ = today.isocalendar()
+        key = DIGEST_KEY.format(user_id=user.id, week=f"{year}-W{week:02d}")
+        return bool(await redis.set(key, 1, nx=True, ex=8 * 24 * 3600))
+
+    async def _send_digest(self, user, week: list[dict]):
+        from src.services.email import send_birthday_digest
+
+        await send_birthday_digest(user.email, user.username, week)
+
+    async def run_forever(self):
+        """
+        Run :meth:`run_once` every ``interval`` seconds until cancelled.
+        """
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Birthday job failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """
+        Start the scheduling loop in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        """
+        Cancel the scheduling loop.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+birthday_calendar = BirthdayCalendar(ttl=settings.BIRTHDAY_CALENDAR_TTL_SECONDS)
+birthday_job = BirthdayJob(
+    birthday_calendar,
+    interval=settings.BIRTHDAY_JOB_INTERVAL_SECONDS,
+    chunk_size=settings.BIRTHDAY_JOB_CHUNK_SIZE,
+    digest=settings.BIRTHDAY_DIGEST_ENABLED,
+)
@@ -0,0 +1,288 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipEncoder:
+    """
+    Incremental gzip compressor.
+    """
+
+    def __init__(self, level: int):
+        """
+        Start a gzip stream.
+
+        :param level: zlib compression level, 1 to 9.
+        """
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress a chunk and flush it, so the client can decode it at once.
+
+        :param data: Chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """
+        Compress the last chunk and end the stream.
+
+        :param data: Last chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    """
+    Incremental Brotli compressor.
+    """
+
+    def __init__(self, quality: int):
+        """
+        Start a Brotli stream.
+
+        :param quality: Brotli quality, 0 to 11.
+        """
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress a chunk and flush it, so the client can decode it at once.
+
+        :param data: Chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """
+        Compress the last chunk and end the stream.
+
+        :param data: Last chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder:
+    """
+    Incremental Zstandard compressor.
+    """
+
+    def __init__(self, level: int):
+        """
+        Start a Zstandard frame.
+
+        :param level: Zstandard compression level, 1 to 22.
+        """
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress a chunk and flush it, so the client can decode it at once.
+
+        :param data: Chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """
+        Compress the last chunk and end the frame.
+
+        :param data: Last chunk of the response body.
+        :return: Compressed bytes.
+        """
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def available_encoders(
+    gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3
+) -> dict:
+    """
+    Return a factory for every content coding supported by this install.
+
+    Brotli and Zstandard are used only if the ``brotli`` and ``zstandard``
+    packages are installed.
+
+    :param gzip_level: gzip compression level.
+    :param brotli_quality: Brotli quality.
+    :param zstd_level: Zstandard compression level.
+    :return: Encoder factories by ``Content-Encoding`` token.
+    """
+    encoders = {"gzip": lambda: GzipEncoder(gzip_level)}
+    if brotli is not None:
+        encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+    if zstandard is not None:
+        encoders["zstd"] = lambda: ZstdEncoder(zstd_level)
+    return encoders
+
+
+def negotiate(accept_encoding: str, preference: list[str]) -> str | None:
+    """
+    Pick the preferred content coding the client accepts.
+
+    :param accept_encoding: Value of the ``Accept-Encoding`` request header.
+    :param preference: Server-supported codings, most preferred first.
+    :return: A coding from ``preference``, or None to send identity.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if token:
+            weights[token] = weight
+    accepted = [
+        coding
+        for coding in preference
+        if weights.get(coding, weights.get("*", 0.0)) > 0
+    ]
+    if not accepted:
+        return None
+    return max(accepted, key=lambda coding: weights.get(coding, weights.get("*")))
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with gzip, Brotli or
+    Zstandard, as negotiated through ``Accept-Encoding``.
+
+    Only responses of an allowed content type are compressed. A complete
+    body is compressed if it reaches ``minimum_size``; a streamed body is
+    compressed chunk by chunk as it is sent, and each chunk is flushed, so
+    nothing is buffered.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        content_types: list[str] = ("application/json",),
+        encodings: list[str] = ("zstd", "br", "gzip"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        """
+        Wrap an ASGI application.
+
+        :param app: The downstream ASGI application.
+        :param minimum_size: Smallest complete body worth compressing, in
+            bytes.
+        :param content_types: Media types to compress; ``text/*`` matches
+            every text type.
+        :param encodings: Content codings to offer, most preferred first.
+            Codings whose package is not installed are skipped.
+        :param gzip_level: gzip compression level.
+        :param brotli_quality: Brotli quality.
+        :param zstd_level: Zstandard compression level.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {value.strip().lower() for value in content_types}
+        self.encoders = available_encoders(gzip_level, brotli_quality, zstd_level)
+        self.preference = [coding for coding in encodings if coding in self.encoders]
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return (
+            media_type in self.content_types
+            or f"{media_type.split('/')[0]}/*" in self.content_types
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.preference
+        )
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if message["status"] in (204, 304) or not self._compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether the
+                    # response is worth compressing.
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                declared = headers.get("content-length")
+                small = (
+                    len(body) < self.minimum_size
+                    if not more_body
+                    else declared is not None and int(declared) < self.minimum_size
+                )
+                if small:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                encoder = self.encoders[coding]()
+                headers["content-encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    body = encoder.finish(body)
+                    headers["content-length"] = str(len(body))
+                    await send({**start, "headers": headers.raw})
+                    await send({**message, "body": body})
+                    return
+                await send({**start, "headers": headers.raw})
+
+            if more_body:
+                body = encoder.compress(body)
+                if body:
+                    await send({**message, "body": body})
+            else:
+                await send({**message, "body": encoder.finish(body)})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,387 @@
+import asyncio
+import json
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.services.metrics import SSE_CONNECTIONS
+from src.services.redis_cache import RedisCache, redis_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "contact_events:{user_id}"
+STREAM_KEY = "contact_events:{user_id}"
+LAST_ID_KEY = "contact_events:{user_id}:last"
+STREAM_TTL_SECONDS = 24 * 3600
+LAST_ID_TTL_SECONDS = 30 * 24 * 3600
+RECONNECT_DELAY_MS = 1000
+
+# Put on a subscription's queue when it overflowed; ends the stream so the
+# client reconnects and replays what it missed from Last-Event-ID.
+OVERFLOW = object()
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _parse_id(event_id: str) -> tuple[int, int]:
+    """
+    Split a Redis stream ID such as ``1700000000000-3`` for comparison.
+
+    Args:
+        event_id (str): Stream ID.
+
+    Returns:
+        tuple[int, int]: Milliseconds and sequence number.
+    """
+    millis, _, sequence = event_id.partition("-")
+    return int(millis), int(sequence or 0)
+
+
+def format_event(event: dict) -> str:
+    """
+    Render a contact event in the ``text/event-stream`` format.
+
+    Args:
+        event (dict): Event with ``id``, ``type``, ``contact_id`` and
+            ``version``.
+
+    Returns:
+        str: SSE message.
+    """
+    data = json.dumps({"contact_id": event["contact_id"], "version": event["version"]})
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """
+    Bounded buffer of events for one SSE connection.
+    """
+
+    def __init__(self, user_id: int, size: int):
+        """
+        Initialize the subscription.
+
+        Args:
+            user_id (int): Owner of the streamed contacts.
+            size (int): Maximum number of buffered events.
+        """
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+    def deliver(self, event: dict):
+        """
+        Buffer an event, or end the stream if the client cannot keep up.
+
+        Args:
+            event (dict): Event to deliver.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class ContactEventBus:
+    """
+    Fans out contact create, update and delete events to SSE connections.
+
+    Events are appended to a capped per-user Redis stream (for resuming via
+    ``Last-Event-ID``) and announced on a per-user pub/sub channel. Every
+    worker holds one pub/sub connection, subscribed to the channels of the
+    users with a local connection, and hands events to the bounded queues
+    of those connections. A worker therefore only receives the events of
+    its own subscribers, and an idle connection costs a queue and a
+    suspended generator. Without Redis, events are delivered within the
+    process only and cannot be replayed.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = redis_cache,
+        queue_size: int = 100,
+        heartbeat: float = 15.0,
+        stream_maxlen: int = 1000,
+    ):
+        """
+        Initialize the bus.
+
+        Args:
+            cache (RedisCache): Holder of the shared Redis connection.
+            queue_size (int): Events buffered per connection.
+            heartbeat (float): Seconds of silence before a keep-alive comment.
+            stream_maxlen (int): Approximate events kept per user for replay.
+        """
+        self.cache = cache
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.stream_maxlen = stream_maxlen
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        self._local_sequence = 0
+
+    async def publish(self, user_id: int, event_type: str, contact_id: int, version: int):
+        """
+        Publish a contact event to the user's open streams on all workers.
+
+        Failures are logged, not raised: the write has already been
+        committed, and clients catch up through delta sync.
+
+        Args:
+            user_id (int): Owner of the contact.
+            event_type (str): ``created``, ``updated`` or ``deleted``.
+            contact_id (int): ID of the changed contact.
+            version (int): Change sequence number of the write.
+        """
+        fields = {"type": event_type, "contact_id": contact_id, "version": version}
+        redis = self.cache.redis
+        if redis is None:
+            self._local_sequence += 1
+            event_id = f"{int(time.time() * 1000)}-{self._local_sequence}"
+            self._dispatch({**fields, "id": event_id, "user_id": user_id})
+            return
+
+        key = STREAM_KEY.format(user_id=user_id)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.xadd(key, fields, maxlen=self.stream_maxlen, approximate=True)
+                pipe.expire(key, STREAM_TTL_SECONDS)
+                event_id, _ = await pipe.execute()
+            event_id = _decode(event_id)
+            payload = {**fields, "id": event_id, "user_id": user_id}
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    LAST_ID_KEY.format(user_id=user_id),
+                    event_id,
+                    ex=LAST_ID_TTL_SECONDS,
+                )
+                pipe.publish(CHANNEL.format(user_id=user_id), json.dumps(payload))
+                await pipe.execute()
+        except RedisError as error:
+            logger.warning("Could not publish contact event: %s", error)
+
+    def _dispatch(self, event: dict):
+        for subscription in self._subscriptions.get(event["user_id"], ()):
+            subscription.deliver(event)
+
+    def _channels(self) -> set[str]:
+        return {CHANNEL.format(user_id=user_id) for user_id in self._subscriptions}
+
+    async def _watch(self, user_id: int):
+        """
+        Subscribe to the user's channel and start the listener if needed.
+
+        Args:
+            user_id (int): User with a new local connection.
+        """
+        if self._pubsub is None:
+            self._pubsub = self.cache.redis.pubsub()
+        try:
+            await self._pubsub.subscribe(CHANNEL.format(user_id=user_id))
+        except RedisError as error:
+            # The listener subscribes again when it reconnects.
+            logger.warning("Could not subscribe to contact events: %s", error)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        """
+        Forward pub/sub messages to local subscriptions until cancelled.
+
+        Channels of users without a local connection left are unsubscribed
+        between messages.
+        """
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self.cache.redis.pubsub()
+                    channels = self._channels()
+                    if channels:
+                        await self._pubsub.subscribe(*channels)
+                pubsub = self._pubsub
+                while True:
+                    if pubsub.connection is None:
+                        await asyncio.sleep(1.0)
+                        continue
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        self._dispatch(json.loads(message["data"]))
+                    stale = {_decode(channel) for channel in pubsub.channels}
+                    stale -= {
+                        _decode(channel)
+                        for channel in pubsub.pending_unsubscribe_channels
+                    }
+                    stale -= self._channels()
+                    if stale:
+                        await pubsub.unsubscribe(*stale)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.warning("Contact event listener failed: %s", error)
+                await self._close_pubsub()
+                await asyncio.sleep(1)
+
+    async def _close_pubsub(self):
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        """
+        Register a connection for the user's events.
+
+        Args:
+            user_id (int): Authenticated user.
+
+        Returns:
+            Subscription: Buffer receiving the events.
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        first = user_id not in self._subscriptions
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        SSE_CONNECTIONS.inc()
+        if self.cache.redis is not None and first:
+            await self._watch(user_id)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a connection's subscription.
+
+        The listener drops the user's channel once no connection is left.
+
+        Args:
+            subscription (Subscription): Subscription returned by
+                :meth:`subscribe`.
+        """
+        subscriptions = self._subscriptions.get(subscription.user_id, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            self._subscriptions.pop(subscription.user_id, None)
+        SSE_CONNECTIONS.dec()
+
+    async def replay(self, user_id: int, last_event_id: str) -> tuple[list[dict], bool]:
+        """
+        Read the user's events published after ``last_event_id``.
+
+        If the stream has expired, nothing was published for a while; the
+        client missed nothing if it already has the last published event.
+
+        Args:
+            user_id (int): Authenticated user.
+            last_event_id (str): ID of the last event the client received.
+
+        Returns:
+            tuple[list[dict], bool]: Missed events, and whether they are
+            complete (False if the stream no longer reaches back that far).
+        """
+        redis = self.cache.redis
+        if redis is None:
+            return [], False
+        try:
+            last = _parse_id(last_event_id)
+        except ValueError:
+            return [], False
+        key = STREAM_KEY.format(user_id=user_id)
+        oldest = await redis.xrange(key, count=1)
+        if not oldest:
+            latest = await redis.get(LAST_ID_KEY.format(user_id=user_id))
+            return [], latest is not None and _parse_id(_decode(latest)) <= last
+        if _parse_id(_decode(oldest[0][0])) > last:
+            return [], False
+        entries = await redis.xrange(
+            key, min=f"({last_event_id}", max="+", count=self.stream_maxlen
+        )
+        events = []
+        for entry_id, fields in entries:
+            fields = {_decode(k): _decode(v) for k, v in fields.items()}
+            events.append(
+                {
+                    "id": _decode(entry_id),
+                    "type": fields["type"],
+                    "contact_id": int(fields["contact_id"]),
+                    "version": int(fields["version"]),
+                }
+            )
+        return events, True
+
+    async def stream(self, user_id: int, last_event_id: str | None = None):
+        """
+        Generate the SSE stream of the user's contact events.
+
+        Missed events are replayed first when ``last_event_id`` is given; if
+        they are no longer available a ``resync`` event tells the client to
+        catch up through ``GET /api/contacts/changes``. A comment is sent
+        after ``heartbeat`` seconds of silence so proxies keep the
+        connection open.
+
+        Args:
+            user_id (int): Authenticated user.
+            last_event_id (str, optional): Value of the ``Last-Event-ID``
+                header.
+
+        Yields:
+            str: SSE messages.
+        """
+        subscription = await self.subscribe(user_id)
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            # Events up to the replayed ones may also arrive over pub/sub.
+            # Later ones are passed through as they come: several workers
+            # publish, so they can arrive out of stream order.
+            replayed = None
+            if last_event_id:
+                events, complete = await self.replay(user_id, last_event_id)
+                if not complete:
+                    yield "event: resync\ndata: {}\n\n"
+                else:
+                    replayed = _parse_id(last_event_id)
+                for event in events:
+                    yield format_event(event)
+                    replayed = _parse_id(event["id"])
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), self.heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event is OVERFLOW:
+                    return
+                if replayed is not None and _parse_id(event["id"]) <= replayed:
+                    continue
+                yield format_event(event)
+        finally:
+            self.unsubscribe(subscription)
+
+    async def close(self):
+        """
+        Stop the pub/sub listener.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._close_pubsub()
+
+
+contact_events = ContactEventBus(
+    queue_size=settings.SSE_QUEUE_SIZE,
+    heartbeat=settings.SSE_HEARTBEAT_SECONDS,
+    stream_maxlen=settings.CONTACT_EVENTS_STREAM_MAXLEN,
+)
@@ -1,9 +1,27 @@
+import hashlib
+import json
+
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.repository.contacts import ContactRepository
-from src.schemas.contacts import ContactModel
+from src.conf.config import settings
+from src.schemas.contacts import (
+    ContactChanges,
+    ContactModel,
+    ContactStats,
+    ContactSuggestion,
+    contact_fields_model,
+    normalize_phone,
+    parse_fields,
+)
+from src.services.birthdays import birthday_calendar
+from src.services.duplicates import DuplicateFinder
+from src.services.metrics import record_cache
+from src.services.redis_cache import redis_cache
+from src.services.replica import replica_router
 
 
 class ContactService:
@@ -26,19 +44,45 @@ class ContactService:
         :param body: Contact data.
         :param user: Current authenticated user.
         :return: Created contact object.
-        :raises HTTPException: If a contact with the same email or
-            phone exists.
+        :raises HTTPException: If the user already has a contact with the
+            same email or phone.
         """
-        if await self.repository.is_contact_exists(body.email, body.phone):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Contact with '{body.email}' email or "
-                f"'{body.phone}' phone number already exists.",
-            )
-        return await self.repository.create_contact(body, user)
+        if await self.repository.is_contact_exists(body.email, body.phone, user):
+            raise self._conflict(body)
+        try:
+            contact = await self.repository.create_contact(body, user)
+        except IntegrityError:
+            # Lost a race with a concurrent insert of the same email or phone.
+            raise self._conflict(body)
+        await replica_router.record_write(user.id)
+        await birthday_calendar.invalidate(user.id)
+        return contact
+
+    @staticmethod
+    def _conflict(body: ContactModel) -> HTTPException:
+        """
+        Build the error returned for a duplicate email or phone.
+
+        :param body: Contact data that caused the conflict.
+        :return: HTTP 400 exception.
+        """
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Contact with '{body.email}' email or "
+            f"'{body.phone}' phone number already exists.",
+        )
 
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        tags: list[str] | None = None,
+        tag_mode: str = "any",
+        sort: str = "id",
     ):
         """
         Retrieve a list of contacts with optional filtering.
@@ -49,13 +93,124 @@ class ContactService:
         :param skip: Number of records to skip.
         :param limit: Maximum number of records to return.
         :param user: Current authenticated user.
+        :param tags: Filter by tags (optional).
+        :param tag_mode: ``any`` or ``all`` of the tags must match.
+        :param sort: Sort field, prefixed with ``-`` for descending order.
         :return: List of contacts.
         """
 
         return await self.repository.get_contacts(
-            name, surname, email, skip, limit, user
+            name, surname, email, skip, limit, user, tags, tag_mode, sort
+        )
+
+    async def get_contact_fields(
+        self,
+        fields: str,
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        tags: list[str] | None = None,
+        tag_mode: str = "any",
+        sort: str = "id",
+    ):
+        """
+        Retrieve a list of contacts limited to some fields.
+
+        :param fields: Comma-separated contact fields; ``id`` is always
+            included.
+        :param name: Filter by name (optional).
+        :param surname: Filter by surname (optional).
+        :param email: Filter by email (optional).
+        :param skip: Number of records to skip.
+        :param limit: Maximum number of records to return.
+        :param user: Current authenticated user.
+        :param tags: Filter by tags (optional).
+        :param tag_mode: ``any`` or ``all`` of the tags must match.
+        :param sort: Sort field, prefixed with ``-`` for descending order.
+        :return: List of partial contacts.
+        :raises HTTPException: If an unknown field is requested.
+        """
+        try:
+            fields = parse_fields(fields)
+        except ValueError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+            )
+        rows = await self.repository.get_contact_fields(
+            fields, name, surname, email, skip, limit, user, tags, tag_mode, sort
+        )
+        return contact_fields_model(fields).model_validate(rows)
+
+    async def count_contacts(
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        user: User,
+        tags: list[str] | None = None,
+        tag_mode: str = "any",
+    ):
+        """
+        Count the contacts matching the list filters.
+
+        The unfiltered total is read from the user's counters. Filtered counts
+        are cached under the user's change sequence number, so any contact
+        write makes them stale without explicit invalidation.
+
+        :param name: Filter by name (optional).
+        :param surname: Filter by surname (optional).
+        :param email: Filter by email (optional).
+        :param user: Current authenticated user.
+        :param tags: Filter by tags (optional).
+        :param tag_mode: ``any`` or ``all`` of the tags must match.
+        :return: Number of matching contacts.
+        """
+        if not (name or surname or email or tags):
+            return sum((await self.repository.get_stats(user)).values())
+
+        version = await self.repository.get_contacts_version(user)
+        filters = json.dumps([name, surname, email, sorted(tags or []), tag_mode])
+        key = (
+            f"contacts_count:{user.id}:{version}:"
+            f"{hashlib.sha1(filters.encode()).hexdigest()}"
+        )
+        cached = await redis_cache.get(key)
+        record_cache("contacts_count", cached is not None)
+        if cached is not None:
+            return cached["total"]
+        total = await self.repository.count_contacts(
+            name, surname, email, user, tags, tag_mode
+        )
+        await redis_cache.set(
+            key, {"total": total}, expire=settings.CONTACT_COUNT_CACHE_TTL_SECONDS
+        )
+        return total
+
+    async def get_stats(self, user: User):
+        """
+        Retrieve the number of contacts in total and by birthday month.
+
+        :param user: Current authenticated user.
+        :return: Contact statistics.
+        """
+        counts = await self.repository.get_stats(user)
+        return ContactStats(
+            total=sum(counts.values()),
+            birthdays_by_month={month: counts.get(month, 0) for month in range(1, 13)},
         )
 
+    async def get_tags(self, user: User):
+        """
+        Retrieve the user's tags with the number of contacts carrying each.
+
+        :param user: Current authenticated user.
+        :return: List of tags, most used first.
+        """
+        return await self.repository.get_tags(user)
+
     async def get_contact(self, contact_id: int, user: User):
         """
         Retrieve a specific contact by ID.
@@ -73,6 +228,64 @@ class ContactService:
             )
         return contact
 
+    async def suggest_contacts(self, prefix: str, limit: int, user: User):
+        """
+        Suggest contacts whose name, surname or email starts with a prefix.
+
+        :param prefix: Text typed so far.
+        :param limit: Maximum number of suggestions.
+        :param user: Current authenticated user.
+        :return: List of compact suggestions.
+        """
+        rows = await self.repository.suggest_contacts(prefix.strip(), limit, user)
+        return [
+            ContactSuggestion(
+                id=row.id, display=f"{row.name} {row.surname} <{row.email}>"
+            )
+            for row in rows
+        ]
+
+    async def find_duplicates(
+        self, min_score: float, include_merge_plan: bool, user: User
+    ):
+        """
+        Group the user's contacts that likely describe the same person.
+
+        :param min_score: Lowest pair score that links two contacts.
+        :param include_merge_plan: Whether to suggest a merge for each group.
+        :param user: Current authenticated user.
+        :return: Duplicate groups.
+        """
+        finder = DuplicateFinder(
+            self.repository,
+            batch_size=settings.DUPLICATES_BATCH_SIZE,
+            max_block_size=settings.DUPLICATES_MAX_BLOCK_SIZE,
+        )
+        return await finder.find(user, min_score, include_merge_plan)
+
+    async def lookup_contact(self, phone: str, user: User):
+        """
+        Find the contact with a phone number, in any international format.
+
+        :param phone: Phone number to look up.
+        :param user: Current authenticated user.
+        :return: Contact object.
+        :raises HTTPException: If the number is invalid or no contact has it.
+        """
+        try:
+            phone = normalize_phone(phone)
+        except ValueError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+            )
+        contact = await self.repository.get_contact_by_phone(phone, user)
+        if contact is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Contact not found",
+            )
+        return contact
+
     async def update_contact(self, contact_id: int, body: ContactModel, user: User):
         """
         Update an existing contact.
@@ -81,14 +294,22 @@ class ContactService:
         :param body: Updated contact data.
         :param user: Current authenticated user.
         :return: Updated contact object.
-        :raises HTTPException: If the contact is not found.
+        :raises HTTPException: If the contact is not found or another contact
+            of the user has the same email or phone.
         """
-        updated_contact = await self.repository.update_contact(contact_id, body, user)
+        try:
+            updated_contact = await self.repository.update_contact(
+                contact_id, body, user
+            )
+        except IntegrityError:
+            raise self._conflict(body)
         if updated_contact is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Contact not found",
             )
+        await replica_router.record_write(user.id)
+        await birthday_calendar.invalidate(user.id)
         return updated_contact
 
     async def remove_contact(self, contact_id: int, user: User):
@@ -106,14 +327,53 @@ class ContactService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Contact not found",
             )
+        await replica_router.record_write(user.id)
+        await birthday_calendar.invalidate(user.id)
         return deleted_contact
 
     async def get_upcoming_birthdays(self, days: int, user: User):
         """
         Retrieve a list of contacts with upcoming birthdays.
 
+        Served from the user's precomputed birthday calendar when Redis is
+        available.
+
         :param days: Number of days to check for upcoming birthdays.
         :param user: Current authenticated user.
         :return: List of contacts with upcoming birthdays.
         """
-        return await self.repository.get_upcoming_birthdays(days, user)
+        return await birthday_calendar.upcoming(user, days, self.repository)
+
+    async def get_changes(
+        self, since: int | None, limit: int, user: User, full: bool = False
+    ):
+        """
+        Retrieve the IDs of contacts changed since a sync token.
+
+        A token older than the tombstone retention window may have missed
+        deletes, so it gets a full sync flagged with ``reset``. The last page
+        of a full sync returns a token at or above the retention window.
+
+        :param since: Token from the previous sync, or None for a full sync.
+        :param limit: Maximum number of changes to return.
+        :param user: Current authenticated user.
+        :param full: Whether ``since`` continues a full sync.
+        :return: Upserted and deleted IDs with the next token.
+        """
+        pruned = await self.repository.get_pruned_version(user)
+        reset = since is not None and not full and since < pruned
+        if reset:
+            since = None
+        full = full or since is None
+        rows = await self.repository.get_changes(since, limit + 1, user)
+        page = rows[:limit]
+        token = page[-1].version if page else since or 0
+        if full and len(rows) <= limit:
+            token = max(token, pruned)
+        return ContactChanges(
+            upserted=[row.contact_id for row in page if not row.deleted],
+            deleted=[row.contact_id for row in page if row.deleted],
+            token=token,
+            has_more=len(rows) > limit,
+            reset=reset,
+        )
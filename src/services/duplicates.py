@@ -0,0 +1,285 @@
+import logging
+import re
+
+from src.schemas.contacts import DuplicateGroup, DuplicateReport, MergePlan
+
+logger = logging.getLogger(__name__)
+
+# Blocking key columns of ``contacts``, with the weight of a match on each.
+KEY_WEIGHTS = {"email_key": 0.7, "phone_key": 0.7, "name_key": 0.3}
+BIRTHDAY_WEIGHT = 0.4
+FULL_NAME_WEIGHT = 0.3
+PHONE_KEY_DIGITS = 9
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def soundex(value: str) -> str:
+    """
+    Compute the American Soundex code of a name.
+
+    Names that sound alike, such as ``Shevchenko`` and ``Schevchenko``, get
+    the same code.
+
+    :param value: Name in Latin script.
+    :return: Four-character code such as ``S125``, or the lowercased name
+        if it has no Latin letters.
+    """
+    letters = re.sub(r"[^a-z]", "", value.lower())
+    if not letters:
+        return value.strip().lower()
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0])
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter)
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code; vowels do.
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def blocking_keys(name: str, surname: str, email: str, phone: str) -> dict:
+    """
+    Derive the keys under which likely duplicates of a contact are grouped.
+
+    :param name: First name.
+    :param surname: Last name.
+    :param email: Email address.
+    :param phone: Phone number.
+    :return: Values of the ``email_key``, ``phone_key`` and ``name_key``
+        columns.
+    """
+    digits = re.sub(r"\D", "", phone)
+    return {
+        "email_key": email.strip().lower(),
+        # The national number, so that numbers with and without a country
+        # code fall into the same block.
+        "phone_key": digits[-PHONE_KEY_DIGITS:],
+        "name_key": soundex(surname)[:4] + soundex(name)[:4],
+    }
+
+
+def score(first, second) -> float:
+    """
+    Estimate how likely two contacts describe the same person.
+
+    Every matching piece of evidence independently raises the score
+    (``1 - prod(1 - weight)``), so a shared email or phone alone scores
+    0.7, and a similar-sounding name with the same birthday 0.58.
+
+    :param first: Contact.
+    :param second: Contact.
+    :return: Score between 0 and 1.
+    """
+    weights = [
+        weight
+        for key, weight in KEY_WEIGHTS.items()
+        if getattr(first, key) and getattr(first, key) == getattr(second, key)
+    ]
+    if first.birthday == second.birthday:
+        weights.append(BIRTHDAY_WEIGHT)
+    if (first.name.lower(), first.surname.lower()) == (
+        second.name.lower(),
+        second.surname.lower(),
+    ):
+        weights.append(FULL_NAME_WEIGHT)
+    remaining = 1.0
+    for weight in weights:
+        remaining *= 1 - weight
+    return round(1 - remaining, 3)
+
+
+class DisjointSet:
+    """
+    Union-find over contact IDs, with path halving and union by size.
+    """
+
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+        self.size: dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        """
+        Return the representative of the item's set, adding it if new.
+
+        :param item: Contact ID.
+        :return: Representative contact ID.
+        """
+        self.parent.setdefault(item, item)
+        self.size.setdefault(item, 1)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int):
+        """
+        Merge the sets of two items.
+
+        :param first: Contact ID.
+        :param second: Contact ID.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+
+
+def merge_plan(contacts: list) -> MergePlan:
+    """
+    Suggest how to merge a group of duplicates into one contact.
+
+    The contact with the most details is kept, preferring the most recently
+    updated one; missing details are filled from the others.
+
+    :param contacts: Contacts of one group.
+    :return: Merge plan.
+    """
+
+    def rank(contact):
+        updated = contact.updated_at or contact.created_at
+        return bool(contact.info), updated, -contact.id
+
+    ordered = sorted(contacts, key=rank, reverse=True)
+    keep = ordered[0]
+    updates = {}
+    if not keep.info:
+        info = next((c.info for c in ordered[1:] if c.info), None)
+        if info:
+            updates["info"] = info
+    return MergePlan(
+        keep_id=keep.id,
+        remove_ids=sorted(c.id for c in ordered[1:]),
+        updates=updates,
+    )
+
+
+class DuplicateFinder:
+    """
+    Groups a user's likely duplicate contacts.
+
+    Only contacts sharing a blocking key (``email_key``, ``phone_key`` or
+    ``name_key``) are compared, so the work grows with the size of the
+    blocks rather than with the square of the address book. Blocks are read
+    from the key indexes in batches of ``batch_size`` keys; blocks larger
+    than ``max_block_size`` (very common names) are skipped.
+    """
+
+    def __init__(self, repository, batch_size: int = 500, max_block_size: int = 100):
+        """
+        Initialize the finder.
+
+        :param repository: Contact repository of the request.
+        :param batch_size: Blocking keys loaded per query.
+        :param max_block_size: Largest block whose pairs are scored.
+        """
+        self.repository = repository
+        self.batch_size = batch_size
+        self.max_block_size = max_block_size
+
+    async def _blocks(self, key: str, user):
+        """
+        Yield the user's blocks of contacts sharing a key value.
+
+        :param key: Blocking key column.
+        :param user: Current authenticated user.
+        :return: Async iterator of contact lists, or None for each block
+            that is too large to score.
+        """
+        after = None
+        while True:
+            rows = await self.repository.get_duplicate_keys(
+                key, after, self.batch_size, user
+            )
+            if not rows:
+                return
+            after = rows[-1].value
+            values = []
+            for row in rows:
+                if row.count > self.max_block_size:
+                    yield None
+                else:
+                    values.append(row.value)
+            if not values:
+                continue
+            blocks = {value: [] for value in values}
+            for contact in await self.repository.get_contacts_by_keys(
+                key, values, user
+            ):
+                blocks[getattr(contact, key)].append(contact)
+            for block in blocks.values():
+                yield block
+
+    async def find(self, user, min_score: float, include_merge_plan: bool):
+        """
+        Find groups of contacts that likely describe the same person.
+
+        :param user: Current authenticated user.
+        :param min_score: Lowest pair score that links two contacts.
+        :param include_merge_plan: Whether to suggest a merge for each group.
+        :return: Duplicate groups, largest first.
+        """
+        groups = DisjointSet()
+        contacts = {}
+        links = {}
+        skipped = 0
+        for key in KEY_WEIGHTS:
+            async for block in self._blocks(key, user):
+                if block is None:
+                    skipped += 1
+                    continue
+                for index, first in enumerate(block):
+                    contacts[first.id] = first
+                    for second in block[index + 1 :]:
+                        pair = (min(first.id, second.id), max(first.id, second.id))
+                        if pair in links:
+                            continue
+                        pair_score = score(first, second)
+                        links[pair] = pair_score
+                        if pair_score >= min_score:
+                            groups.union(*pair)
+        if skipped:
+            logger.info("Skipped %s oversized duplicate blocks", skipped)
+
+        members: dict[int, list] = {}
+        for contact_id in groups.parent:
+            members.setdefault(groups.find(contact_id), []).append(contact_id)
+        weakest: dict[int, float] = {}
+        for (first, _), pair_score in links.items():
+            if pair_score >= min_score:
+                root = groups.find(first)
+                weakest[root] = min(weakest.get(root, 1.0), pair_score)
+
+        result = []
+        for root, ids in members.items():
+            if len(ids) < 2:
+                continue
+            ids.sort()
+            result.append(
+                DuplicateGroup(
+                    contact_ids=ids,
+                    score=weakest[root],
+                    merge_plan=(
+                        merge_plan([contacts[i] for i in ids])
+                        if include_merge_plan
+                        else None
+                    ),
+                )
+            )
+        result.sort(key=lambda group: (-len(group.contact_ids), group.contact_ids))
+        return DuplicateReport(groups=result, skipped_blocks=skipped)
+
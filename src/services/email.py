@@ -91,3 +91,26 @@ async def send_reset_password_email(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to send email",
         )
+
+
+async def send_birthday_digest(email: EmailStr, username: str, birthdays: list[dict]):
+    """
+    Sends the weekly digest of upcoming contact birthdays.
+
+    :param email: Recipient's email address.
+    :param username: User's username.
+    :param birthdays: Entries with ``date``, ``name`` and ``surname``, in
+        date order.
+    """
+    try:
+        message = MessageSchema(
+            subject="Birthdays this week",
+            recipients=[email],
+            template_body={"username": username, "birthdays": birthdays},
+            subtype=MessageType.html,
+        )
+
+        fm = FastMail(conf)
+        await fm.send_message(message, template_name="birthday_digest.html")
+    except ConnectionErrors as err:
+        logging.error(f"Error sending birthday digest: {err}")
@@ -0,0 +1,226 @@
+import inspect
+import os
+import time
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import REGISTRY, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by route and status code.",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed.")
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Pool connection checkouts.")
+DB_SESSIONS = Counter(
+    "db_sessions_total",
+    "Request database sessions by whether they were used.",
+    ["used"],
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency.",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ["cache", "result"],
+)
+BCRYPT_QUEUE = Histogram(
+    "password_hash_queue_seconds",
+    "Time password hashing jobs wait for a worker thread.",
+)
+BCRYPT_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying passwords.",
+)
+TOKEN_REFRESHES = Counter(
+    "auth_token_refreshes_total",
+    "Refresh token exchanges by result.",
+    ["result"],
+)
+REVOCATION_CHECKS = Counter(
+    "auth_revocation_checks_total",
+    "Access token revocation checks by result (miss, false_positive or revoked).",
+    ["result"],
+)
+BACKGROUND_JOBS = Gauge(
+    "background_jobs_pending",
+    "Background tasks scheduled but not yet finished.",
+    multiprocess_mode="livesum",
+)
+SSE_CONNECTIONS = Gauge(
+    "sse_connections",
+    "Open server-sent-event streams.",
+    multiprocess_mode="livesum",
+)
+
+
+def record_cache(cache: str, hit: bool):
+    """
+    Count a cache lookup.
+
+    :param cache: Cache name, e.g. ``"user"``.
+    :param hit: Whether the lookup was a hit.
+    """
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_session(used: bool):
+    """
+    Count a request's database session.
+
+    :param used: Whether the request ran anything on the session.
+    """
+    DB_SESSIONS.labels("true" if used else "false").inc()
+
+
+def track_background_job(func):
+    """
+    Wrap a background task so it is counted in the pending-jobs backlog.
+
+    The gauge is incremented when the task is scheduled and decremented
+    once it finishes.
+
+    :param func: Sync or async callable passed to ``BackgroundTasks``.
+    :return: Async wrapper around ``func``.
+    """
+    BACKGROUND_JOBS.inc()
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            BACKGROUND_JOBS.dec()
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(time.perf_counter() - context._metrics_started)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_database():
+    """
+    Register SQLAlchemy engine and pool listeners for every engine.
+
+    Listeners are attached to the ``Engine`` and ``Pool`` classes, so the
+    primary, replica and test engines are all covered.
+    """
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Pool, "checkout", _on_checkout)
+    event.listen(Pool, "checkin", _on_checkin)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, status codes and
+    in-flight requests.
+
+    Routes are labelled by their path template (``/api/contacts/{contact_id}``)
+    to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        """
+        Wrap an ASGI application.
+
+        :param app: The downstream ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            route = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set (as the ``serve`` entry point
+    does for multiple workers) the values of all worker processes are merged.
+
+    :return: Encoded metrics and their content type.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,200 @@
+"""
+Password hashing configuration and cost calibration.
+
+Hashing schemes and costs come from ``Settings``. The first scheme of
+``PASSWORD_SCHEMES`` hashes new passwords; the others are only verified,
+and such hashes are upgraded on the next successful login, as are hashes
+made with other costs.
+
+Pick costs hitting a target verification latency on this machine::
+
+    poetry run python -m src.services.passwords --scheme argon2 --target-ms 250
+
+and copy the printed settings into ``.env``.
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from src.conf.config import settings
+
+PASSWORD = "correct horse battery staple"
+
+
+def password_context(
+    schemes: list[str] = ("bcrypt",),
+    bcrypt_rounds: int = 12,
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    """
+    Build the passlib context hashing and verifying passwords.
+
+    Args:
+        schemes (list[str]): Supported schemes, the preferred one first.
+            Hashes of the other schemes are flagged by ``needs_update``.
+        bcrypt_rounds (int): bcrypt cost, the log2 of the iterations.
+        argon2_time_cost (int): argon2id passes over memory.
+        argon2_memory_cost (int): argon2id memory in KiB.
+        argon2_parallelism (int): argon2id lanes.
+
+    Returns:
+        CryptContext: The configured context.
+    """
+    options = {}
+    if "bcrypt" in schemes:
+        options["bcrypt__rounds"] = bcrypt_rounds
+    if "argon2" in schemes:
+        options.update(
+            argon2__type="ID",
+            argon2__time_cost=argon2_time_cost,
+            argon2__memory_cost=argon2_memory_cost,
+            argon2__parallelism=argon2_parallelism,
+        )
+    return CryptContext(schemes=list(schemes), deprecated="auto", **options)
+
+
+def settings_context() -> CryptContext:
+    """
+    Build the password context from ``Settings``.
+
+    Returns:
+        CryptContext: The configured context.
+    """
+    return password_context(
+        settings.PASSWORD_SCHEMES,
+        settings.BCRYPT_ROUNDS,
+        settings.ARGON2_TIME_COST,
+        settings.ARGON2_MEMORY_COST,
+        settings.ARGON2_PARALLELISM,
+    )
+
+
+def verify_ms(context: CryptContext, repeat: int = 3) -> float:
+    """
+    Median time to verify a password hashed by the context.
+
+    Args:
+        context (CryptContext): Context to measure.
+        repeat (int): Number of timed verifications.
+
+    Returns:
+        float: Latency in milliseconds.
+    """
+    hashed = context.hash(PASSWORD)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def calibrate_bcrypt(target_ms: float, repeat: int = 3) -> tuple[dict, float]:
+    """
+    Find the highest bcrypt cost verifying within the target latency.
+
+    Every extra round doubles the work, so the search stops at the first
+    cost over the target.
+
+    Args:
+        target_ms (float): Target verification latency in milliseconds.
+        repeat (int): Timed verifications per candidate.
+
+    Returns:
+        tuple[dict, float]: Settings and their measured latency.
+    """
+    best = {"BCRYPT_ROUNDS": 4}, verify_ms(password_context(bcrypt_rounds=4), repeat)
+    for rounds in range(5, 32):
+        latency = verify_ms(password_context(bcrypt_rounds=rounds), repeat)
+        if latency > target_ms:
+            break
+        best = ({"BCRYPT_ROUNDS": rounds}, latency)
+    return best
+
+
+def calibrate_argon2(
+    target_ms: float, memory_cost: int, parallelism: int, repeat: int = 3
+) -> tuple[dict, float]:
+    """
+    Find argon2id parameters verifying within the target latency.
+
+    Memory is the main defence against GPU attacks, so it is kept and the
+    number of passes raised while the target allows. If a single pass is
+    already too slow, memory is halved instead.
+
+    Args:
+        target_ms (float): Target verification latency in milliseconds.
+        memory_cost (int): Starting memory in KiB.
+        parallelism (int): argon2id lanes.
+        repeat (int): Timed verifications per candidate.
+
+    Returns:
+        tuple[dict, float]: Settings and their measured latency.
+    """
+
+    def measure(time_cost: int, memory: int) -> float:
+        context = password_context(
+            ["argon2"],
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory,
+            argon2_parallelism=parallelism,
+        )
+        return verify_ms(context, repeat)
+
+    memory = memory_cost
+    latency = measure(1, memory)
+    while latency > target_ms and memory > 8 * parallelism * 2:
+        memory //= 2
+        latency = measure(1, memory)
+
+    time_cost = 1
+    while True:
+        candidate = measure(time_cost + 1, memory)
+        if candidate > target_ms:
+            break
+        time_cost, latency = time_cost + 1, candidate
+    return (
+        {
+            "ARGON2_TIME_COST": time_cost,
+            "ARGON2_MEMORY_COST": memory,
+            "ARGON2_PARALLELISM": parallelism,
+        },
+        latency,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pick password hashing costs for a target verification latency."
+    )
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument(
+        "--memory-mib", type=int, default=64, help="Starting argon2id memory."
+    )
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        chosen, latency = calibrate_bcrypt(args.target_ms, args.repeat)
+        schemes = '["bcrypt"]'
+    else:
+        chosen, latency = calibrate_argon2(
+            args.target_ms, args.memory_mib * 1024, args.parallelism, args.repeat
+        )
+        schemes = '["argon2", "bcrypt"]'
+
+    print(f"# verify takes {latency:.0f} ms (target {args.target_ms:.0f} ms)")
+    print(f"PASSWORD_SCHEMES={schemes}")
+    for name, value in chosen.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.conf.config import settings
+
+slow_query_logger = logging.getLogger("slow_query")
+
+
+class QueryStats:
+    """
+    Number and total duration of SQL statements run in one unit of work.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        """
+        Total statement time in milliseconds.
+
+        :return: Accumulated duration.
+        """
+        return self.duration * 1000
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries():
+    """
+    Collect query statistics for statements executed inside the block.
+
+    Statistics follow the asyncio task (and the greenlets SQLAlchemy runs
+    in), so concurrent requests are accounted separately.
+
+    :return: Context manager yielding a :class:`QueryStats`.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def redact_parameters(parameters):
+    """
+    Replace bound parameter values with placeholders, keeping their shape.
+
+    :param parameters: Tuple, dict or a list of those (for executemany).
+    :return: Parameters with every value replaced by its type name.
+    """
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return [redact_parameters(item) for item in parameters]
+        return tuple(f"<{type(value).__name__}>" for value in parameters)
+    return parameters
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s parameters=%s",
+            elapsed * 1000,
+            statement,
+            redact_parameters(parameters),
+        )
+
+
+def instrument_query_stats():
+    """
+    Register the per-request accounting and slow query listeners on all
+    engines.
+    """
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware counting SQL statements per request.
+
+    In debug mode the totals are added to the response as
+    ``X-DB-Query-Count`` and ``X-DB-Query-Time-Ms`` headers.
+    """
+
+    def __init__(self, app):
+        """
+        Wrap an ASGI application.
+
+        :param app: The downstream ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DEBUG:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append(
+                        (b"x-db-query-time-ms", f"{stats.duration_ms:.2f}".encode())
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
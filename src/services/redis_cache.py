@@ -3,6 +3,7 @@ import json
 import redis.asyncio as redis
 
 from src.conf.config import settings
+from src.services.metrics import REDIS_LATENCY
 
 
 class RedisCache:
@@ -31,7 +32,8 @@ class RedisCache:
         :return: None
         """
         if self.redis:
-            await self.redis.set(key, json.dumps(value), ex=expire)
+            with REDIS_LATENCY.labels("set").time():
+                await self.redis.set(key, json.dumps(value), ex=expire)
 
     async def get(self, key: str):
         """
@@ -41,7 +43,8 @@ class RedisCache:
         :return: Retrieved value as dictionary if found, None otherwise
         """
         if self.redis:
-            data = await self.redis.get(key)
+            with REDIS_LATENCY.labels("get").time():
+                data = await self.redis.get(key)
             if data:
                 return json.loads(data)
         return None
@@ -54,7 +57,8 @@ class RedisCache:
         :return: None
         """
         if self.redis:
-            await self.redis.delete(key)
+            with REDIS_LATENCY.labels("delete").time():
+                await self.redis.delete(key)
 
 
 redis_cache = RedisCache()
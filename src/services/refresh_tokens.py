@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+from datetime import UTC, datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.database import AsyncSessionLocal
+from src.database.models import User
+from src.repository.refresh_tokens import RefreshTokenRepository
+from src.repository.user import UserRepository
+from src.services.metrics import TOKEN_REFRESHES
+from src.services.redis_cache import RedisCache, redis_cache
+
+logger = logging.getLogger(__name__)
+
+PRUNE_LOCK_KEY = "lock:refresh_token_prune"
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token for storage.
+
+    Refresh tokens are random 256-bit values, so a single SHA-256 is enough
+    and no password hashing is needed to check them.
+
+    :param token: The refresh token.
+    :return: Hex SHA-256 hash of the token.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive timestamp, as stored in the database.
+
+    :return: Current timestamp.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class RefreshTokenService:
+    """
+    Service issuing and rotating refresh tokens.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the RefreshTokenService with a database session.
+
+        :param db: Asynchronous database session.
+        """
+        self.repository = RefreshTokenRepository(db)
+        self.users = UserRepository(db)
+
+    async def issue(self, user_id: int, family: str | None = None) -> str:
+        """
+        Issue a refresh token.
+
+        :param user_id: Owner of the token.
+        :param family: Family of the rotated token; a new family is started
+            when omitted.
+        :return: The refresh token. Only its hash is stored.
+        """
+        token = secrets.token_urlsafe(32)
+        await self.repository.add(
+            user_id,
+            family or secrets.token_hex(16),
+            hash_refresh_token(token),
+            utcnow() + timedelta(seconds=settings.JWT_REFRESH_EXPIRATION_SECONDS),
+        )
+        return token
+
+    async def rotate(self, token: str) -> tuple[User, str]:
+        """
+        Exchange a refresh token for a new one of the same family.
+
+        A token that was already used has most likely been stolen, so the
+        whole family is revoked and both the thief and the legitimate
+        client have to log in again.
+
+        :param token: The presented refresh token.
+        :return: The owner of the token and the new refresh token.
+        :raises HTTPException: 401 if the token is unknown, expired, revoked
+            or reused.
+        """
+        now = utcnow()
+        stored = await self.repository.get_by_hash(hash_refresh_token(token))
+        if stored is None:
+            raise self._rejected("invalid")
+        if stored.revoked_at is not None or not await self.repository.mark_used(
+            stored.id, now
+        ):
+            await self.repository.revoke_family(stored.family, now)
+            raise self._rejected("reused")
+        if stored.expires_at <= now:
+            await self.repository.revoke_family(stored.family, now)
+            raise self._rejected("expired")
+
+        user = await self.users.get_user_by_id(stored.user_id)
+        if user is None or not user.is_verified:
+            await self.repository.revoke_family(stored.family, now)
+            raise self._rejected("invalid")
+
+        new_token = await self.issue(user.id, stored.family)
+        TOKEN_REFRESHES.labels("ok").inc()
+        return user, new_token
+
+    async def revoke(self, token: str, user_id: int) -> None:
+        """
+        Revoke the family of a refresh token, e.g. on logout.
+
+        Unknown tokens and tokens of other users are ignored.
+
+        :param token: The refresh token.
+        :param user_id: ID of the user logging out.
+        :return: None.
+        """
+        stored = await self.repository.get_by_hash(hash_refresh_token(token))
+        if stored is not None and stored.user_id == user_id:
+            await self.repository.revoke_family(stored.family, utcnow())
+
+    async def revoke_user(self, user_id: int) -> None:
+        """
+        Revoke every refresh token of a user, e.g. after a password reset.
+
+        :param user_id: ID of the user.
+        :return: None.
+        """
+        await self.repository.revoke_user(user_id, utcnow())
+
+    @staticmethod
+    def _rejected(result: str) -> HTTPException:
+        TOKEN_REFRESHES.labels(result).inc()
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+class RefreshTokenPruner:
+    """
+    Scheduled job deleting refresh tokens that expired more than the
+    retention window ago.
+
+    Every refresh stores a new token, so without pruning the table grows
+    with every refresh. Every worker runs the loop; with Redis, a lock held
+    for the whole interval lets only one of them prune per interval.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = redis_cache,
+        session_factory=AsyncSessionLocal,
+        retention_days: int = 7,
+        interval: int = 3600,
+    ):
+        """
+        Initialize the job.
+
+        :param cache: Holder of the shared Redis connection.
+        :param session_factory: Factory for database sessions.
+        :param retention_days: Days an expired token is kept.
+        :param interval: Seconds between runs.
+        """
+        self.cache = cache
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """
+        Prune the expired tokens, unless another worker just did.
+
+        :return: Number of tokens deleted.
+        """
+        redis = self.cache.redis
+        if redis is not None and not await redis.set(
+            PRUNE_LOCK_KEY, 1, nx=True, ex=self.interval
+        ):
+            return 0
+        before = utcnow() - timedelta(days=self.retention_days)
+        async with self.session_factory() as session:
+            pruned = await RefreshTokenRepository(session).prune_expired(before)
+        if pruned:
+            logger.info("Pruned %s expired refresh tokens", pruned)
+        return pruned
+
+    async def run_forever(self):
+        """
+        Run :meth:`run_once` every ``interval`` seconds until cancelled.
+        """
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Refresh token pruning failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """
+        Start the scheduling loop in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        """
+        Cancel the scheduling loop.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+refresh_token_pruner = RefreshTokenPruner(
+    retention_days=settings.REFRESH_TOKEN_RETENTION_DAYS,
+    interval=settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS,
+)
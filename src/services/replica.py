@@ -0,0 +1,217 @@
+import logging
+import time
+
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.database import ReplicaSessionLocal, get_db
+from src.schemas.users import Principal
+from src.services.auth import get_current_user
+from src.services.redis_cache import redis_cache
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read can be served by the replica.
+
+    Reads fall back to the primary when no replica is configured, when the
+    user wrote something within the read-your-writes window, or when the
+    replica is lagging or unreachable.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        max_lag: float = 5.0,
+        check_interval: float = 1.0,
+        retry_after: float = 30.0,
+        read_your_writes: float = 5.0,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            session_factory: Factory creating replica sessions, or None.
+            max_lag (float): Maximum tolerated replication lag in seconds.
+            check_interval (float): How often the lag is re-checked.
+            retry_after (float): How long an unreachable replica is skipped.
+            read_your_writes (float): Seconds after a write during which the
+                user's reads go to the primary.
+        """
+        self.session_factory = session_factory
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.read_your_writes = read_your_writes
+        self._recent_writes: dict[int, float] = {}
+        self._checked_at = 0.0
+        self._down_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether a replica is configured at all.
+
+        Returns:
+            bool: True if reads can be routed to a replica.
+        """
+        return self.session_factory is not None
+
+    async def record_write(self, user_id: int):
+        """
+        Pin the user's reads to the primary for the read-your-writes window.
+
+        The marker is kept locally and in Redis so that other workers see it.
+        Local markers are kept in deadline order, so expired ones are dropped
+        from the front as new writes come in.
+
+        Args:
+            user_id (int): ID of the user who wrote.
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self._recent_writes.pop(user_id, None)
+        self._recent_writes[user_id] = now + self.read_your_writes
+        expired = []
+        for writer, deadline in self._recent_writes.items():
+            if deadline > now:
+                break
+            expired.append(writer)
+        for writer in expired:
+            del self._recent_writes[writer]
+        await redis_cache.set(
+            f"rw:{user_id}", {"user_id": user_id}, expire=int(self.read_your_writes)
+        )
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        """
+        Check whether the user is inside the read-your-writes window.
+
+        Args:
+            user_id (int): ID of the user.
+
+        Returns:
+            bool: True if the user's reads must go to the primary.
+        """
+        deadline = self._recent_writes.get(user_id)
+        if deadline is not None:
+            if deadline > time.monotonic():
+                return True
+            del self._recent_writes[user_id]
+        return await redis_cache.get(f"rw:{user_id}") is not None
+
+    async def _is_healthy(self, session: AsyncSession) -> bool:
+        """
+        Check replication lag, at most once per ``check_interval``.
+
+        Args:
+            session (AsyncSession): Freshly opened replica session.
+
+        Returns:
+            bool: True if the replica may serve reads.
+        """
+        now = time.monotonic()
+        if now < self._down_until:
+            return False
+        if now - self._checked_at < self.check_interval:
+            return True
+        try:
+            result = await session.execute(REPLICA_LAG_QUERY)
+            lag = float(result.scalar() or 0)
+        except Exception as e:
+            self.mark_down(e)
+            return False
+        if lag > self.max_lag:
+            logging.warning(f"Replica lag {lag:.1f}s, falling back to primary")
+            return False
+        self._checked_at = now
+        return True
+
+    def mark_down(self, error: Exception):
+        """
+        Skip the replica for ``retry_after`` seconds after a failure.
+
+        Args:
+            error (Exception): The error raised by the replica.
+        """
+        logging.error(f"Replica unavailable, falling back to primary: {error}")
+        self._down_until = time.monotonic() + self.retry_after
+
+    async def open_session(self, user_id: int) -> AsyncSession | None:
+        """
+        Open a replica session for the user's read, if allowed.
+
+        The session's connection is checked out right away, so a replica
+        that failed since the last health check is caught here rather than
+        in the middle of the request.
+
+        Args:
+            user_id (int): ID of the reading user.
+
+        Returns:
+            AsyncSession | None: A replica session, or None to use the primary.
+        """
+        if not self.enabled or time.monotonic() < self._down_until:
+            return None
+        if await self.wrote_recently(user_id):
+            return None
+        session = self.session_factory()
+        if await self._is_healthy(session):
+            try:
+                await session.connection()
+                return session
+            except (DBAPIError, OSError) as e:
+                self.mark_down(e)
+        await session.close()
+        return None
+
+
+replica_router = ReplicaRouter(
+    ReplicaSessionLocal,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
+    read_your_writes=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+
+async def get_read_db(
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncSession:
+    """
+    Dependency providing a read-only session for GET endpoints.
+
+    Yields a replica session when the replica is healthy and the user has
+    not written recently, otherwise the primary session from ``get_db``.
+    A replica connection lost during the request marks the replica down, so
+    the following reads go to the primary.
+
+    Args:
+        user (Principal): The authenticated user.
+        db (AsyncSession): Primary database session used as a fallback.
+
+    Yields:
+        AsyncSession: Session to run read queries on.
+    """
+    session = await replica_router.open_session(user.id)
+    if session is None:
+        yield db
+        return
+    async with session:
+        try:
+            yield session
+        except DBAPIError as e:
+            if e.connection_invalidated:
+                replica_router.mark_down(e)
+            raise
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.services.metrics import REVOCATION_CHECKS
+from src.services.redis_cache import RedisCache, redis_cache
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "revoked_jti"
+CHANNEL = "revoked_jti"
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def user_entry(user_id: int, token_version: int) -> str:
+    """
+    Revocation entry covering every access token of one token version.
+
+    Args:
+        user_id (int): Owner of the tokens.
+        token_version (int): Revoked ``token_version`` claim.
+
+    Returns:
+        str: Entry of the revocation list.
+    """
+    return f"user:{user_id}:{token_version}"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Answers "definitely not added" without false negatives, and "maybe
+    added" with a false-positive rate of about ``error_rate`` while it holds
+    at most ``capacity`` items.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Allocate the bit array.
+
+        Args:
+            capacity (int): Expected number of items.
+            error_rate (float): Target false-positive rate.
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str):
+        """
+        Add an item.
+
+        Args:
+            item (str): Item to add.
+        """
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Revoked access tokens, checked without network I/O in the common case.
+
+    Revoked ``jti`` claims and ``user:{uid}:{token_version}`` entries are
+    kept in the ``revoked_jti`` sorted set, scored by the time the last
+    token they cover expires. Every worker mirrors the set into a local
+    Bloom filter, kept current through the ``revoked_jti`` pub/sub channel
+    and rebuilt periodically to drop expired entries. A token missing from
+    the filter is not revoked; only filter hits are confirmed in Redis.
+    Without Redis, revocations apply within the process only.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = redis_cache,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        rebuild_interval: float = 300.0,
+    ):
+        """
+        Initialize the revocation list.
+
+        Args:
+            cache (RedisCache): Holder of the shared Redis connection.
+            capacity (int): Revoked entries the filter is sized for.
+            error_rate (float): Target false-positive rate of the filter.
+            rebuild_interval (float): Seconds between filter rebuilds.
+        """
+        self.cache = cache
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._local: dict[str, float] = {}
+        self._listener: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._synced: asyncio.Event | None = None
+
+    async def revoke(self, entry: str, expires_at: float):
+        """
+        Revoke an entry on all workers until it expires.
+
+        Args:
+            entry (str): ``jti`` claim or :func:`user_entry`.
+            expires_at (float): UNIX time after which the entry is useless
+                because every token it covers has expired.
+        """
+        self._filter.add(entry)
+        redis = self.cache.redis
+        if redis is None:
+            now = time.time()
+            self._local = {
+                key: until for key, until in self._local.items() if until > now
+            }
+            self._local[entry] = expires_at
+            return
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(REVOKED_KEY, {entry: expires_at})
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+            pipe.publish(CHANNEL, entry)
+            await pipe.execute()
+
+    async def is_revoked(self, *entries: str) -> bool:
+        """
+        Check whether any of the entries of a token is revoked.
+
+        Args:
+            *entries (str): The token's ``jti`` and :func:`user_entry`.
+
+        Returns:
+            bool: True if the token must be rejected.
+        """
+        await self._ensure_synced()
+        candidates = [entry for entry in entries if entry in self._filter]
+        if not candidates:
+            REVOCATION_CHECKS.labels("miss").inc()
+            return False
+
+        now = time.time()
+        redis = self.cache.redis
+        if redis is None:
+            scores = [self._local.get(entry) for entry in candidates]
+        else:
+            try:
+                scores = await redis.zmscore(REVOKED_KEY, candidates)
+            except RedisError as error:
+                logger.warning("Could not confirm token revocation: %s", error)
+                scores = [now + 1]
+        if any(score is not None and score > now for score in scores):
+            REVOCATION_CHECKS.labels("revoked").inc()
+            return True
+        REVOCATION_CHECKS.labels("false_positive").inc()
+        return False
+
+    async def _ensure_synced(self):
+        if self.cache.redis is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._loop is not loop:
+            self._loop = loop
+            self._synced = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        if not self._synced.is_set():
+            await self._synced.wait()
+
+    async def _rebuild(self):
+        now = time.time()
+        entries = await self.cache.redis.zrangebyscore(REVOKED_KEY, now, "+inf")
+        bloom = BloomFilter(max(self.capacity, len(entries)), self.error_rate)
+        for entry in entries:
+            bloom.add(_decode(entry))
+        self._filter = bloom
+
+    async def _listen(self):
+        """
+        Add revocations published by any worker to the local filter.
+
+        The channel is subscribed before the set is loaded, so nothing
+        published in between is missed.
+        """
+        while True:
+            try:
+                pubsub = self.cache.redis.pubsub()
+                await pubsub.subscribe(CHANNEL)
+                try:
+                    await self._rebuild()
+                    self._synced.set()
+                    rebuilt = time.monotonic()
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None:
+                            self._filter.add(_decode(message["data"]))
+                        if time.monotonic() - rebuilt >= self.rebuild_interval:
+                            await self._rebuild()
+                            rebuilt = time.monotonic()
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.warning("Token revocation listener failed: %s", error)
+                # Fail open rather than block every request on Redis.
+                self._synced.set()
+                await asyncio.sleep(1)
+
+    async def close(self):
+        """
+        Stop the pub/sub listener.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+revocation_list = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_ERROR_RATE,
+    rebuild_interval=settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from src.conf.config import settings
+from src.database.database import AsyncSessionLocal
+from src.repository.contacts import ContactRepository
+from src.services.redis_cache import RedisCache, redis_cache
+from src.services.refresh_tokens import utcnow
+
+logger = logging.getLogger(__name__)
+
+PRUNE_LOCK_KEY = "lock:tombstone_prune"
+
+
+class TombstonePruner:
+    """
+    Scheduled job deleting contact tombstones older than the retention
+    window.
+
+    Delta-sync tokens from before the window are answered with a full
+    resync, so the tombstones are no longer needed. Every worker runs the
+    loop; with Redis, a lock held for the whole interval lets only one of
+    them prune per interval.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = redis_cache,
+        session_factory=AsyncSessionLocal,
+        retention_days: int = 30,
+        interval: int = 3600,
+    ):
+        """
+        Initialize the job.
+
+        :param cache: Holder of the shared Redis connection.
+        :param session_factory: Factory for database sessions.
+        :param retention_days: Days a tombstone is kept.
+        :param interval: Seconds between runs.
+        """
+        self.cache = cache
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """
+        Prune the expired tombstones, unless another worker just did.
+
+        :return: Number of tombstones deleted.
+        """
+        redis = self.cache.redis
+        if redis is not None and not await redis.set(
+            PRUNE_LOCK_KEY, 1, nx=True, ex=self.interval
+        ):
+            return 0
+        before = utcnow() - timedelta(days=self.retention_days)
+        async with self.session_factory() as session:
+            pruned = await ContactRepository(session).prune_tombstones(before)
+        if pruned:
+            logger.info("Pruned %s contact tombstones", pruned)
+        return pruned
+
+    async def run_forever(self):
+        """
+        Run :meth:`run_once` every ``interval`` seconds until cancelled.
+        """
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Tombstone pruning failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """
+        Start the scheduling loop in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        """
+        Cancel the scheduling loop.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+tombstone_pruner = TombstonePruner(
+    retention_days=settings.CONTACT_TOMBSTONE_RETENTION_DAYS,
+    interval=settings.TOMBSTONE_PRUNE_INTERVAL_SECONDS,
+)
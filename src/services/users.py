@@ -89,3 +89,23 @@ class UserService:
         :return: Updated user object.
         """
         return await self.repository.reset_password(user_id, password)
+
+    async def update_password_hash(self, user_id: int, old_hash: str, new_hash: str):
+        """
+        Replace a password hash unless the password changed meanwhile.
+
+        :param user_id: ID of the user.
+        :param old_hash: Hash the new one was derived from.
+        :param new_hash: Hash of the same password with current settings.
+        :return: True if the hash was replaced.
+        """
+        return await self.repository.update_password_hash(user_id, old_hash, new_hash)
+
+    async def increment_token_version(self, user_id: int):
+        """
+        Increment a user's token version, invalidating the tokens issued so far.
+
+        :param user_id: ID of the user.
+        :return: The new token version, or None if the user does not exist.
+        """
+        return await self.repository.increment_token_version(user_id)
@@ -1,4 +1,9 @@
 import asyncio
+import os
+
+# Production bcrypt cost makes every login and fixture hash take ~250 ms;
+# set before the app (and its settings) is imported.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
 import pytest
 import pytest_asyncio
@@ -7,7 +12,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from main import app
-from src.database.database import get_db
+from src.database.database import get_db, lazy_session
 from src.database.models import Base, User
 from src.services.auth import Hash, create_access_token
 
@@ -56,7 +61,7 @@ def init_models_wrap():
 def client():
 
     async def override_get_db():
-        async with TestingSessionLocal() as session:
+        async with lazy_session(TestingSessionLocal) as session:
             try:
                 yield session
             except Exception as err:
@@ -71,7 +76,13 @@ def client():
 @pytest_asyncio.fixture()
 async def get_token():
     token = await create_access_token(
-        data={"sub": test_user["username"], "role": "admin"}
+        data={
+            "sub": test_user["username"],
+            "uid": 1,
+            "role": "admin",
+            "tz": "UTC",
+            "token_version": 0,
+        }
     )
     return token
 
@@ -92,3 +103,22 @@ async def get_reset_token(test_user):
     """Генерує токен для скидання пароля."""
     reset_token = await create_access_token(data={"sub": test_user["email"]})
     return reset_token
+
+
+@pytest.fixture()
+def query_budget(monkeypatch):
+    """Enables per-request query headers and returns a budget assertion.
+
+    Usage: ``query_budget(response, 2)`` fails if the request that produced
+    ``response`` ran more than two SQL statements.
+    """
+    monkeypatch.setattr("src.services.query_stats.settings.DEBUG", True)
+
+    def assert_budget(response, budget: int):
+        count = int(response.headers["x-db-query-count"])
+        assert count <= budget, (
+            f"{response.request.method} {response.request.url.path} ran "
+            f"{count} SQL statements, budget is {budget}"
+        )
+
+    return assert_budget
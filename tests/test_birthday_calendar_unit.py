@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import select
+
+from src.database.models import Contact, User
+from src.repository.contacts import ContactRepository
+from src.services.birthdays import (
+    BirthdayCalendar,
+    BirthdayJob,
+    build_calendar,
+    local_today,
+    next_birthday,
+)
+from src.services.redis_cache import RedisCache
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def calendar():
+    """Fixture for a birthday calendar backed by fakeredis."""
+    cache = RedisCache()
+    cache.redis = FakeAsyncRedis()
+    yield BirthdayCalendar(cache, ttl=3600)
+    await cache.redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def user_with_contacts():
+    """Fixture giving the test user three contacts with known birthdays."""
+    async with TestingSessionLocal() as session:
+        user = (await session.execute(select(User))).scalars().first()
+        for index, birthday in enumerate(
+            [date(1990, 3, 2), date(1985, 3, 10), date(2000, 2, 29)]
+        ):
+            session.add(
+                Contact(
+                    name=f"Calendar{index}",
+                    surname="Doe",
+                    email=f"calendar{index}@example.com",
+                    phone=f"+38050333000{index}",
+                    birthday=birthday,
+                    user_id=user.id,
+                )
+            )
+        await session.commit()
+        yield user
+        for contact in await ContactRepository(session).get_all_contacts(user):
+            await session.delete(contact)
+        await session.commit()
+
+
+def test_next_birthday_wraps_and_handles_leap_day():
+    assert next_birthday(date(1990, 3, 2), date(2027, 3, 1)) == date(2027, 3, 2)
+    assert next_birthday(date(1990, 3, 2), date(2027, 3, 3)) == date(2028, 3, 2)
+    assert next_birthday(date(2000, 2, 29), date(2027, 1, 1)) == date(2027, 2, 28)
+    assert next_birthday(date(2000, 2, 29), date(2028, 1, 1)) == date(2028, 2, 29)
+
+
+def test_local_today_uses_user_timezone():
+    now = datetime(2027, 1, 1, 22, 30, tzinfo=timezone.utc)
+    assert local_today("UTC", now) == date(2027, 1, 1)
+    assert local_today("Europe/Kyiv", now) == date(2027, 1, 2)
+    assert local_today("Not/AZone", now) == date(2027, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_calendar_reads_a_range_until_invalidated(calendar, user_with_contacts):
+    today = date(2027, 2, 27)
+    async with TestingSessionLocal() as session:
+        contacts = await ContactRepository(session).get_all_contacts(user_with_contacts)
+    entries = build_calendar(contacts, today)
+    user_id = user_with_contacts.id
+
+    assert await calendar.read(user_id, today, 7) is None
+    assert await calendar.store(user_id, today, entries, None)
+
+    week = await calendar.read(user_id, today, 7)
+    assert [contact.name for contact in week] == ["Calendar2", "Calendar0"]
+    assert await calendar.read(user_id, date(2027, 3, 1), 7) is not None
+    # Beyond the day the calendar was built for plus its horizon.
+    assert await calendar.read(user_id, date(2028, 2, 27), 7) is None
+
+    generation = await calendar.generation(user_id)
+    await calendar.invalidate(user_id)
+    assert await calendar.read(user_id, today, 7) is None
+    # A calendar computed before the invalidation is not stored.
+    assert not await calendar.store(user_id, today, entries, generation)
+
+
+@pytest.mark.asyncio
+async def test_job_builds_each_timezone_once_per_day(calendar, user_with_contacts):
+    job = BirthdayJob(calendar, TestingSessionLocal, chunk_size=1, digest=True)
+    job._send_digest = AsyncMock()
+    now = datetime(2027, 2, 27, 0, 5, tzinfo=timezone.utc)
+
+    assert await job.run_once(now) == 1
+    assert await job.run_once(now) == 0
+
+    week = await calendar.read(user_with_contacts.id, date(2027, 2, 27), 7)
+    assert [contact.name for contact in week] == ["Calendar2", "Calendar0"]
+    job._send_digest.assert_awaited_once()
+    digest = job._send_digest.await_args.args[1]
+    assert [entry["date"] for entry in digest] == ["2027-02-28", "2027-03-02"]
+
+
+@pytest.mark.asyncio
+async def test_job_sends_one_digest_per_week(calendar, user_with_contacts):
+    job = BirthdayJob(calendar, TestingSessionLocal, digest=True)
+    job._send_digest = AsyncMock()
+    # Monday 2027-02-22 starts an ISO week with birthdays ahead every day.
+    monday = datetime(2027, 2, 22, 0, 5, tzinfo=timezone.utc)
+
+    for offset in range(7):
+        await job.run_once(monday + timedelta(days=offset))
+    assert job._send_digest.await_count == 1
+
+    await job.run_once(monday + timedelta(days=7))
+    assert job._send_digest.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sql_fallback_uses_the_user_local_date():
+    calendar = BirthdayCalendar(RedisCache())
+    repository = SimpleNamespace(get_upcoming_birthdays=AsyncMock(return_value=[]))
+    user = SimpleNamespace(id=1, timezone="Pacific/Kiritimati")
+
+    with patch(
+        "src.services.birthdays.local_today", return_value=date(2027, 1, 2)
+    ) as today:
+        await calendar.upcoming(user, 7, repository)
+
+    today.assert_called_once_with("Pacific/Kiritimati")
+    repository.get_upcoming_birthdays.assert_awaited_once_with(
+        7, user, date(2027, 1, 2)
+    )
@@ -0,0 +1,161 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.services.compression import (
+    CompressionMiddleware,
+    available_encoders,
+    negotiate,
+)
+
+PAYLOAD = [
+    {"id": i, "name": "Olena", "email": f"olena{i}@example.com"} for i in range(200)
+]
+
+
+async def large(request):
+    return JSONResponse(PAYLOAD)
+
+
+async def small(request):
+    return JSONResponse({"id": 1})
+
+
+async def image(request):
+    return PlainTextResponse("x" * 5000, media_type="image/png")
+
+
+async def export(request):
+    async def lines():
+        for row in PAYLOAD:
+            yield json.dumps(row) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+app = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/image", image),
+            Route("/export", export),
+        ]
+    ),
+    minimum_size=500,
+    content_types=["application/json", "application/x-ndjson"],
+)
+
+
+async def call(path: str, accept_encoding: str) -> list[dict]:
+    """Run a GET request through the middleware, returning the sent messages."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is sent.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+def headers(messages) -> dict:
+    return {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+
+
+def body(messages) -> bytes:
+    return b"".join(message.get("body", b"") for message in messages[1:])
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip;q=0, identity", None),
+        ("*", "zstd"),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped():
+    messages = await call("/large", "gzip")
+
+    assert headers(messages)["content-encoding"] == "gzip"
+    assert headers(messages)["vary"] == "Accept-Encoding"
+    assert int(headers(messages)["content-length"]) == len(body(messages))
+    assert json.loads(gzip.decompress(body(messages))) == PAYLOAD
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/small", "/image"])
+async def test_small_or_binary_responses_are_not_compressed(path):
+    messages = await call(path, "gzip")
+
+    assert "content-encoding" not in headers(messages)
+
+
+@pytest.mark.asyncio
+async def test_without_accept_encoding_nothing_changes():
+    messages = await call("/large", "identity")
+
+    assert "content-encoding" not in headers(messages)
+    assert json.loads(body(messages)) == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_streaming_is_compressed_chunk_by_chunk():
+    messages = await call("/export", "gzip")
+
+    assert headers(messages)["content-encoding"] == "gzip"
+    assert "content-length" not in headers(messages)
+    # Every chunk is flushed, so it can be decoded before the stream ends.
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    first = decoder.decompress(messages[1]["body"])
+    assert json.loads(first) == PAYLOAD[0]
+    assert len(messages) == len(PAYLOAD) + 2
+    lines = gzip.decompress(body(messages)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == PAYLOAD
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coding", ["br", "zstd"])
+async def test_optional_codings(coding):
+    if coding not in available_encoders():
+        pytest.skip(f"{coding} support is not installed")
+    messages = await call("/export", coding)
+
+    assert headers(messages)["content-encoding"] == coding
+    if coding == "br":
+        import brotli
+
+        data = brotli.decompress(body(messages))
+    else:
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(body(messages))
+    assert [json.loads(line) for line in data.decode().splitlines()] == PAYLOAD
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeAsyncRedis
+
+from src.services.contact_events import ContactEventBus
+from src.services.redis_cache import RedisCache
+
+
+@pytest_asyncio.fixture
+async def bus():
+    """Fixture for an event bus backed by fakeredis."""
+    cache = RedisCache()
+    cache.redis = FakeAsyncRedis()
+    bus = ContactEventBus(cache, queue_size=2, heartbeat=0.05, stream_maxlen=100)
+    yield bus
+    await bus.close()
+
+
+async def next_message(stream, timeout: float = 2.0) -> str:
+    return await asyncio.wait_for(stream.__anext__(), timeout)
+
+
+async def next_event(stream, timeout: float = 2.0) -> str:
+    async def skip_pings() -> str:
+        message = await next_message(stream)
+        while message.startswith(":"):
+            message = await next_message(stream)
+        return message
+
+    return await asyncio.wait_for(skip_pings(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_events_are_delivered_to_the_owner_only(bus):
+    """Published events reach the owner's stream, not other users'."""
+    stream = bus.stream(user_id=1)
+    other = bus.stream(user_id=2)
+    assert (await next_message(stream)).startswith("retry:")
+    await next_message(other)
+
+    await bus.publish(1, "created", contact_id=7, version=3)
+
+    message = await next_event(stream)
+    assert "event: created" in message
+    assert '"contact_id": 7' in message
+    assert (await next_message(other, timeout=0.5)) == ": ping\n\n"
+    await stream.aclose()
+    await other.aclose()
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_missed_events(bus):
+    """Last-Event-ID replays events published while disconnected."""
+    await bus.publish(1, "created", contact_id=1, version=1)
+    first_id = (await bus.cache.redis.xrange("contact_events:1"))[0][0].decode()
+    await bus.publish(1, "updated", contact_id=1, version=2)
+    await bus.publish(1, "deleted", contact_id=1, version=3)
+
+    stream = bus.stream(user_id=1, last_event_id=first_id)
+    await next_message(stream)
+    assert "event: updated" in await next_message(stream)
+    assert "event: deleted" in await next_message(stream)
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_resume_from_unknown_id_requests_resync(bus):
+    """A Last-Event-ID older than the retained stream asks for a resync."""
+    await bus.publish(1, "created", contact_id=1, version=1)
+
+    stream = bus.stream(user_id=1, last_event_id="1-0")
+    await next_message(stream)
+    assert (await next_message(stream)).startswith("event: resync")
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_stream_needs_no_resync_when_nothing_was_missed(bus):
+    """After the stream expires, only clients behind the last event resync."""
+    await bus.publish(1, "created", contact_id=1, version=1)
+    last_id = (await bus.cache.redis.xrange("contact_events:1"))[0][0].decode()
+    await bus.cache.redis.delete("contact_events:1")
+
+    stream = bus.stream(user_id=1, last_event_id=last_id)
+    await next_message(stream)
+    assert (await next_message(stream)) == ": ping\n\n"
+    await stream.aclose()
+
+    stream = bus.stream(user_id=1, last_event_id="1-0")
+    await next_message(stream)
+    assert (await next_message(stream)).startswith("event: resync")
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_live_events_are_not_dropped(bus):
+    """Events from several workers may arrive out of stream order."""
+    await bus.publish(1, "created", contact_id=1, version=1)
+    await bus.publish(1, "updated", contact_id=1, version=2)
+    entries = await bus.cache.redis.xrange("contact_events:1")
+    first_id, replayed_id = (entry_id.decode() for entry_id, _ in entries)
+    millis = int(replayed_id.split("-")[0]) + 1
+
+    stream = bus.stream(user_id=1, last_event_id=first_id)
+    await next_message(stream)
+    assert f"id: {replayed_id}" in await next_message(stream)
+
+    def deliver(event_id: str):
+        bus._dispatch(
+            {"id": event_id, "user_id": 1, "type": "updated", "contact_id": 1, "version": 3}
+        )
+
+    deliver(replayed_id)
+    deliver(f"{millis}-2")
+    assert f"id: {millis}-2" in await next_event(stream)
+    deliver(f"{millis}-1")
+    assert f"id: {millis}-1" in await next_event(stream)
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_worker_subscribes_only_to_local_users(bus):
+    """Channels follow the users with a local connection."""
+    stream = bus.stream(user_id=1)
+    await next_message(stream)
+    assert set(bus._pubsub.channels) == {b"contact_events:1"}
+
+    await stream.aclose()
+    for _ in range(50):
+        if not bus._pubsub.channels:
+            break
+        await asyncio.sleep(0.05)
+    assert not bus._pubsub.channels
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected(bus):
+    """A full buffer ends the stream instead of growing without bound."""
+    stream = bus.stream(user_id=1)
+    await next_message(stream)
+    subscription = next(iter(bus._subscriptions[1]))
+    for version in range(5):
+        subscription.deliver(
+            {"id": f"1-{version}", "type": "updated", "contact_id": 1, "version": version}
+        )
+
+    with pytest.raises(StopAsyncIteration):
+        await next_message(stream)
+    assert 1 not in bus._subscriptions
+
+
+@pytest.mark.asyncio
+async def test_without_redis_events_stay_local():
+    """Without Redis, events are delivered within the process."""
+    bus = ContactEventBus(RedisCache(), heartbeat=1)
+    stream = bus.stream(user_id=1)
+    await next_message(stream)
+
+    await bus.publish(1, "deleted", contact_id=4, version=9)
+
+    assert "event: deleted" in await next_message(stream)
+    await stream.aclose()
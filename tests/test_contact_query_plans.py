@@ -0,0 +1,228 @@
+"""
+Query-plan regression tests for the contacts repository.
+
+Every repository query is run against a seeded database, the SQL it emits is
+captured and ``EXPLAIN``-ed, and the test fails if the plan scans the whole
+``contacts`` table (or, when it is hash-partitioned, more than one
+partition). SQLite is used as a stand-in by default; point
+``QUERY_PLAN_DATABASE_URL`` at a throwaway Postgres database (its tables are
+dropped and recreated) to check the real planner.
+"""
+
+import asyncio
+import json
+import os
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from benchmarks.dataset import load_dataset
+from src.database.models import Base, Contact, User
+from src.repository.contacts import SORT_COLUMNS, ContactRepository
+from src.schemas.contacts import ContactModel
+
+# Sequential scans are only a problem once the table is big enough for an
+# index to pay off; the seeded table is always above this size.
+SEQ_SCAN_ROW_THRESHOLD = 1000
+USERS = 20
+CONTACTS_PER_USER = 250
+
+SQLITE_FULL_SCAN = re.compile(r"^SCAN contacts\b")
+CONTACTS_TABLE = re.compile(r"\bcontacts\b")
+
+
+@pytest.fixture(scope="module")
+def plan_database_url(tmp_path_factory):
+    """Fixture for a database seeded with ``USERS * CONTACTS_PER_USER`` contacts."""
+    url = os.environ.get("QUERY_PLAN_DATABASE_URL") or (
+        f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    )
+
+    async def seed():
+        engine = create_async_engine(url, poolclass=NullPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await load_dataset(
+            engine,
+            users=USERS,
+            contacts_per_user=CONTACTS_PER_USER,
+            seed=7,
+            tags_per_user=20,
+        )
+        async with engine.begin() as conn:
+            await conn.execute(text("ANALYZE"))
+        await engine.dispose()
+
+    asyncio.run(seed())
+    return url
+
+
+async def explain(conn, statement, parameters) -> list[str]:
+    """Return the full-table scans on ``contacts`` in the plan of a statement."""
+    if conn.dialect.name == "postgresql":
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        scans = []
+        partitions = set()
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            relation = node.get("Relation Name", "")
+            if relation.startswith("contacts_h"):
+                partitions.add(relation)
+            if node["Node Type"] == "Seq Scan" and relation.startswith("contacts"):
+                scans.append(f"Seq Scan on {relation} (rows={node['Plan Rows']})")
+            nodes.extend(node.get("Plans", []))
+        if len(partitions) > 1:
+            scans.append(f"{len(partitions)} partitions scanned")
+        return scans
+
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[3] for row in result if SQLITE_FULL_SCAN.match(row[3])]
+
+
+def run_and_explain(url, call) -> tuple[int, list[tuple[str, list[str]]]]:
+    """
+    Run a repository call, then EXPLAIN every contacts statement it emitted.
+
+    Returns the contacts row count and ``(statement, full scans)`` pairs.
+    """
+
+    async def main():
+        engine = create_async_engine(url, poolclass=NullPool)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            keyword = statement.lstrip().split(None, 1)[0].upper()
+            if (
+                not executemany
+                and keyword in ("SELECT", "UPDATE", "DELETE")
+                and CONTACTS_TABLE.search(statement)
+            ):
+                statements.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            await call(ContactRepository(session))
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        plans = []
+        async with engine.connect() as conn:
+            rows = await conn.scalar(select(func.count()).select_from(Contact))
+            for statement, parameters in statements:
+                plans.append((statement, await explain(conn, statement, parameters)))
+        await engine.dispose()
+        return rows, plans
+
+    return asyncio.run(main())
+
+
+user = User(id=3, username="user3")
+first_contact_id = (user.id - 1) * CONTACTS_PER_USER + 1
+
+QUERIES = {
+    "get_contacts": lambda repo: repo.get_contacts(None, None, None, 0, 10, user),
+    "get_contacts_filtered": lambda repo: repo.get_contacts(
+        "ol", "ko", "gmail", 0, 10, user
+    ),
+    "count_contacts_filtered": lambda repo: repo.count_contacts(
+        "ol", None, None, user
+    ),
+    "get_contacts_by_name": lambda repo: repo.get_contacts(
+        None, None, None, 0, 10, user, sort="name"
+    ),
+    "get_contacts_by_surname_desc": lambda repo: repo.get_contacts(
+        None, None, None, 0, 10, user, sort="-surname"
+    ),
+    "get_contacts_by_birthday": lambda repo: repo.get_contacts(
+        None, None, None, 0, 10, user, sort="birthday"
+    ),
+    "get_contact_fields": lambda repo: repo.get_contact_fields(
+        ("name", "email", "tags", "id"), None, None, None, 0, 10, user, sort="email"
+    ),
+    "get_contacts_any_tag": lambda repo: repo.get_contacts(
+        None, None, None, 0, 10, user, ["tag0001", "tag0005"]
+    ),
+    "get_contacts_all_tags": lambda repo: repo.get_contacts(
+        None, None, None, 0, 10, user, ["tag0000", "tag0001"], "all"
+    ),
+    "get_contact_by_id": lambda repo: repo.get_contact_by_id(first_contact_id, user),
+    "get_duplicate_keys": lambda repo: repo.get_duplicate_keys(
+        "name_key", None, 100, user
+    ),
+    "get_contacts_by_keys": lambda repo: repo.get_contacts_by_keys(
+        "email_key", ["nobody@example.com"], user
+    ),
+    "suggest_contacts": lambda repo: repo.suggest_contacts("ol", 10, user),
+    "get_contact_by_phone": lambda repo: repo.get_contact_by_phone(
+        "+10000000000", user
+    ),
+    "is_contact_exists": lambda repo: repo.is_contact_exists(
+        "nobody@example.com", "+10000000000", user
+    ),
+    "get_upcoming_birthdays": lambda repo: repo.get_upcoming_birthdays(7, user),
+    "update_contact": lambda repo: repo.update_contact(
+        first_contact_id + 1,
+        ContactModel(
+            name="Plan",
+            surname="Check",
+            email="plan.check@example.com",
+            phone="+10000000001",
+            birthday=date(1990, 1, 1),
+        ),
+        user,
+    ),
+    "remove_contact": lambda repo: repo.remove_contact(first_contact_id + 2, user),
+    "get_changes": lambda repo: repo.get_changes(first_contact_id, 100, user),
+}
+
+
+@pytest.mark.parametrize("query", QUERIES.values(), ids=QUERIES.keys())
+def test_no_sequential_scan_on_contacts(plan_database_url, query):
+    """Repository queries use an index instead of scanning all contacts."""
+    rows, plans = run_and_explain(plan_database_url, query)
+
+    assert plans, "the query did not touch the contacts table"
+    assert rows > SEQ_SCAN_ROW_THRESHOLD
+    for statement, scans in plans:
+        assert not scans, f"{scans} in plan for: {statement}"
+        # Required for partition pruning on user_id.
+        assert "contacts.user_id =" in statement, statement
+
+
+@pytest.mark.parametrize("sort", [*SORT_COLUMNS, *(f"-{key}" for key in SORT_COLUMNS)])
+def test_sort_uses_index(plan_database_url, sort):
+    """Every list sort order is read from an index instead of sorted."""
+
+    async def main():
+        engine = create_async_engine(plan_database_url, poolclass=NullPool)
+        query = ContactRepository._sorted(
+            ContactRepository._filtered(None, None, None, user), sort
+        ).limit(10)
+        statement = str(
+            query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+        )
+        async with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}")
+                plan = [row[0] for row in result]
+                sorts = [line for line in plan if "Sort" in line]
+            else:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}")
+                plan = [row[3] for row in result]
+                sorts = [line for line in plan if "TEMP B-TREE" in line]
+        await engine.dispose()
+        return plan, sorts
+
+    plan, sorts = asyncio.run(main())
+    assert not sorts, plan
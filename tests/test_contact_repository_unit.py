@@ -1,3 +1,4 @@
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -100,7 +101,12 @@ async def test_update_contact(contact_repository, mock_session, user):
         birthday="1990-01-01",
     )
     existing_contact = Contact(
-        id=1, name="Old Name", surname="Old Surname", email="old@example.com", user=user
+        id=1,
+        name="Old Name",
+        surname="Old Surname",
+        email="old@example.com",
+        birthday=date(1985, 6, 1),
+        user=user,
     )
 
     mock_result = MagicMock()
@@ -124,7 +130,12 @@ async def test_update_contact(contact_repository, mock_session, user):
 async def test_remove_contact(contact_repository, mock_session, user):
     """Test removing a contact."""
     existing_contact = Contact(
-        id=1, name="To Delete", surname="Person", email="delete@example.com", user=user
+        id=1,
+        name="To Delete",
+        surname="Person",
+        email="delete@example.com",
+        birthday=date(1990, 1, 1),
+        user=user,
     )
 
     mock_result = MagicMock()
@@ -0,0 +1,148 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.duplicates import (
+    DisjointSet,
+    DuplicateFinder,
+    blocking_keys,
+    merge_plan,
+    score,
+    soundex,
+)
+
+
+def contact(id, name, surname, email, phone, birthday=date(1990, 1, 1), info=None):
+    return SimpleNamespace(
+        id=id,
+        name=name,
+        surname=surname,
+        email=email,
+        phone=phone,
+        birthday=birthday,
+        info=info,
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, id),
+        **blocking_keys(name, surname, email, phone),
+    )
+
+
+class FakeRepository:
+    """Serves blocking key queries from a list of contacts."""
+
+    def __init__(self, contacts):
+        self.contacts = contacts
+        self.key_queries = 0
+
+    async def get_duplicate_keys(self, key, after, limit, user):
+        self.key_queries += 1
+        counts = {}
+        for c in self.contacts:
+            counts[getattr(c, key)] = counts.get(getattr(c, key), 0) + 1
+        values = sorted(
+            value
+            for value, count in counts.items()
+            if count > 1 and (after is None or value > after)
+        )
+        return [SimpleNamespace(value=v, count=counts[v]) for v in values[:limit]]
+
+    async def get_contacts_by_keys(self, key, values, user):
+        return [c for c in self.contacts if getattr(c, key) in values]
+
+
+@pytest.mark.parametrize(
+    "name, code",
+    [
+        ("Robert", "R163"),
+        ("Rupert", "R163"),
+        ("Ashcraft", "A261"),
+        ("Tymczak", "T522"),
+        ("Pfister", "P236"),
+        ("Lee", "L000"),
+        ("Олена", "олена"),
+    ],
+)
+def test_soundex(name, code):
+    assert soundex(name) == code
+
+
+def test_blocking_keys_ignore_formatting():
+    first = blocking_keys("Jon", "Smith", "John.Smith@Example.com ", "+380501234567")
+    second = blocking_keys("John", "Smyth", "john.smith@example.com", "0501234567")
+    assert first == second
+
+
+def test_score_combines_evidence():
+    a = contact(1, "John", "Smith", "john@example.com", "+380501230001")
+    b = contact(2, "Jon", "Smith", "JOHN@example.com", "+380501230002")
+    c = contact(3, "Johnny", "Smyth", "js@example.com", "+380501230003")
+    d = contact(
+        4, "John", "Smith", "other@example.com", "+380501230004", date(1970, 5, 5)
+    )
+    assert score(a, b) == pytest.approx(0.874)
+    assert score(a, c) == pytest.approx(0.58)
+    # Namesakes born on different days are not linked.
+    assert score(a, d) == pytest.approx(0.51)
+
+
+def test_disjoint_set_merges_transitively():
+    groups = DisjointSet()
+    groups.union(1, 2)
+    groups.union(3, 4)
+    groups.union(2, 4)
+    assert len({groups.find(i) for i in (1, 2, 3, 4)}) == 1
+    assert groups.find(5) == 5
+
+
+def test_merge_plan_keeps_the_most_complete_contact():
+    plan = merge_plan(
+        [
+            contact(1, "John", "Smith", "a@example.com", "+380501230001"),
+            contact(2, "John", "Smith", "b@example.com", "+380501230002", info="VIP"),
+            contact(3, "John", "Smith", "c@example.com", "+380501230003"),
+        ]
+    )
+    assert plan.keep_id == 2
+    assert plan.remove_ids == [1, 3]
+    assert plan.updates == {}
+
+    plan = merge_plan(
+        [
+            contact(1, "John", "Smith", "a@example.com", "+380501230001", info="Old"),
+            contact(2, "John", "Smith", "b@example.com", "+380501230002"),
+        ]
+    )
+    assert plan.keep_id == 1
+
+
+@pytest.mark.asyncio
+async def test_finder_pages_keys_and_skips_oversized_blocks():
+    contacts = [
+        contact(1, "John", "Smith", "john@example.com", "+380501230001"),
+        contact(2, "Jon", "Smith", "JOHN@example.com", "+380501230002"),
+        contact(3, "Mary", "Major", "m@example.com", "+48501230009", date(1980, 1, 1)),
+        contact(4, "Mia", "Majors", "n@example.com", "+380501230009", date(1981, 1, 2)),
+    ]
+    # Namesakes with different birthdays: one block, too large to score.
+    contacts += [
+        contact(
+            10 + i,
+            "Anna",
+            "Lee",
+            f"anna{i}@example.com",
+            f"+38050999000{i}",
+            date(1970 + i, 1, 1),
+        )
+        for i in range(4)
+    ]
+    repository = FakeRepository(contacts)
+    finder = DuplicateFinder(repository, batch_size=1, max_block_size=3)
+
+    report = await finder.find(None, 0.55, include_merge_plan=True)
+
+    assert [group.contact_ids for group in report.groups] == [[1, 2], [3, 4]]
+    assert report.groups[1].score == pytest.approx(0.7)
+    assert report.groups[0].merge_plan.keep_id == 2
+    assert report.skipped_blocks == 1
+    assert repository.key_queries > 3
@@ -0,0 +1,20 @@
+from fastapi import status
+
+
+def test_large_json_responses_are_compressed(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["paths"]
+
+
+def test_small_responses_are_not_compressed(client, get_token):
+    response = client.get(
+        "/api/contacts/stats",
+        headers={"Authorization": f"Bearer {get_token}", "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert "content-encoding" not in response.headers
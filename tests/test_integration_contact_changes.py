@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, update
+
+from src.database.models import ContactTombstone
+from src.services.redis_cache import RedisCache
+from src.services.tombstones import TombstonePruner
+from tests.conftest import TestingSessionLocal
+
+
+def contact(index: int) -> dict:
+    return {
+        "name": f"Sync{index}",
+        "surname": "Doe",
+        "email": f"sync{index}@example.com",
+        "phone": f"+38050222000{index}",
+        "birthday": "1990-05-15",
+    }
+
+
+def test_full_then_incremental_sync(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = [
+        client.post("/api/contacts", json=contact(i), headers=headers).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.get("/api/contacts/changes", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    full = response.json()
+    assert full["upserted"] == ids
+    assert full["deleted"] == []
+    assert full["has_more"] is False
+
+    response = client.put(
+        f"/api/contacts/{ids[0]}",
+        json={**contact(0), "name": "Renamed"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    response = client.delete(f"/api/contacts/{ids[1]}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get(
+        "/api/contacts/changes",
+        params={"since": full["token"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    delta = response.json()
+    assert delta["upserted"] == [ids[0]]
+    assert delta["deleted"] == [ids[1]]
+    assert delta["token"] > full["token"]
+
+    response = client.get(
+        "/api/contacts/changes",
+        params={"since": delta["token"]},
+        headers=headers,
+    )
+    assert response.json() == {
+        "upserted": [],
+        "deleted": [],
+        "token": delta["token"],
+        "has_more": False,
+        "reset": False,
+    }
+
+
+def test_changes_are_paged(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/changes", params={"limit": 1}, headers=headers)
+    first = response.json()
+    assert len(first["upserted"]) == 1
+    assert first["has_more"] is True
+
+    response = client.get(
+        "/api/contacts/changes",
+        params={"since": first["token"], "limit": 1},
+        headers=headers,
+    )
+    second = response.json()
+    assert second["token"] > first["token"]
+    assert second["upserted"] + second["deleted"] != first["upserted"]
+
+
+def test_changes_requires_valid_token(client, get_token):
+    response = client.get(
+        "/api/contacts/changes",
+        params={"since": -1},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_tokens_older_than_pruned_tombstones_get_a_full_resync(
+    client, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_id = client.post(
+        "/api/contacts", json=contact(7), headers=headers
+    ).json()["id"]
+    stale = client.get(
+        "/api/contacts/changes", params={"limit": 10000}, headers=headers
+    ).json()["token"]
+    response = client.delete(f"/api/contacts/{contact_id}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(ContactTombstone).values(
+                deleted_at=datetime.now() - timedelta(days=60)
+            )
+        )
+        await session.commit()
+    pruner = TombstonePruner(RedisCache(), TestingSessionLocal, retention_days=30)
+    assert await pruner.run_once() > 0
+    async with TestingSessionLocal() as session:
+        count = await session.execute(select(func.count(ContactTombstone.id)))
+        assert count.scalar_one() == 0
+
+    response = client.get(
+        "/api/contacts/changes", params={"since": stale}, headers=headers
+    )
+    resync = response.json()
+    assert resync["reset"] is True
+    assert resync["deleted"] == []
+    assert contact_id not in resync["upserted"]
+    assert resync["has_more"] is False
+
+    response = client.get(
+        "/api/contacts/changes", params={"since": resync["token"]}, headers=headers
+    )
+    assert response.json()["reset"] is False
+
+    # Paging through a full sync does not trip the reset.
+    page = client.get(
+        "/api/contacts/changes", params={"limit": 1}, headers=headers
+    ).json()
+    assert page["has_more"] is True
+    page = client.get(
+        "/api/contacts/changes",
+        params={"since": page["token"], "limit": 1, "full": True},
+        headers=headers,
+    ).json()
+    assert page["reset"] is False
@@ -0,0 +1,67 @@
+from fastapi import status
+
+contacts = [
+    ("John", "Smith", "john.smith@example.com", "+380501230001", "1990-01-01", None),
+    ("Jon", "Smith", "John.Smith@Example.com", "+380501230002", "1990-01-01", "VIP"),
+    ("Johnny", "Smyth", "jsmyth@example.com", "+380501230003", "1990-01-01", None),
+    ("Mary", "Major", "mary@example.com", "+48501230004", "1980-01-01", None),
+    ("Maria", "Majors", "maria.m@example.com", "+380501230004", "1981-06-01", None),
+    ("Taras", "Melnyk", "taras@example.com", "+380501230005", "1975-03-09", None),
+]
+
+
+def test_duplicates_are_grouped(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for name, surname, email, phone, birthday, info in contacts:
+        response = client.post(
+            "/api/contacts",
+            json={
+                "name": name,
+                "surname": surname,
+                "email": email,
+                "phone": phone,
+                "birthday": birthday,
+                "info": info,
+            },
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    response = client.get("/api/contacts/duplicates", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    report = response.json()
+    assert [group["contact_ids"] for group in report["groups"]] == [[1, 2, 3], [4, 5]]
+    assert report["groups"][0]["score"] == 0.58
+    assert report["groups"][0]["merge_plan"] is None
+    assert report["skipped_blocks"] == 0
+
+
+def test_min_score_and_merge_plan(client, get_token):
+    response = client.get(
+        "/api/contacts/duplicates",
+        params={"min_score": 0.6, "merge_plan": True},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    groups = response.json()["groups"]
+    assert [group["contact_ids"] for group in groups] == [[1, 2], [4, 5]]
+    assert groups[0]["merge_plan"] == {"keep_id": 2, "remove_ids": [1], "updates": {}}
+
+
+def test_keys_follow_updates(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.put(
+        "/api/contacts/5",
+        json={
+            "name": "Maria",
+            "surname": "Majors",
+            "email": "maria.m@example.com",
+            "phone": "+380501239999",
+            "birthday": "1981-06-01",
+        },
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get("/api/contacts/duplicates", headers=headers)
+    assert [group["contact_ids"] for group in response.json()["groups"]] == [[1, 2, 3]]
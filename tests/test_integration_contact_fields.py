@@ -0,0 +1,82 @@
+from fastapi import status
+
+people = [
+    ("Zoe", "Adams", "1992-04-01", ["friends"]),
+    ("Adam", "Young", "1985-12-24", []),
+    ("Mia", "Adams", "2001-07-15", ["work", "friends"]),
+]
+
+
+def test_create_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for index, (name, surname, birthday, tags) in enumerate(people):
+        response = client.post(
+            "/api/contacts",
+            json={
+                "name": name,
+                "surname": surname,
+                "email": f"{name.lower()}@example.com",
+                "phone": f"+38063555000{index}",
+                "birthday": birthday,
+                "info": "x" * 500,
+                "tags": tags,
+            },
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+
+def test_sort(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    def names(sort):
+        response = client.get("/api/contacts/", params={"sort": sort}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        return [contact["name"] for contact in response.json()]
+
+    assert names("id") == ["Zoe", "Adam", "Mia"]
+    assert names("name") == ["Adam", "Mia", "Zoe"]
+    assert names("-name") == ["Zoe", "Mia", "Adam"]
+    assert names("surname") == ["Mia", "Zoe", "Adam"]
+    assert names("-birthday") == ["Mia", "Zoe", "Adam"]
+
+    response = client.get("/api/contacts/", params={"sort": "info"}, headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_sparse_fields(client, get_token):
+    response = client.get(
+        "/api/contacts/",
+        params={"fields": "name, birthday", "sort": "name", "include_total": True},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["X-Total-Count"] == "3"
+    assert [sorted(contact) for contact in response.json()] == [
+        ["birthday", "id", "name"]
+    ] * 3
+    assert response.json()[0]["name"] == "Adam"
+    assert response.json()[0]["birthday"] == "1985-12-24"
+
+
+def test_sparse_fields_with_tags(client, get_token):
+    response = client.get(
+        "/api/contacts/",
+        params={"fields": "tags", "tags": "friends", "sort": "-id"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [contact["tags"] for contact in response.json()] == [
+        ["friends", "work"],
+        ["friends"],
+    ]
+
+
+def test_unknown_field_is_rejected(client, get_token):
+    response = client.get(
+        "/api/contacts/",
+        params={"fields": "name,password"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "password" in response.json()["detail"]
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import status
+
+from src.schemas.contacts import normalize_phone
+
+caller = {
+    "name": "Caller",
+    "surname": "Doe",
+    "email": "caller@example.com",
+    "phone": "380 (50) 555-12-34",
+    "birthday": "1991-11-02",
+}
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["+380505551234", "380505551234", "00380505551234", "+380 50 555 12 34"],
+)
+def test_normalize_phone(value):
+    assert normalize_phone(value) == "+380505551234"
+
+
+@pytest.mark.parametrize("value", ["0505551234", "+0505551234", "+380abc", "+1234567890123456"])
+def test_normalize_phone_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        normalize_phone(value)
+
+
+def test_phone_is_stored_normalized(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post("/api/contacts", json=caller, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    assert response.json()["phone"] == "+380505551234"
+
+    # The same number in another format is a duplicate.
+    response = client.post(
+        "/api/contacts",
+        json={**caller, "email": "other.caller@example.com", "phone": "+380505551234"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+
+
+def test_lookup_by_phone(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(
+        "/api/contacts/lookup", params={"phone": "00380505551234"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["email"] == caller["email"]
+
+    response = client.get(
+        "/api/contacts/lookup", params={"phone": "+380505550000"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.get(
+        "/api/contacts/lookup", params={"phone": "not-a-phone"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
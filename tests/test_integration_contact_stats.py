@@ -0,0 +1,80 @@
+from fastapi import status
+from sqlalchemy import create_engine, insert, update
+
+from src.database.contact_stats import recount_contact_stats
+from src.database.models import ContactStats
+
+
+def contact(index: int, birthday: str) -> dict:
+    return {
+        "name": f"Stats{index}",
+        "surname": "Doe",
+        "email": f"stats{index}@example.com",
+        "phone": f"+38050444000{index}",
+        "birthday": birthday,
+    }
+
+
+def test_stats_follow_contact_writes(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = [
+        client.post("/api/contacts", json=contact(i, day), headers=headers).json()["id"]
+        for i, day in enumerate(["1990-01-15", "1991-01-20", "1992-07-04"])
+    ]
+
+    response = client.get("/api/contacts/stats", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    stats = response.json()
+    assert stats["total"] == 3
+    assert stats["birthdays_by_month"]["1"] == 2
+    assert stats["birthdays_by_month"]["7"] == 1
+    assert stats["birthdays_by_month"]["12"] == 0
+
+    client.put(
+        f"/api/contacts/{ids[0]}", json=contact(0, "1990-12-01"), headers=headers
+    )
+    client.delete(f"/api/contacts/{ids[2]}", headers=headers)
+
+    stats = client.get("/api/contacts/stats", headers=headers).json()
+    assert stats["total"] == 2
+    assert stats["birthdays_by_month"]["1"] == 1
+    assert stats["birthdays_by_month"]["7"] == 0
+    assert stats["birthdays_by_month"]["12"] == 1
+
+
+def test_list_returns_total_on_request(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(
+        "/api/contacts", params={"include_total": True, "limit": 1}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert len(response.json()) == 1
+    assert response.headers["X-Total-Count"] == "2"
+
+    response = client.get(
+        "/api/contacts",
+        params={"include_total": True, "name": "Stats1"},
+        headers=headers,
+    )
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get("/api/contacts", headers=headers)
+    assert "X-Total-Count" not in response.headers
+
+
+def test_recount_repairs_drifted_counters(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    expected = client.get("/api/contacts/stats", headers=headers).json()
+
+    engine = create_engine("sqlite:///./test.db", isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        conn.execute(update(ContactStats).values(count=ContactStats.count + 5))
+        conn.execute(
+            insert(ContactStats).values(user_id=1, month=3, count=7).prefix_with(
+                "OR REPLACE"
+            )
+        )
+        assert recount_contact_stats(conn, batch_size=1) > 0
+    engine.dispose()
+
+    assert client.get("/api/contacts/stats", headers=headers).json() == expected
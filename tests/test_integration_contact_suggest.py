@@ -0,0 +1,81 @@
+from fastapi import status
+
+contacts = [
+    ("Olena", "Shevchenko", "olena@example.com", "+380505550001"),
+    ("Oleh", "Bondar", "oleh_b@example.com", "+380505550002"),
+    ("Anna", "Olson", "anna@example.com", "+380505550003"),
+    ("Taras", "Melnyk", "tm%olx@example.com", "+380505550004"),
+]
+
+
+def test_suggest_matches_prefixes(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for name, surname, email, phone in contacts:
+        response = client.post(
+            "/api/contacts",
+            json={
+                "name": name,
+                "surname": surname,
+                "email": email,
+                "phone": phone,
+                "birthday": "1990-01-01",
+            },
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    response = client.get("/api/contacts/suggest", params={"q": "OL"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json() == [
+        {"id": 3, "display": "Anna Olson <anna@example.com>"},
+        {"id": 2, "display": "Oleh Bondar <oleh_b@example.com>"},
+        {"id": 1, "display": "Olena Shevchenko <olena@example.com>"},
+    ]
+
+    response = client.get(
+        "/api/contacts/suggest", params={"q": "ol", "limit": 1}, headers=headers
+    )
+    assert [item["id"] for item in response.json()] == [3]
+
+
+def test_suggest_escapes_wildcards(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/suggest", params={"q": "tm%"}, headers=headers)
+    assert [item["id"] for item in response.json()] == [4]
+
+    response = client.get("/api/contacts/suggest", params={"q": "%"}, headers=headers)
+    assert response.json() == []
+
+    response = client.get("/api/contacts/suggest", params={"q": "oleh_"}, headers=headers)
+    assert [item["id"] for item in response.json()] == [2]
+
+
+def test_suggest_returns_the_first_matches_by_name(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for index in reversed(range(5)):
+        response = client.post(
+            "/api/contacts",
+            json={
+                "name": f"Pavlo{index}",
+                "surname": "Kovalenko",
+                "email": f"pavlo{index}@example.com",
+                "phone": f"+38050555010{index}",
+                "birthday": "1990-01-01",
+            },
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    response = client.get(
+        "/api/contacts/suggest", params={"q": "pav", "limit": 2}, headers=headers
+    )
+    assert [item["display"].split()[0] for item in response.json()] == [
+        "Pavlo0",
+        "Pavlo1",
+    ]
+
+
+def test_suggest_rejects_blank_text(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/suggest", params={"q": "  "}, headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
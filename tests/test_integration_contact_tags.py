@@ -0,0 +1,133 @@
+from fastapi import status
+
+contacts = [
+    {
+        "name": "Tagged",
+        "surname": "One",
+        "email": "tagged.one@example.com",
+        "phone": "+380671110001",
+        "birthday": "1990-01-01",
+        "tags": ["Work", " family ", "work"],
+    },
+    {
+        "name": "Tagged",
+        "surname": "Two",
+        "email": "tagged.two@example.com",
+        "phone": "+380671110002",
+        "birthday": "1990-02-02",
+        "tags": ["work", "gym"],
+    },
+    {
+        "name": "Tagged",
+        "surname": "Three",
+        "email": "tagged.three@example.com",
+        "phone": "+380671110003",
+        "birthday": "1990-03-03",
+    },
+]
+
+
+def emails(response):
+    return sorted(contact["email"] for contact in response.json())
+
+
+def test_create_contacts_with_tags(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    created = []
+    for contact in contacts:
+        response = client.post("/api/contacts", json=contact, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+        created.append(response.json()["tags"])
+    assert created == [["family", "work"], ["gym", "work"], []]
+
+
+def test_invalid_tags_are_rejected(client, get_token):
+    response = client.post(
+        "/api/contacts",
+        json={**contacts[2], "email": "bad.tags@example.com", "tags": ["x" * 51]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_filter_by_any_tag(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(
+        "/api/contacts/", params={"tags": "family,GYM"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert emails(response) == ["tagged.one@example.com", "tagged.two@example.com"]
+
+
+def test_filter_by_all_tags(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(
+        "/api/contacts/",
+        params={"tags": ["work", "gym"], "tag_mode": "all", "include_total": True},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert emails(response) == ["tagged.two@example.com"]
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get(
+        "/api/contacts/", params={"tags": "work", "tag_mode": "some"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_tag_counts(client, get_token):
+    response = client.get(
+        "/api/contacts/tags", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json() == [
+        {"name": "work", "count": 2},
+        {"name": "family", "count": 1},
+        {"name": "gym", "count": 1},
+    ]
+
+
+def test_update_replaces_tags(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact = client.get(
+        "/api/contacts/", params={"tags": "gym"}, headers=headers
+    ).json()[0]
+    response = client.put(
+        f"/api/contacts/{contact['id']}",
+        json={**contacts[1], "tags": ["gym", "friends"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["tags"] == ["friends", "gym"]
+
+    # Omitting tags keeps them.
+    body = {key: value for key, value in contacts[1].items() if key != "tags"}
+    response = client.put(
+        f"/api/contacts/{contact['id']}", json=body, headers=headers
+    )
+    assert response.json()["tags"] == ["friends", "gym"]
+
+    response = client.get("/api/contacts/tags", headers=headers)
+    assert {tag["name"]: tag["count"] for tag in response.json()} == {
+        "work": 1,
+        "family": 1,
+        "gym": 1,
+        "friends": 1,
+    }
+
+
+def test_delete_releases_tags(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact = client.get(
+        "/api/contacts/", params={"tags": "family"}, headers=headers
+    ).json()[0]
+    response = client.delete(f"/api/contacts/{contact['id']}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get("/api/contacts/tags", headers=headers)
+    assert [tag["name"] for tag in response.json()] == ["friends", "gym"]
+    response = client.get(
+        "/api/contacts/", params={"tags": "work"}, headers=headers
+    )
+    assert response.json() == []
@@ -0,0 +1,67 @@
+import pytest_asyncio
+from fastapi import status
+
+from src.database.models import User
+from src.services.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+colleague = {
+    "name": "Shared",
+    "surname": "Colleague",
+    "email": "shared.colleague@example.com",
+    "phone": "+380501110000",
+    "birthday": "1988-03-10",
+}
+
+
+@pytest_asyncio.fixture()
+async def other_user_token():
+    """Creates a second user and returns an access token for them."""
+    async with TestingSessionLocal() as session:
+        session.add(
+            User(
+                username="bourne",
+                email="bourne@example.com",
+                hashed_password="!",
+                is_verified=True,
+            )
+        )
+        await session.commit()
+    return await create_access_token(data={"sub": "bourne"})
+
+
+def test_duplicate_contact_rejected(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post("/api/contacts", json=colleague, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    response = client.post(
+        "/api/contacts",
+        json={**colleague, "email": "other@example.com"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+
+
+def test_update_to_duplicate_rejected(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    second = {**colleague, "email": "second@example.com", "phone": "+380501110001"}
+    response = client.post("/api/contacts", json=second, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    response = client.put(
+        f"/api/contacts/{response.json()['id']}",
+        json={**second, "email": colleague["email"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert "already exists" in response.json()["detail"]
+
+
+def test_same_contact_for_another_user(client, other_user_token):
+    response = client.post(
+        "/api/contacts",
+        json=colleague,
+        headers={"Authorization": f"Bearer {other_user_token}"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
@@ -0,0 +1,32 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import status
+
+from src.services.metrics import DB_POOL_CHECKOUTS, DB_SESSIONS
+from src.services.redis_cache import redis_cache
+
+
+@pytest.fixture
+def fake_redis():
+    """Fixture backing the shared Redis cache with fakeredis."""
+    redis_cache.redis = FakeAsyncRedis()
+    yield redis_cache.redis
+    redis_cache.redis = None
+
+
+def test_cached_request_does_not_use_the_database(
+    client, get_token, fake_redis, query_budget
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # Caches the user and builds the birthday calendar.
+    response = client.get("/api/contacts/birthdays/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    unused = DB_SESSIONS.labels("false")._value.get()
+    checkouts = DB_POOL_CHECKOUTS._value.get()
+    response = client.get("/api/contacts/birthdays/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 0)
+    assert DB_SESSIONS.labels("false")._value.get() == unused + 1
+    assert DB_POOL_CHECKOUTS._value.get() == checkouts
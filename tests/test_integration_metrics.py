@@ -0,0 +1,27 @@
+from fastapi import status
+
+
+def test_metrics_endpoint(client, get_token):
+    """
+    Test that request, database and cache metrics are exposed.
+
+    Expected:
+    - 200 status code in the Prometheus text format
+    - Route labels use the path template, not the concrete path
+    """
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.get("/api/contacts/1", headers=headers)
+    # Contacts routes trust the token claims; the profile route looks the
+    # user up.
+    client.get("/api/users/me", headers=headers)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'route="/api/contacts/{contact_id}"' in body
+    assert "http_requests_in_flight" in body
+    assert "db_queries_total" in body
+    assert "db_pool_checked_out" in body
+    assert 'cache_requests_total{cache="user",result="miss"}' in body
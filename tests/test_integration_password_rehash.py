@@ -0,0 +1,44 @@
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from src.database.models import User
+from src.services.passwords import password_context
+from tests.conftest import TestingSessionLocal
+
+credentials = {"email": "rehash@example.com", "password": "old-cost-password"}
+
+
+async def stored_hash() -> str:
+    async with TestingSessionLocal() as session:
+        return await session.scalar(
+            select(User.hashed_password).where(User.email == credentials["email"])
+        )
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_hash(client, monkeypatch):
+    monkeypatch.setattr("src.services.auth.AsyncSessionLocal", TestingSessionLocal)
+    old_hash = password_context(bcrypt_rounds=5).hash(credentials["password"])
+    async with TestingSessionLocal() as session:
+        session.add(
+            User(
+                username="rehash",
+                email=credentials["email"],
+                hashed_password=old_hash,
+                is_verified=True,
+            )
+        )
+        await session.commit()
+
+    response = client.post("/api/auth/login", json=credentials)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    new_hash = await stored_hash()
+    assert new_hash != old_hash
+    assert new_hash.startswith("$2b$04$")
+
+    # The upgraded hash still verifies and is left alone from now on.
+    response = client.post("/api/auth/login", json=credentials)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert await stored_hash() == new_hash
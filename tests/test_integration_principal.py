@@ -0,0 +1,124 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import status
+from jose import jwt
+from sqlalchemy import select
+
+from src.conf.config import settings
+from src.database.models import User
+from src.services.auth import create_access_token
+from src.services.redis_cache import redis_cache
+from tests.conftest import TestingSessionLocal, test_user
+
+
+@pytest.fixture
+def fake_redis():
+    """Fixture backing the shared Redis cache with fakeredis."""
+    redis_cache.redis = FakeAsyncRedis()
+    yield redis_cache.redis
+    redis_cache.redis = None
+
+
+def test_login_token_carries_identity_claims(client):
+    response = client.post(
+        "/api/auth/login",
+        json={"email": test_user["email"], "password": test_user["password"]},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    claims = jwt.decode(
+        response.json()["access_token"],
+        settings.JWT_SECRET,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    assert claims["sub"] == test_user["username"]
+    assert claims["uid"] == 1
+    assert claims["role"] == "admin"
+    assert claims["token_version"] == 0
+
+
+def test_contacts_routes_skip_the_user_lookup(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/suggest",
+        params={"q": "zz"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 1)
+
+
+def test_profile_from_cache_includes_avatar(
+    client, get_token, fake_redis, query_budget
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    first = client.get("/api/users/me", headers=headers)
+    second = client.get("/api/users/me", headers=headers)
+
+    assert first.status_code == status.HTTP_200_OK, first.text
+    assert second.status_code == status.HTTP_200_OK, second.text
+    query_budget(second, 0)
+    assert second.json() == first.json()
+    assert second.json()["avatar"] == "<https://twitter.com/gravatar>"
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_claims_still_work(client):
+    token = await create_access_token(data={"sub": test_user["username"]})
+    response = client.get(
+        "/api/contacts/", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+
+@pytest.mark.asyncio
+async def test_bumped_token_version_revokes_sensitive_routes(client, get_token):
+    async with TestingSessionLocal() as session:
+        user = (
+            await session.execute(
+                select(User).where(User.username == test_user["username"])
+            )
+        ).scalar_one()
+        user.token_version += 1
+        await session.commit()
+
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/users/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
+    assert response.json()["detail"] == "Token has been revoked"
+
+    fresh = client.post(
+        "/api/auth/login",
+        json={"email": test_user["email"], "password": test_user["password"]},
+    ).json()["access_token"]
+    response = client.get(
+        "/api/users/me", headers={"Authorization": f"Bearer {fresh}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_claims_are_revoked_by_a_version_bump(client, get_token):
+    async with TestingSessionLocal() as session:
+        legacy = User(
+            username="legacy",
+            email="legacy@example.com",
+            hashed_password="x",
+            is_verified=True,
+            role="user",
+        )
+        session.add(legacy)
+        await session.commit()
+        await session.refresh(legacy)
+    token = await create_access_token(data={"sub": "legacy"})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/contacts/", headers=headers).status_code == 200
+
+    async with TestingSessionLocal() as session:
+        user = await session.get(User, legacy.id)
+        user.token_version += 1
+        await session.commit()
+
+    for path in ("/api/contacts/", "/api/users/me"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED, path
+        assert response.json()["detail"] == "Token has been revoked"
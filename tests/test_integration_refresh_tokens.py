@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, update
+
+from src.database.models import RefreshToken
+from src.services.metrics import BCRYPT_DURATION
+from src.services.redis_cache import RedisCache
+from src.services.refresh_tokens import (
+    RefreshTokenPruner,
+    hash_refresh_token,
+    utcnow,
+)
+from tests.conftest import TestingSessionLocal, test_user
+
+
+def login(client) -> dict:
+    response = client.post(
+        "/api/auth/login",
+        json={"email": test_user["email"], "password": test_user["password"]},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return response.json()
+
+
+def refresh(client, token: str):
+    return client.post("/api/auth/refresh", json={"refresh_token": token})
+
+
+def bcrypt_calls() -> float:
+    return sum(
+        sample.value
+        for metric in BCRYPT_DURATION.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    )
+
+
+def test_login_returns_token_pair(client):
+    tokens = login(client)
+
+    assert tokens["token_type"] == "bearer"
+    assert tokens["refresh_token"]
+    assert tokens["expires_in"] > 0
+
+
+def test_refresh_rotates_without_password_hashing(client):
+    tokens = login(client)
+    hashed = bcrypt_calls()
+
+    response = refresh(client, tokens["refresh_token"])
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert bcrypt_calls() == hashed
+    me = client.get(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {rotated['access_token']}"},
+    )
+    assert me.status_code == status.HTTP_200_OK, me.text
+
+
+@pytest.mark.asyncio
+async def test_only_the_hash_is_stored(client):
+    tokens = login(client)
+
+    async with TestingSessionLocal() as session:
+        stored = await session.scalar(
+            select(RefreshToken).filter_by(
+                token_hash=hash_refresh_token(tokens["refresh_token"])
+            )
+        )
+        leaked = await session.scalar(
+            select(RefreshToken).filter_by(token_hash=tokens["refresh_token"])
+        )
+    assert stored is not None
+    assert leaked is None
+
+
+def test_reuse_revokes_the_family(client):
+    first = login(client)["refresh_token"]
+    second = refresh(client, first).json()["refresh_token"]
+
+    # The first token is presented again, e.g. by an attacker who stole it.
+    response = refresh(client, first)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # The legitimate client's current token is revoked with it.
+    response = refresh(client, second)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_other_families_survive_reuse(client):
+    stolen = login(client)["refresh_token"]
+    other = login(client)["refresh_token"]
+    refresh(client, stolen)
+    refresh(client, stolen)
+
+    response = refresh(client, other)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+
+@pytest.mark.asyncio
+async def test_expired_and_unknown_tokens_are_rejected(client):
+    token = login(client)["refresh_token"]
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(RefreshToken)
+            .filter_by(token_hash=hash_refresh_token(token))
+            .values(expires_at=RefreshToken.created_at)
+        )
+        await session.commit()
+
+    assert refresh(client, token).status_code == status.HTTP_401_UNAUTHORIZED
+    assert refresh(client, "unknown").status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_long_expired_tokens_are_pruned(client):
+    old = login(client)["refresh_token"]
+    recent = login(client)["refresh_token"]
+    current = login(client)["refresh_token"]
+    async with TestingSessionLocal() as session:
+        for token, days in ((old, 8), (recent, 6)):
+            await session.execute(
+                update(RefreshToken)
+                .filter_by(token_hash=hash_refresh_token(token))
+                .values(expires_at=utcnow() - timedelta(days=days))
+            )
+        await session.commit()
+
+    pruner = RefreshTokenPruner(RedisCache(), TestingSessionLocal, retention_days=7)
+    assert await pruner.run_once() >= 1
+
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(RefreshToken.token_hash))
+        stored = set(result.scalars())
+    assert hash_refresh_token(old) not in stored
+    assert hash_refresh_token(recent) in stored
+    assert refresh(client, current).status_code == status.HTTP_200_OK
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+from fastapi import status
+from jose import jwt
+
+from src.conf.config import settings
+from src.database.models import User
+from src.services.auth import access_token_claims, create_access_token
+from src.services.revocation import BloomFilter, revocation_list
+from tests.conftest import TestingSessionLocal, test_user
+
+
+@pytest.fixture(autouse=True)
+def fresh_revocations():
+    """Forget process-local revocations, since user IDs repeat across modules."""
+    yield
+    revocation_list._filter = BloomFilter(
+        revocation_list.capacity, revocation_list.error_rate
+    )
+    revocation_list._local = {}
+
+
+def login(client) -> dict:
+    response = client.post(
+        "/api/auth/login",
+        json={"email": test_user["email"], "password": test_user["password"]},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return response.json()
+
+
+def test_logout_revokes_the_access_token(client, get_token):
+    tokens = login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post(
+        "/api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get("/api/contacts/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token has been revoked"
+    response = client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Other tokens of the same user are unaffected.
+    response = client.get(
+        "/api/contacts/", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+
+@pytest.mark.asyncio
+async def test_admin_revokes_all_tokens_of_a_user(client, get_token):
+    async with TestingSessionLocal() as session:
+        victim = User(
+            username="leaked",
+            email="leaked@example.com",
+            hashed_password="x",
+            is_verified=True,
+            role="user",
+        )
+        session.add(victim)
+        await session.commit()
+        await session.refresh(victim)
+        token = await create_access_token(data=access_token_claims(victim))
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/contacts/", headers=headers).status_code == 200
+
+    response = client.post(
+        f"/api/users/{victim.id}/revoke-tokens",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get("/api/contacts/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_logout_without_jti_revokes_all_tokens_of_the_user(client):
+    async with TestingSessionLocal() as session:
+        user = User(
+            username="nojti",
+            email="nojti@example.com",
+            hashed_password="x",
+            is_verified=True,
+            role="user",
+        )
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        claims = access_token_claims(user)
+    claims["exp"] = int(time.time()) + 60
+    token = jwt.encode(claims, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post("/api/auth/logout", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.get("/api/contacts/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token has been revoked"
+
+
+def test_revoke_tokens_of_unknown_user(client, get_token):
+    response = client.post(
+        "/api/users/999/revoke-tokens",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,33 @@
+import pytest
+
+from src.services.passwords import calibrate_bcrypt, password_context
+
+
+def test_other_cost_needs_update():
+    old = password_context(bcrypt_rounds=5).hash("secret")
+    current = password_context(bcrypt_rounds=4)
+
+    assert current.verify("secret", old)
+    assert current.needs_update(old)
+    assert not current.needs_update(current.hash("secret"))
+
+
+def test_deprecated_scheme_needs_update():
+    pytest.importorskip("argon2")
+    old = password_context(["bcrypt"], bcrypt_rounds=4).hash("secret")
+    current = password_context(
+        ["argon2", "bcrypt"], bcrypt_rounds=4, argon2_memory_cost=1024
+    )
+
+    assert current.verify("secret", old)
+    assert current.needs_update(old)
+    new = current.hash("secret")
+    assert new.startswith("$argon2id$")
+    assert not current.needs_update(new)
+
+
+def test_calibrate_bcrypt_stays_within_target():
+    chosen, latency = calibrate_bcrypt(target_ms=20, repeat=1)
+
+    assert chosen["BCRYPT_ROUNDS"] >= 4
+    assert latency <= 20 or chosen["BCRYPT_ROUNDS"] == 4
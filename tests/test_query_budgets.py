@@ -0,0 +1,125 @@
+from fastapi import status
+
+from src.services.query_stats import redact_parameters
+
+test_contact = {
+    "name": "Budget",
+    "surname": "Doe",
+    "email": "budget@example.com",
+    "phone": "+380931112233",
+    "birthday": "1990-05-15",
+}
+
+
+def test_create_contact_budget(client, get_token, query_budget):
+    response = client.post(
+        "/api/contacts",
+        json=test_contact,
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    # Includes bumping the user's change sequence for delta sync, the
+    # birthday-month counter and loading the tags of the new contact.
+    query_budget(response, 6)
+
+
+def test_list_contacts_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    # Tags of the whole page are loaded by one query.
+    query_budget(response, 2)
+
+
+def test_list_contact_fields_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/",
+        params={"fields": "name,email", "sort": "name"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    # Tags are only loaded when requested.
+    query_budget(response, 1)
+
+
+def test_get_contact_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/1", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 2)
+
+
+def test_suggest_contacts_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/suggest",
+        params={"q": "bu"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 1)
+
+
+def test_lookup_contact_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/lookup",
+        params={"phone": test_contact["phone"]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 2)
+
+
+def test_birthdays_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/birthdays/", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 1)
+
+
+def test_update_contact_budget(client, get_token, query_budget):
+    response = client.put(
+        "/api/contacts/1",
+        json={**test_contact, "name": "Updated"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    # The tags are loaded with the contact and again after the refresh.
+    query_budget(response, 6)
+
+
+def test_list_contacts_with_total_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/contacts/",
+        params={"include_total": True},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    # The total is read from the per-user counters, not counted.
+    query_budget(response, 3)
+
+
+def test_delete_contact_budget(client, get_token, query_budget):
+    response = client.delete(
+        "/api/contacts/1", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    # Includes the change sequence bump, the tombstone insert, the
+    # birthday-month counter and loading the tags to release.
+    query_budget(response, 6)
+
+
+def test_me_budget(client, get_token, query_budget):
+    response = client.get(
+        "/api/users/me", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    query_budget(response, 1)
+
+
+def test_slow_query_parameters_are_redacted():
+    assert redact_parameters(("secret@example.com", 1)) == ("<str>", "<int>")
+    assert redact_parameters({"email": "secret@example.com"}) == {"email": "<str>"}
+    assert redact_parameters([("a",), ("b",)]) == [("<str>",), ("<str>",)]
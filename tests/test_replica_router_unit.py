@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.replica import ReplicaRouter
+
+
+@pytest.fixture
+def replica_session():
+    """Fixture for a mock replica session reporting no lag."""
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    result.scalar.return_value = 0
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.fixture
+def router(replica_session):
+    """Fixture for a router whose factory hands out the mock session."""
+    return ReplicaRouter(lambda: replica_session, max_lag=5, check_interval=0)
+
+
+@pytest.mark.asyncio
+async def test_no_replica_configured():
+    """Without a replica every read goes to the primary."""
+    router = ReplicaRouter(None)
+
+    assert await router.open_session(user_id=1) is None
+
+
+@pytest.mark.asyncio
+async def test_healthy_replica_is_used(router, replica_session):
+    """A healthy replica serves the read."""
+    assert await router.open_session(user_id=1) is replica_session
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes(router):
+    """Reads right after the user's own write go to the primary."""
+    await router.record_write(user_id=1)
+
+    assert await router.open_session(user_id=1) is None
+    assert await router.open_session(user_id=2) is not None
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back(router, replica_session):
+    """A replica behind by more than ``max_lag`` is skipped."""
+    replica_session.execute.return_value.scalar.return_value = 30
+
+    assert await router.open_session(user_id=1) is None
+    replica_session.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_skipped(router, replica_session):
+    """A failing replica is not retried until ``retry_after`` passes."""
+    replica_session.execute.side_effect = ConnectionError("replica down")
+
+    assert await router.open_session(user_id=1) is None
+    replica_session.execute.side_effect = None
+    assert await router.open_session(user_id=1) is None
+    assert replica_session.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_replica_failing_between_checks_falls_back(router, replica_session):
+    """A replica that went down since the last lag check is skipped."""
+    replica_session.connection.side_effect = ConnectionRefusedError("replica down")
+
+    assert await router.open_session(user_id=1) is None
+    replica_session.close.assert_awaited_once()
+    replica_session.connection.side_effect = None
+    assert await router.open_session(user_id=1) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_write_markers_are_dropped(router, monkeypatch):
+    """Local read-your-writes markers do not accumulate."""
+    clock = [100.0]
+    monkeypatch.setattr("src.services.replica.time.monotonic", lambda: clock[0])
+    router.read_your_writes = 5
+    for user_id in range(3):
+        await router.record_write(user_id)
+
+    clock[0] += 10
+    await router.record_write(user_id=7)
+
+    assert list(router._recent_writes) == [7]
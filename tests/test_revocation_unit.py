@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from src.services.redis_cache import RedisCache
+from src.services.revocation import BloomFilter, RevocationList, user_entry
+
+
+def worker(server: FakeServer | None) -> RevocationList:
+    """A revocation list as held by one worker process."""
+    cache = RedisCache()
+    if server is not None:
+        cache.redis = FakeAsyncRedis(server=server)
+    return RevocationList(cache, capacity=1000, error_rate=0.01)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for index in range(1000):
+        bloom.add(f"jti-{index}")
+
+    assert all(f"jti-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_without_redis_revocations_are_local():
+    revocations = worker(None)
+    await revocations.revoke("jti-1", time.time() + 60)
+    await revocations.revoke("jti-expired", time.time() - 1)
+
+    assert await revocations.is_revoked("jti-1")
+    assert not await revocations.is_revoked("jti-2", user_entry(1, 0))
+    assert not await revocations.is_revoked("jti-expired")
+
+
+@pytest.mark.asyncio
+async def test_revocations_reach_other_workers():
+    server = FakeServer()
+    first, second = worker(server), worker(server)
+    await first.revoke("before-start", time.time() + 60)
+    assert await second.is_revoked("before-start")
+
+    await first.revoke(user_entry(7, 2), time.time() + 60)
+    for _ in range(50):
+        if user_entry(7, 2) in second._filter:
+            break
+        await asyncio.sleep(0.05)
+
+    assert await second.is_revoked("jti-x", user_entry(7, 2))
+    assert not await second.is_revoked(user_entry(7, 3))
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_filter_miss_needs_no_redis_call(monkeypatch):
+    revocations = worker(FakeServer())
+    await revocations.revoke("jti-1", time.time() + 60)
+    assert await revocations.is_revoked("jti-1")
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("Redis was queried")
+
+    monkeypatch.setattr(revocations.cache.redis, "zmscore", unexpected)
+    assert not await revocations.is_revoked("jti-2", user_entry(1, 0))
+    await revocations.close()
@@ -0,0 +1,29 @@
+import importlib.util
+
+import pytest
+
+pytest.importorskip("gunicorn")
+
+from gunicorn.util import load_class
+
+from src import serve
+
+
+def load_as_main():
+    """A second copy of ``src.serve``, as ``python -m src.serve`` runs it."""
+    spec = importlib.util.spec_from_file_location("serve_main", serve.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("loop, http", [("asyncio", "h11"), ("uvloop", "httptools")])
+def test_gunicorn_runs_workers_with_the_selected_loop_and_parser(loop, http):
+    """The worker class gunicorn loads carries the requested settings."""
+    main = load_as_main()
+    args = main.parse_args(["--workers", "1"])
+
+    application = main.ContactsApplication(main.gunicorn_options(args, loop, http))
+    worker_class = load_class(application.cfg.settings["worker_class"].get())
+
+    assert worker_class.CONFIG_KWARGS == {"loop": loop, "http": http}